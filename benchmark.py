@@ -0,0 +1,407 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Suíte de benchmarks das calculadoras e dos endpoints HTTP.
+
+Mede a latência por chamada de cada cenário, tanto chamando as funções
+diretamente quanto pelos endpoints do app.py (via test client do Flask),
+e grava o resultado em JSON. Um resultado salvo serve de baseline para
+o comando "comparar", que aponta regressões acima de um limite.
+
+Uso:
+    python benchmark.py executar [--saida resultado.json] [--filtro das/] [--rodadas 5] [--tempo-minimo 0.2]
+    python benchmark.py comparar benchmark_baseline.json resultado.json [--limite 10]
+
+A baseline só vale para a máquina em que foi medida: o mesmo cenário varia
+dezenas de por cento entre máquinas (e entre horários numa máquina
+compartilhada). O benchmark_baseline.json do repositório é a referência da
+máquina de desenvolvimento; para comparar em outra, gere a baseline local
+antes da mudança (python benchmark.py executar --saida baseline_local.json)
+e compare com ela. "comparar" avisa quando python/plataforma diferem.
+
+As rodadas são intercaladas entre os cenários (uma passada mede uma rodada
+de cada), então o ruído de um cenário é medido ao longo da execução inteira.
+A comparação usa o mínimo das rodadas (o menos afetado por interferência)
+e, por cenário, tolera a maior entre --limite e o ruído da baseline (a
+segunda rodada mais rápida sobre a mais rápida), limitado a
+TOLERANCIA_MAXIMA. Só a baseline entra na tolerância: uma rodada lenta na
+medição atual não pode esconder a própria regressão.
+
+A baseline do repositório foi medida depois da troca para centavos inteiros
+(centavos.py); o custo aceito dessa troca (cerca de +2 µs por DAS e +4 µs
+por rescisão) já faz parte dela e não aparece como regressão.
+
+Vazão dos PDFs em lote (documentos/s, com processos e ZIP): python relatorios_pdf.py medir
+
+Nos endpoints o cache de app.py fica desligado (CALCULA_CACHE_TAMANHO=0),
+a menos que --com-cache seja informado, para que a medida seja do cálculo.
+"""
+
+import os
+import sys
+import json
+import argparse
+import platform
+import contextlib
+import statistics
+from datetime import datetime
+from timeit import default_timer
+
+from calculo_das import DADOS_DOS_ANEXOS, LIMITES_DAS_FAIXAS, calcular_simples_nacional_from_input, exibir_resultado
+from calcular_darf_pro_labore import calcular_darf_pro_labore
+from simulador_lp import calcula_imposto
+from valor_bruto import calcular_valor_bruto_from_input
+from calculo_rescisao import processar_rescisao
+from calculo_holerite import calcular_holerites
+
+BASELINE_PADRAO = "benchmark_baseline.json"
+LIMITE_PADRAO = 10.0  # % de piora tolerada no mínimo das rodadas
+TOLERANCIA_MAXIMA = 25.0  # % de teto para a tolerância tirada do ruído da baseline
+
+CUSTOS_VALOR_BRUTO = [
+    {"descricao": "Taxa da plataforma", "tipo": "%", "valor": "4,5"},
+    {"descricao": "Comissão", "tipo": "%", "valor": "3"},
+    {"descricao": "Frete", "tipo": "R$", "valor": "35,90"},
+]
+
+
+def _rescisao(motivo, admissao, demissao, **extras):
+    return {
+        "motivo": motivo, "salario_base": 4850.0, "adicionais": 320.0, "media_he": 410.0,
+        "data_admissao": admissao, "data_demissao": demissao, "dependentes": 2,
+        "saldo_fgts": 18500.0, "aviso_indenizado": True, **extras,
+    }
+
+
+# ------------------------------------------------------------------------------
+#  CENÁRIOS
+# ------------------------------------------------------------------------------
+
+def cenarios_das():
+    """Um cenário por anexo e faixa (RBT12 no meio da faixa), mais exportação."""
+    cenarios = {}
+    for anexo in sorted(DADOS_DOS_ANEXOS):
+        inferior = 0
+        for faixa, limite in enumerate(LIMITES_DAS_FAIXAS, start=1):
+            rbt = (inferior + limite) / 2
+            cenarios[f"anexo{anexo}/faixa{faixa}"] = {
+                "anexo": anexo, "rbt": rbt, "faturamento": round(rbt / 12, 2), "exportacao_servico": 0,
+            }
+            inferior = limite
+    cenarios["anexo5/faixa3/exportacao"] = {"anexo": 5, "rbt": 540000, "faturamento": 45000, "exportacao_servico": 1}
+    return cenarios
+
+
+def cenarios_darf():
+    return {
+        "piso": {"faturamento": 3000},
+        "faixa_intermediaria": {"faturamento": 15000},
+        "acima_do_teto": {"faturamento": 60000},
+    }
+
+
+def cenarios_lp():
+    return {
+        "normal": (12000.0, 250000.0, 1, 5.0),
+        "exportacao": (12000.0, 250000.0, 2, 0.0),
+        "sem_adicional": (5000.0, 40000.0, 1, 2.0),
+    }
+
+
+def cenarios_valor_bruto():
+    return {
+        "sem_custos": {"valor_liquido": "1000", "imposto_principal": "6", "custos": []},
+        "com_custos": {"valor_liquido": "1000", "imposto_principal": "6", "custos": CUSTOS_VALOR_BRUTO},
+    }
+
+
+def cenarios_rescisao():
+    return {
+        "sem_justa_causa/1_ano": _rescisao(1, "2024-03-10", "2025-03-20"),
+        "sem_justa_causa/longo_30_anos": _rescisao(1, "1995-01-02", "2025-06-18", ferias_vencidas_qtd=1),
+        "pedido_demissao/longo_20_anos": _rescisao(2, "2005-08-15", "2025-05-30", aviso_cumprido=False),
+        "justa_causa/longo_12_anos": _rescisao(3, "2013-02-01", "2025-04-10"),
+        "acordo/5_anos": _rescisao(4, "2020-01-06", "2025-01-15"),
+    }
+
+
+def cenarios_holerite():
+    """Folhas sintéticas (determinísticas) de tamanhos diferentes."""
+    def folha(tamanho):
+        return [
+            {"matricula": i, "salario_base": 1518.0 + (i * 137) % 15000, "horas_extras": (i * 31) % 900,
+             "dependentes": i % 4, "pensao": 450.0 if i % 7 == 0 else 0.0, "vale_transporte": 220.0}
+            for i in range(tamanho)
+        ]
+    return {"folha_100": folha(100), "folha_5000": folha(5000)}
+
+
+def casos_diretos():
+    """(nome, função sem argumentos) para as chamadas diretas."""
+    casos = []
+    for nome, dados in cenarios_das().items():
+        casos.append((f"direto/das/{nome}", lambda d=dados: calcular_simples_nacional_from_input(d)))
+    for nome, dados in cenarios_darf().items():
+        casos.append((f"direto/darf/{nome}", lambda d=dados: calcular_darf_pro_labore(d)))
+    for nome, args in cenarios_lp().items():
+        casos.append((f"direto/lp/{nome}", lambda a=args: calcula_imposto(*a)))
+    for nome, dados in cenarios_valor_bruto().items():
+        casos.append((f"direto/valor_bruto/{nome}", lambda d=dados: calcular_valor_bruto_from_input(d)))
+    for nome, dados in cenarios_rescisao().items():
+        casos.append((f"direto/rescisao/{nome}", lambda d=dados: processar_rescisao(d)))
+    for nome, funcionarios in cenarios_holerite().items():
+        casos.append((f"direto/holerite/{nome}", lambda f=funcionarios: calcular_holerites(f, "2025-06")))
+
+    # PDFs: um documento por chamada (documentos/s = 1e6 / mediana_us). relatorios_pdf
+    # (PyMuPDF) só é importado quando um desses cenários roda, como nas rotas
+    def pdf_holerite(holerite):
+        from relatorios_pdf import gerar_pdf_holerite
+        return gerar_pdf_holerite(holerite, "2025-06", "Empresa Exemplo Ltda")
+
+    def pdf_rescisao(resultado):
+        from relatorios_pdf import gerar_pdf_rescisao
+        return gerar_pdf_rescisao(resultado)
+
+    holerite = calcular_holerites(cenarios_holerite()["folha_100"][:1], "2025-06")["resultados"][0]
+    casos.append(("direto/pdf/holerite", lambda: pdf_holerite(holerite)))
+    for nome in ("sem_justa_causa/longo_30_anos", "pedido_demissao/longo_20_anos"):
+        resultado = processar_rescisao(cenarios_rescisao()[nome])
+        casos.append((f"direto/pdf/rescisao/{nome}", lambda r=resultado: pdf_rescisao(r)))
+
+    # Fluxo antigo do DAS, que também renderizava o relatório no console
+    dados = cenarios_das()["anexo5/faixa3"]
+    casos.append(("direto/das/anexo5/faixa3/com_exibicao",
+                   lambda: exibir_resultado(calcular_simples_nacional_from_input(dados))))
+    return casos
+
+
+def casos_http(com_cache=False):
+    """(nome, função sem argumentos) para os endpoints, via test client do Flask."""
+    if not com_cache:
+        os.environ["CALCULA_CACHE_TAMANHO"] = "0"
+    from app import app
+
+    cliente = app.test_client()
+
+    def post(rota, dados):
+        def chamar():
+            resposta = cliente.post(rota, json=dados)
+            if resposta.status_code != 200:
+                raise RuntimeError(f"{rota} respondeu {resposta.status_code}: {resposta.get_data(as_text=True)}")
+            return resposta
+        return chamar
+
+    das = cenarios_das()
+    lp_normal = dict(zip(("valor_nfse", "faturamento_mensal", "natureza_exportacao", "aliquota_iss_percentual"),
+                         cenarios_lp()["normal"]))
+    rescisoes = cenarios_rescisao()
+    return [
+        ("http/calcular_das/anexo3/faixa2", post("/calcular_das", das["anexo3/faixa2"])),
+        ("http/calcular_das/anexo5/faixa4", post("/calcular_das", das["anexo5/faixa4"])),
+        ("http/calcular_das_darf/anexo5/faixa4", post("/calcular_das_darf", das["anexo5/faixa4"])),
+        ("http/calcular_darf_pro_labore", post("/calcular_darf_pro_labore", cenarios_darf()["faixa_intermediaria"])),
+        ("http/calcular_lp", post("/calcular_lp", lp_normal)),
+        ("http/calcular_valor_bruto", post("/calcular_valor_bruto", cenarios_valor_bruto()["com_custos"])),
+        ("http/calcular_rescisao/1_ano", post("/calcular_rescisao", rescisoes["sem_justa_causa/1_ano"])),
+        ("http/calcular_rescisao/longo_30_anos", post("/calcular_rescisao", rescisoes["sem_justa_causa/longo_30_anos"])),
+        ("http/calcular_holerite_lote/folha_100",
+         post("/calcular_holerite_lote", {"competencia": "2025-06", "funcionarios": cenarios_holerite()["folha_100"]})),
+    ]
+
+
+# ------------------------------------------------------------------------------
+#  MEDIÇÃO
+# ------------------------------------------------------------------------------
+
+def calibrar(funcao, tempo_minimo):
+    """Número de iterações para que uma rodada dure pelo menos tempo_minimo segundos."""
+    iteracoes = 1
+    while True:
+        inicio = default_timer()
+        for _ in range(iteracoes):
+            funcao()
+        decorrido = default_timer() - inicio
+        if decorrido >= tempo_minimo:
+            return iteracoes
+        iteracoes = max(iteracoes * 2, int(iteracoes * tempo_minimo / max(decorrido, 1e-9)))
+
+
+def rodada(funcao, iteracoes):
+    """Tempo por chamada de uma rodada, em µs."""
+    inicio = default_timer()
+    for _ in range(iteracoes):
+        funcao()
+    return (default_timer() - inicio) / iteracoes * 1e6
+
+
+def estatisticas(tempos, iteracoes):
+    ordenados = sorted(tempos)
+    return {
+        "mediana_us": round(statistics.median(tempos), 3),
+        "minimo_us": round(ordenados[0], 3),
+        "segundo_us": round(ordenados[min(1, len(ordenados) - 1)], 3),
+        "maximo_us": round(max(tempos), 3),
+        "iteracoes": iteracoes,
+        "rodadas": len(tempos),
+    }
+
+
+def medir(funcao, rodadas, tempo_minimo):
+    """
+    Calibra o número de iterações para que cada rodada dure pelo menos
+    tempo_minimo segundos e devolve as estatísticas em µs por chamada.
+    """
+    iteracoes = calibrar(funcao, tempo_minimo)
+    return estatisticas([rodada(funcao, iteracoes) for _ in range(rodadas)], iteracoes)
+
+
+def executar(filtro=None, rodadas=5, tempo_minimo=0.2, com_cache=False, http=True):
+    """
+    Mede os cenários intercalando as rodadas: cada passada faz uma rodada de
+    cada cenário, de modo que as rodadas de um cenário se espalham pela
+    execução inteira e a dispersão (máximo/mínimo) registra também a
+    variação de carga da máquina ao longo dela, não só a de segundos seguidos.
+    """
+    casos = casos_diretos() + (casos_http(com_cache) if http else [])
+    if filtro:
+        casos = [(nome, f) for nome, f in casos if filtro in nome]
+
+    # Alguns handlers e o fluxo com exibição escrevem no console: descartado durante a medição
+    with open(os.devnull, "w", encoding="utf-8") as devnull, contextlib.redirect_stdout(devnull):
+        iteracoes = {nome: calibrar(funcao, tempo_minimo) for nome, funcao in casos}
+        tempos = {nome: [] for nome, _ in casos}
+        for passada in range(rodadas):
+            for nome, funcao in casos:
+                tempos[nome].append(rodada(funcao, iteracoes[nome]))
+            print(f"passada {passada + 1}/{rodadas}", file=sys.stderr)
+
+    resultados = {nome: estatisticas(tempos[nome], iteracoes[nome]) for nome, _ in casos}
+    for nome, medida in resultados.items():
+        print(f"{nome:<55} {medida['minimo_us']:12.2f} µs", file=sys.stderr)
+
+    return {
+        "meta": {
+            "data": datetime.now().isoformat(timespec="seconds"),
+            "python": platform.python_version(),
+            "plataforma": platform.platform(),
+            "rodadas": rodadas,
+            "tempo_minimo_s": tempo_minimo,
+            "com_cache": com_cache,
+        },
+        "resultados": resultados,
+    }
+
+
+# ------------------------------------------------------------------------------
+#  COMPARAÇÃO
+# ------------------------------------------------------------------------------
+
+def ruido(medida):
+    """
+    Ruído de um cenário, em %: a segunda rodada mais rápida sobre a mais
+    rápida. Insensível a uma rodada isolada lenta (GC, vizinho barulhento).
+    Medidas antigas, sem "segundo_us", contam como sem ruído.
+    """
+    minimo = medida["minimo_us"]
+    return (medida.get("segundo_us", minimo) / minimo - 1) * 100 if minimo else 0.0
+
+
+def comparar(baseline, atual, limite=LIMITE_PADRAO):
+    """
+    Compara os mínimos das rodadas de dois resultados. Retorna a lista de linhas
+    (nome, base_us, atual_us, variacao_percent, tolerancia_percent, situacao),
+    onde situacao é "regressao", "melhora", "ok", "novo" ou "ausente". A
+    tolerância de cada cenário é a maior entre limite e o ruído da baseline,
+    limitado a TOLERANCIA_MAXIMA.
+    """
+    base = baseline["resultados"]
+    agora = atual["resultados"]
+    linhas = []
+    for nome in sorted(set(base) | set(agora)):
+        if nome not in base:
+            linhas.append((nome, None, agora[nome]["minimo_us"], None, None, "novo"))
+            continue
+        if nome not in agora:
+            linhas.append((nome, base[nome]["minimo_us"], None, None, None, "ausente"))
+            continue
+        b, a = base[nome]["minimo_us"], agora[nome]["minimo_us"]
+        variacao = (a / b - 1) * 100 if b else 0.0
+        tolerancia = max(limite, min(ruido(base[nome]), TOLERANCIA_MAXIMA))
+        if variacao > tolerancia:
+            situacao = "regressao"
+        elif variacao < -tolerancia:
+            situacao = "melhora"
+        else:
+            situacao = "ok"
+        linhas.append((nome, b, a, variacao, tolerancia, situacao))
+    return linhas
+
+
+def ambientes_diferentes(baseline, atual):
+    """Campos de ambiente (python, plataforma) que diferem entre os dois resultados."""
+    return [campo for campo in ("python", "plataforma")
+            if baseline.get("meta", {}).get(campo) != atual.get("meta", {}).get(campo)]
+
+
+def _formatar(valor, sufixo=""):
+    return "-" if valor is None else f"{valor:.2f}{sufixo}"
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmarks das calculadoras e endpoints")
+    sub = parser.add_subparsers(dest="comando", required=True)
+
+    p_exec = sub.add_parser("executar", help="Executa a suíte e grava o JSON")
+    p_exec.add_argument("--saida", "-o", help="Arquivo JSON de saída (padrão: stdout)")
+    p_exec.add_argument("--filtro", "-f", help="Executa só os cenários cujo nome contém o texto")
+    p_exec.add_argument("--rodadas", "-r", type=int, default=5, help="Rodadas por cenário (padrão 5)")
+    p_exec.add_argument("--tempo-minimo", type=float, default=0.2, help="Duração mínima de cada rodada, em s")
+    p_exec.add_argument("--com-cache", action="store_true", help="Mantém o cache do app.py ligado nos endpoints")
+    p_exec.add_argument("--sem-http", action="store_true", help="Mede só as chamadas diretas")
+
+    p_comp = sub.add_parser("comparar", help="Compara um resultado com a baseline")
+    p_comp.add_argument("baseline", nargs="?", default=BASELINE_PADRAO)
+    p_comp.add_argument("atual")
+    p_comp.add_argument("--limite", "-l", type=float, default=LIMITE_PADRAO,
+                        help=f"Piora mínima tolerada no mínimo das rodadas, em %% (padrão {LIMITE_PADRAO}); "
+                             "cenários com ruído maior na baseline toleram esse ruído, até "
+                             f"{TOLERANCIA_MAXIMA:.0f}%%")
+
+    args = parser.parse_args()
+
+    if args.comando == "executar":
+        resultado = executar(args.filtro, args.rodadas, args.tempo_minimo, args.com_cache, not args.sem_http)
+        texto = json.dumps(resultado, ensure_ascii=False, indent=2)
+        if args.saida:
+            with open(args.saida, "w", encoding="utf-8") as f:
+                f.write(texto + "\n")
+        else:
+            print(texto)
+        return 0
+
+    with open(args.baseline, encoding="utf-8") as f:
+        baseline = json.load(f)
+    with open(args.atual, encoding="utf-8") as f:
+        atual = json.load(f)
+
+    diferentes = ambientes_diferentes(baseline, atual)
+    if diferentes:
+        print(f"⚠️  Baseline medida em outro ambiente ({', '.join(diferentes)}): gere uma baseline local "
+              "para uma comparação confiável.\n")
+
+    linhas = comparar(baseline, atual, args.limite)
+    print(f"{'cenário':<55} {'base µs':>12} {'atual µs':>12} {'variação':>10} {'tolerância':>11}  situação")
+    for nome, b, a, variacao, tolerancia, situacao in linhas:
+        print(f"{nome:<55} {_formatar(b):>12} {_formatar(a):>12} {_formatar(variacao, '%'):>10} "
+              f"{_formatar(tolerancia, '%'):>11}  {situacao}")
+
+    regressoes = [linha for linha in linhas if linha[5] == "regressao"]
+    if regressoes:
+        print(f"\n{len(regressoes)} regressão(ões) acima da tolerância (mínimo {args.limite:.1f}%).")
+        return 1
+    print(f"\nNenhuma regressão acima da tolerância (mínimo {args.limite:.1f}%).")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,226 @@
+# cache_calculos.py
+# Cache LRU em memória para as funções de cálculo usadas pelo app
+#
+# A chave é a forma canônica da entrada (JSON com chaves ordenadas, ou a tupla
+# devolvida por uma função de normalização). Entradas expiram após o TTL e as
+# mais antigas são descartadas quando o cache enche.
+#
+# Tabelas: o cache é esvaziado quando alguma tabela de tributos informada em
+# `tabelas` muda. A substituição de uma tabela (outro objeto) é vista em toda
+# consulta; a alteração no próprio objeto (ex.: uma faixa editada) é vista pela
+# impressão digital do conteúdo, recalculada no máximo a cada
+# CALCULA_CACHE_VERIFICACAO segundos (o cálculo percorre as tabelas inteiras).
+# invalidar_caches() esvazia todos na hora.
+#
+# Os resultados guardados são congelados (dicionários somente leitura, listas
+# viram tuplas) e compartilhados entre as requisições: quem precisar alterar
+# um resultado deve copiá-lo antes.
+#
+# Configuração por variáveis de ambiente:
+#   CALCULA_CACHE_TAMANHO     (padrão 1024 entradas por função; 0 desliga o cache)
+#   CALCULA_CACHE_TTL         (padrão 300 segundos; 0 = sem expiração)
+#   CALCULA_CACHE_VERIFICACAO (padrão 1 segundo; 0 = confere o conteúdo das tabelas em toda consulta)
+
+import os
+import json
+import time
+import threading
+from collections import OrderedDict
+from functools import wraps
+from types import MappingProxyType
+
+TAMANHO_PADRAO = int(os.environ.get("CALCULA_CACHE_TAMANHO", 1024))
+TTL_PADRAO = float(os.environ.get("CALCULA_CACHE_TTL", 300))
+INTERVALO_VERIFICACAO = float(os.environ.get("CALCULA_CACHE_VERIFICACAO", 1.0))
+
+CACHES = {}
+
+
+class ResultadoCongelado(dict):
+    """Dicionário somente leitura (continua sendo um dict para jsonify e json.dumps)."""
+    __slots__ = ()
+
+    def _somente_leitura(self, *args, **kwargs):
+        raise TypeError("Resultado em cache é somente leitura; copie antes de alterar.")
+
+    __setitem__ = __delitem__ = __ior__ = _somente_leitura
+    clear = pop = popitem = setdefault = update = _somente_leitura
+
+    def __reduce__(self):
+        # copy/deepcopy/pickle: reconstrói a partir de um dict comum (sem passar por __setitem__)
+        return (ResultadoCongelado, (dict(self),))
+
+
+def congelar(valor):
+    """Cópia somente leitura de um resultado: dicts viram ResultadoCongelado e listas viram tuplas."""
+    if isinstance(valor, ResultadoCongelado):
+        return valor
+    if isinstance(valor, dict):
+        return ResultadoCongelado((k, congelar(v)) for k, v in valor.items())
+    if isinstance(valor, (list, tuple)):
+        return tuple(congelar(v) for v in valor)
+    return valor
+
+
+def _conteudo(obj):
+    """Forma hashable do conteúdo de uma tabela (dicts, listas, objetos com __slots__, números)."""
+    if isinstance(obj, (dict, MappingProxyType)):
+        return tuple((k, _conteudo(v)) for k, v in obj.items())
+    if isinstance(obj, (list, tuple)):
+        return tuple(_conteudo(v) for v in obj)
+    slots = getattr(type(obj), "__slots__", None)
+    if slots:
+        # Atributos privados são derivados dos públicos (ex.: arrays pré-calculados)
+        return (type(obj).__name__,) + tuple(_conteudo(getattr(obj, s)) for s in slots if not s.startswith("_"))
+    if hasattr(obj, "__dict__"):
+        return _conteudo(vars(obj))
+    return obj
+
+
+def impressao_digital(tabelas):
+    """Hash do conteúdo das tabelas: muda quando qualquer valor delas muda, mesmo no próprio objeto."""
+    return hash(_conteudo(tuple(tabelas)))
+
+
+def chave_canonica(*args, **kwargs):
+    """Serializa os argumentos de forma determinística (chaves de dicionário ordenadas)."""
+    return json.dumps([args, kwargs], sort_keys=True, separators=(",", ":"), ensure_ascii=False, default=str)
+
+
+class CacheLRU:
+    """
+    Cache LRU limitado, com TTL e contadores de acerto/erro/descarte.
+    Os valores guardados são devolvidos sem cópia (em_cache os congela antes de guardar).
+    """
+
+    def __init__(self, tamanho=TAMANHO_PADRAO, ttl=TTL_PADRAO, tabelas=None, intervalo_verificacao=None):
+        self.tamanho = tamanho
+        self.ttl = ttl
+        self._tabelas = tabelas
+        self._intervalo = INTERVALO_VERIFICACAO if intervalo_verificacao is None else intervalo_verificacao
+        self._ids_tabelas, self._impressao_tabelas = self._identificar_tabelas()
+        self._ultima_verificacao = time.monotonic()
+        self._dados = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirados = 0
+        self.invalidacoes = 0
+
+    def _identificar_tabelas(self):
+        """(ids dos objetos, impressão digital do conteúdo) das tabelas."""
+        if self._tabelas is None:
+            return None, None
+        tabelas = self._tabelas()
+        return tuple(id(t) for t in tabelas), impressao_digital(tabelas)
+
+    def _verificar_tabelas(self):
+        if self._tabelas is None:
+            return
+        agora = time.monotonic()
+        ids = tuple(id(t) for t in self._tabelas())
+        if ids == self._ids_tabelas and agora - self._ultima_verificacao < self._intervalo:
+            return
+        self._ultima_verificacao = agora
+        ids, impressao = self._identificar_tabelas()
+        if (ids, impressao) != (self._ids_tabelas, self._impressao_tabelas):
+            self._ids_tabelas, self._impressao_tabelas = ids, impressao
+            self._dados.clear()
+            self.invalidacoes += 1
+
+    def obter(self, chave):
+        """Retorna (encontrado, valor)."""
+        with self._lock:
+            self._verificar_tabelas()
+            item = self._dados.get(chave)
+            if item is None:
+                self.misses += 1
+                return False, None
+            valor, criado_em = item
+            if self.ttl and time.monotonic() - criado_em > self.ttl:
+                del self._dados[chave]
+                self.expirados += 1
+                self.misses += 1
+                return False, None
+            self._dados.move_to_end(chave)
+            self.hits += 1
+            return True, valor
+
+    def guardar(self, chave, valor):
+        with self._lock:
+            self._dados[chave] = (valor, time.monotonic())
+            self._dados.move_to_end(chave)
+            while len(self._dados) > self.tamanho:
+                self._dados.popitem(last=False)
+                self.evictions += 1
+
+    def limpar(self):
+        with self._lock:
+            self._dados.clear()
+
+    def estatisticas(self):
+        with self._lock:
+            consultas = self.hits + self.misses
+            return {
+                "entradas": len(self._dados),
+                "tamanho_maximo": self.tamanho,
+                "ttl_segundos": self.ttl,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "expirados": self.expirados,
+                "invalidacoes": self.invalidacoes,
+                "hit_rate": round(self.hits / consultas, 4) if consultas else 0.0,
+            }
+
+
+def em_cache(nome, tamanho=None, ttl=None, tabelas=None, normalizar=None):
+    """
+    Decorador que coloca um CacheLRU na frente da função.
+      - nome: identificação nas estatísticas
+      - tabelas: função sem argumentos que devolve as tabelas de que o cálculo depende
+      - normalizar: função que recebe os mesmos argumentos e devolve uma chave
+        (ex.: a entrada já validada); se ela falhar, a função é chamada sem cache
+    Exceções não são guardadas. O resultado é congelado (somente leitura) e o
+    mesmo objeto é devolvido a todas as chamadas com a mesma entrada.
+    """
+    tamanho = TAMANHO_PADRAO if tamanho is None else tamanho
+    ttl = TTL_PADRAO if ttl is None else ttl
+
+    def decorador(funcao):
+        if tamanho <= 0:
+            return funcao
+
+        cache = CacheLRU(tamanho, ttl, tabelas)
+        CACHES[nome] = cache
+
+        @wraps(funcao)
+        def envoltorio(*args, **kwargs):
+            try:
+                chave = chave_canonica(normalizar(*args, **kwargs)) if normalizar else chave_canonica(*args, **kwargs)
+            except Exception:
+                return funcao(*args, **kwargs)
+
+            encontrado, valor = cache.obter(chave)
+            if encontrado:
+                return valor
+            valor = congelar(funcao(*args, **kwargs))
+            cache.guardar(chave, valor)
+            return valor
+
+        envoltorio.cache = cache
+        return envoltorio
+
+    return decorador
+
+
+def invalidar_caches():
+    """Esvazia todos os caches (ex.: depois de atualizar uma tabela de tributos)."""
+    for cache in CACHES.values():
+        cache.limpar()
+
+
+def estatisticas_caches():
+    """Estatísticas de todos os caches registrados, por nome."""
+    return {nome: cache.estatisticas() for nome, cache in CACHES.items()}
@@ -1,5 +1,8 @@
 import json
 
+from centavos import arredondar, para_reais
+from tabela_progressiva import TabelaProgressiva
+
 # --- Constantes de cálculo ---
 TABELA_IRPF = [
     (2259.20, 0.0, 0.0),
@@ -16,6 +19,10 @@ ALIQUOTA_INSS = 0.11
 TETO_INSS = 8157.41
 INSS_MAXIMO = TETO_INSS * ALIQUOTA_INSS
 
+# Tabelas pré-compiladas: INSS do sócio (11% até o teto) e IRPF
+TABELA_INSS_PRO_LABORE = TabelaProgressiva.por_faixas([(TETO_INSS, ALIQUOTA_INSS)], teto=TETO_INSS)
+TABELA_IRPF_COMPILADA = TabelaProgressiva.por_deducao(TABELA_IRPF)
+
 
 def calcular_darf_pro_labore(dados_json: dict):
     """
@@ -36,34 +43,33 @@ def calcular_darf_pro_labore(dados_json: dict):
     pro_labore_calculado = faturamento_mensal * PERCENTUAL_FATOR_R
     pro_labore = max(pro_labore_calculado, PISO_PRO_LABORE)
 
-    inss_descontado = min(pro_labore * ALIQUOTA_INSS, INSS_MAXIMO)
+    inss_descontado = TABELA_INSS_PRO_LABORE.calcular(pro_labore)
     base_calculo_irpf = pro_labore - inss_descontado
+    darf_irpf = TABELA_IRPF_COMPILADA.calcular(base_calculo_irpf)
 
-    darf_irpf = 0.0
-    for limite, aliquota, deducao in TABELA_IRPF:
-        if base_calculo_irpf <= limite:
-            darf_irpf = (base_calculo_irpf * aliquota) - deducao
-            break
-    darf_irpf = max(0.0, darf_irpf)
-
-    total_a_recolher = inss_descontado + darf_irpf
+    # Em centavos: o total é a soma exata do INSS e do IR exibidos
+    inss_centavos = arredondar(inss_descontado)
+    ir_centavos = arredondar(darf_irpf)
+    inss_descontado = para_reais(inss_centavos)
+    darf_irpf = para_reais(ir_centavos)
+    total_a_recolher = para_reais(inss_centavos + ir_centavos)
 
     # Resultado (dupla representação para segurança)
     resultado = {
         # chaves curtas (recomendadas pro front)
         "pro_labore": round(pro_labore, 2),
-        "inss": round(inss_descontado, 2),
+        "inss": inss_descontado,
         "base_irpf": round(base_calculo_irpf, 2),
-        "ir": round(darf_irpf, 2),
-        "total_darf": round(total_a_recolher, 2),
+        "ir": darf_irpf,
+        "total_darf": total_a_recolher,
 
         # chaves verbosas originais (compatibilidade com quem já usava esses nomes)
         "Faturamento Mensal": round(faturamento_mensal, 2),
         "Pró-labore (Base de Cálculo)": round(pro_labore, 2),
-        "Contribuição INSS (11%)": round(inss_descontado, 2),
+        "Contribuição INSS (11%)": inss_descontado,
         "Base para Cálculo do IRPF": round(base_calculo_irpf, 2),
-        "Imposto de Renda (IR)": round(darf_irpf, 2),
-        "Total a Recolher (INSS + IR) Darf": round(total_a_recolher, 2),
+        "Imposto de Renda (IR)": darf_irpf,
+        "Total a Recolher (INSS + IR) Darf": total_a_recolher,
     }
 
     return resultado
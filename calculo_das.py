@@ -7,9 +7,24 @@ aplica isenção de PIS/COFINS/ISS quando exportacao_servico == 1.
 Base original e dados mantidos (origem: seu arquivo anterior). :contentReference[oaicite:1]{index=1}
 """
 
+import os
 import sys
+import io
+import csv
 import json
+import math
+import time
 import argparse
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from itertools import islice
+from bisect import bisect_left
+from types import MappingProxyType
+from typing import NamedTuple
+
+import numpy as np
+
+from centavos import arredondar, para_reais, ratear, ratear_array
 
 # --- ESTRUTURA DE DADOS CENTRALIZADA (mantida) ---
 DADOS_DOS_ANEXOS = {
@@ -27,6 +42,9 @@ DADOS_DOS_ANEXOS = {
 
 LIMITES_DAS_FAIXAS = [180000, 360000, 720000, 1800000, 3600000, 4800000]
 
+TITULO_CALCULO_PADRAO = "Cálculo Padrão"
+TITULO_CALCULO_ALTERNATIVO = "Cálculo Alternativo (como Anexo III / Fator-R)"
+
 reparticao_simples_nacional = {
     "Anexo I": [
         {'faixa': 1, 'rbt12_max': 180000.00, 'IRPJ': 5.50, 'CSLL': 3.50, 'COFINS': 12.74, 'PIS/Pasep': 2.76, 'CPP': 41.50, 'ICMS': 34.00},
@@ -71,15 +89,77 @@ reparticao_simples_nacional = {
 }
 
 
+TRIBUTOS_DAS = ["IRPJ", "CSLL", "COFINS", "PIS/Pasep", "CPP", "ICMS", "IPI", "ISS"]
+TRIBUTOS_ISENTOS_EXPORTACAO = ["PIS/Pasep", "COFINS", "ISS"]
+ANEXOS_ISENCAO_EXPORTACAO = [3, 4, 5]
+
+
+# ----------------- TABELA COMPILADA -----------------
+class FaixaCompilada(NamedTuple):
+    """Dados já resolvidos de uma faixa de um anexo (percentuais convertidos em frações)."""
+    faixa: int
+    aliquota_nominal: float
+    fracao_nominal: float
+    deducao: float
+    tributos: tuple
+    fracoes: tuple
+    isentos_exportacao: tuple
+    isencao_exportacao: bool
+
+
+class TabelaSimplesCompilada:
+    """
+    Tabela imutável do Simples Nacional, montada uma única vez na importação a
+    partir de DADOS_DOS_ANEXOS e reparticao_simples_nacional.
+    A faixa é localizada por bisect e cada (anexo, faixa) já traz alíquota,
+    dedução e o vetor ordenado de repartição, sem consultas a dicionários
+    nem tratamento de strings no momento do cálculo.
+    """
+    __slots__ = ("limites", "anexos")
+
+    def __init__(self, dados_anexos, limites, reparticao):
+        faixas_por_anexo = {}
+        for anexo, dados in dados_anexos.items():
+            nome_anexo = dados["nome"].split(" (")[0]
+            faixas = []
+            for faixa_idx, linha in enumerate(reparticao[nome_anexo]):
+                tributos = tuple(k for k in linha if k not in ("faixa", "rbt12_max"))
+                aliquota_nominal = dados["aliquotas"][faixa_idx]
+                isencao = anexo in ANEXOS_ISENCAO_EXPORTACAO
+                faixas.append(FaixaCompilada(
+                    faixa=faixa_idx + 1,
+                    aliquota_nominal=aliquota_nominal,
+                    fracao_nominal=aliquota_nominal / 100,
+                    deducao=dados["deducoes"][faixa_idx],
+                    tributos=tributos,
+                    fracoes=tuple(linha[t] / 100 for t in tributos),
+                    isentos_exportacao=tuple(isencao and t in TRIBUTOS_ISENTOS_EXPORTACAO for t in tributos),
+                    isencao_exportacao=isencao,
+                ))
+            faixas_por_anexo[anexo] = tuple(faixas)
+
+        object.__setattr__(self, "limites", tuple(limites))
+        object.__setattr__(self, "anexos", MappingProxyType(faixas_por_anexo))
+
+    def __setattr__(self, nome, valor):
+        raise AttributeError("TabelaSimplesCompilada é imutável.")
+
+    def faixa_idx(self, rbt12):
+        """Índice (0-based) da faixa da RBT12, ou None se ultrapassar o limite do Simples."""
+        idx = bisect_left(self.limites, rbt12)
+        return idx if idx < len(self.limites) else None
+
+    def faixa(self, anexo, faixa_idx):
+        return self.anexos[anexo][faixa_idx]
+
+
+TABELA_SIMPLES = TabelaSimplesCompilada(DADOS_DOS_ANEXOS, LIMITES_DAS_FAIXAS, reparticao_simples_nacional)
+
+
 # ----------------- FUNÇÕES AUXILIARES -----------------
 def determinar_faixa(rbt12):
     """Determina o índice da faixa de faturamento com base na RBT12."""
-    if rbt12 > LIMITES_DAS_FAIXAS[-1]:
-        return None
-    for i, limite in enumerate(LIMITES_DAS_FAIXAS):
-        if rbt12 <= limite:
-            return i
-    return len(LIMITES_DAS_FAIXAS) - 1
+    return TABELA_SIMPLES.faixa_idx(rbt12)
 
 
 def exibir_rateio(rateio_calculado):
@@ -98,15 +178,10 @@ def exibir_rateio(rateio_calculado):
             print(f"{tributo:<12}: Isento")
 
 
-# ----------------- FUNÇÃO PRINCIPAL DE CÁLCULO -----------------
-def calcular_simples_nacional_from_input(data: dict):
+def extrair_entrada(data: dict):
     """
-    Espera dicionário com chaves:
-      - anexo: int 1..5
-      - rbt: número (RBT12)
-      - faturamento: número (faturamento do mês atual)
-      - exportacao_servico: 0 ou 1 (ou False/True)
-      - optante_fator_r: opcional 0/1 (se presente e ==1, aplica tratamento de fator-r)
+    Valida e converte o dicionário de entrada.
+    Retorna a tupla (anexo, rbt12, faturamento, exportacao, optante_fator_r).
     """
     # Validações básicas
     required = ["anexo", "rbt", "faturamento", "exportacao_servico"]
@@ -114,67 +189,76 @@ def calcular_simples_nacional_from_input(data: dict):
         if k not in data:
             raise ValueError(f"Campo obrigatório '{k}' não fornecido no JSON de entrada.")
 
-    anexo_original = int(data["anexo"])
-    if anexo_original not in DADOS_DOS_ANEXOS:
+    anexo = int(data["anexo"])
+    if anexo not in DADOS_DOS_ANEXOS:
         raise ValueError("Anexo inválido. Deve ser 1,2,3,4 ou 5.")
 
     rbt12 = float(data["rbt"])
     faturamento_mensal = float(data["faturamento"])
+    if not (math.isfinite(rbt12) and math.isfinite(faturamento_mensal)):
+        raise ValueError("RBT12 e faturamento devem ser números finitos.")
     is_exportacao = bool(int(data.get("exportacao_servico", 0)))
     optante_fator_r = bool(int(data.get("optante_fator_r", 0)))  # se presente, respeita; se não, assume False
 
+    return anexo, rbt12, faturamento_mensal, is_exportacao, optante_fator_r
+
+
+# ----------------- FUNÇÃO PRINCIPAL DE CÁLCULO -----------------
+def calcular_simples_nacional_from_input(data: dict):
+    """
+    Espera dicionário com chaves:
+      - anexo: int 1..5
+      - rbt: número (RBT12)
+      - faturamento: número (faturamento do mês atual)
+      - exportacao_servico: 0 ou 1 (ou False/True)
+      - optante_fator_r: opcional 0/1 (se presente e ==1, aplica tratamento de fator-r)
+    Não escreve nada no console; a exibição fica a cargo de exibir_resultado (CLI).
+    """
+    anexo_original, rbt12, faturamento_mensal, is_exportacao, optante_fator_r = extrair_entrada(data)
+
     # Função interna reaproveitável (para calcular em qualquer anexo)
     def calcular_em_anexo(anexo_calculo: int):
-        faixa_idx = determinar_faixa(rbt12)
+        faixa_idx = TABELA_SIMPLES.faixa_idx(rbt12)
         if faixa_idx is None:
             raise ValueError("A RBT12 informada ultrapassa o limite de R$ 4.800.000,00 do Simples Nacional.")
 
-        dados_anexo_calculo = DADOS_DOS_ANEXOS[anexo_calculo]
-        aliquota_nominal = dados_anexo_calculo["aliquotas"][faixa_idx]
-        deducao = dados_anexo_calculo["deducoes"][faixa_idx]
+        faixa = TABELA_SIMPLES.faixa(anexo_calculo, faixa_idx)
 
         if rbt12 == 0:
-            aliquota_efetiva_cheia = aliquota_nominal
+            aliquota_efetiva_cheia = faixa.aliquota_nominal
         else:
-            aliquota_efetiva_cheia = ((rbt12 * (aliquota_nominal / 100)) - deducao) / rbt12
+            aliquota_efetiva_cheia = ((rbt12 * faixa.fracao_nominal) - faixa.deducao) / rbt12
             aliquota_efetiva_cheia *= 100
 
         valor_das_cheio = faturamento_mensal * (aliquota_efetiva_cheia / 100)
 
-        nome_anexo_calculo_str = DADOS_DOS_ANEXOS[anexo_calculo]['nome'].split(' (')[0]
-        reparticao_usada = reparticao_simples_nacional[nome_anexo_calculo_str][faixa_idx]
-
-        rateio_final = {}
-        valor_das_final = 0.0
-        aliquota_efetiva_final = 0.0
-
-        if is_exportacao and anexo_calculo in [3, 4, 5]:
-            impostos_isentos = ['PIS/Pasep', 'COFINS', 'ISS']
-            for imposto, perc in reparticao_usada.items():
-                if imposto in ("faixa", "rbt12_max"):
-                    continue
-                valor_imposto = valor_das_cheio * (perc / 100)
-                if imposto in impostos_isentos:
+        if is_exportacao and faixa.isencao_exportacao:
+            rateio_final = {}
+            valor_das_final = 0.0
+            for imposto, fracao, isento in zip(faixa.tributos, faixa.fracoes, faixa.isentos_exportacao):
+                if isento:
                     rateio_final[imposto] = 0.0
                 else:
+                    valor_imposto = valor_das_cheio * fracao
                     rateio_final[imposto] = valor_imposto
                     valor_das_final += valor_imposto
             aliquota_efetiva_final = (valor_das_final / faturamento_mensal) * 100 if faturamento_mensal > 0 else 0.0
         else:
             valor_das_final = valor_das_cheio
             aliquota_efetiva_final = aliquota_efetiva_cheia
-            for imposto, perc in reparticao_usada.items():
-                if imposto in ("faixa", "rbt12_max"):
-                    continue
-                rateio_final[imposto] = valor_das_cheio * (perc / 100)
+            rateio_final = {imposto: valor_das_cheio * fracao for imposto, fracao in zip(faixa.tributos, faixa.fracoes)}
+
+        # Rateio em centavos pelos maiores restos: as partes somam exatamente o DAS a pagar
+        valor_das_centavos = arredondar(valor_das_final)
+        rateio_centavos = ratear(valor_das_centavos, list(rateio_final.values()))
 
         resultado = {
             "anexo_usado": anexo_calculo,
             "rbt12": rbt12,
-            "faixa": faixa_idx + 1,
+            "faixa": faixa.faixa,
             "aliquota_efetiva_percent": round(aliquota_efetiva_final, 8),
-            "valor_das_a_pagar": round(valor_das_final, 2),
-            "rateio": {k: round(v, 2) for k, v in rateio_final.items()},
+            "valor_das_a_pagar": para_reais(valor_das_centavos),
+            "rateio": {k: para_reais(c) for k, c in zip(rateio_final, rateio_centavos)},
         }
 
         return resultado
@@ -185,16 +269,21 @@ def calcular_simples_nacional_from_input(data: dict):
 
     # Cálculo padrão (para qualquer anexo)
     resultado_padrao = calcular_em_anexo(anexo_original)
-    resultados.append(("Cálculo Padrão", resultado_padrao))
+    resultados.append((TITULO_CALCULO_PADRAO, resultado_padrao))
 
     # Caso seja anexo V, calcula também como se fosse Anexo III
     if anexo_original == 5:
         resultado_fator_r = calcular_em_anexo(3)
-        resultados.append(("Cálculo Alternativo (como Anexo III / Fator-R)", resultado_fator_r))
+        resultados.append((TITULO_CALCULO_ALTERNATIVO, resultado_fator_r))
 
-    # Exibição formatada
+    return {titulo: res for titulo, res in resultados}
+
+
+# ----------------- EXIBIÇÃO (CLI) -----------------
+def exibir_resultado(saida_json: dict):
+    """Exibe no console o relatório do cálculo e o JSON consolidado."""
     print("\n==================== RESULTADO DO CÁLCULO ====================")
-    for titulo, res in resultados:
+    for titulo, res in saida_json.items():
         print(f"\n--- {titulo} ---")
         print(f"Anexo Usado: {res['anexo_usado']}")
         print(f"Receita Bruta (RBT12): R$ {res['rbt12']:,.2f}")
@@ -204,11 +293,324 @@ def calcular_simples_nacional_from_input(data: dict):
         exibir_rateio(res["rateio"])
 
     # Exibir JSON final (com as duas saídas)
-    saida_json = {titulo: res for titulo, res in resultados}
     print("\n--- JSON Consolidado ---")
     print(json.dumps(saida_json, ensure_ascii=False, indent=2))
 
-    return saida_json
+
+# ----------------- CÁLCULO EM LOTE (VETORIZADO) -----------------
+
+def _montar_tabelas_vetorizadas():
+    """
+    Converte TABELA_SIMPLES em arrays NumPy, indexados diretamente pelo número
+    do anexo (linha 0 não é usada). A repartição é guardada em frações.
+    """
+    n_anexos = max(TABELA_SIMPLES.anexos) + 1
+    n_faixas = len(TABELA_SIMPLES.limites)
+
+    aliquotas = np.zeros((n_anexos, n_faixas))
+    deducoes = np.zeros((n_anexos, n_faixas))
+    reparticao = np.zeros((n_anexos, n_faixas, len(TRIBUTOS_DAS)))
+
+    for anexo, faixas in TABELA_SIMPLES.anexos.items():
+        for faixa_idx, faixa in enumerate(faixas):
+            aliquotas[anexo, faixa_idx] = faixa.aliquota_nominal
+            deducoes[anexo, faixa_idx] = faixa.deducao
+            for tributo, fracao in zip(faixa.tributos, faixa.fracoes):
+                reparticao[anexo, faixa_idx, TRIBUTOS_DAS.index(tributo)] = fracao
+
+    # Ordem de exibição dos tributos de cada anexo (mesma ordem do dicionário original)
+    tributos_por_anexo = {
+        anexo: [TRIBUTOS_DAS.index(t) for t in faixas[0].tributos]
+        for anexo, faixas in TABELA_SIMPLES.anexos.items()
+    }
+    return np.asarray(TABELA_SIMPLES.limites, dtype=float), aliquotas, deducoes, reparticao, tributos_por_anexo
+
+
+LIMITES_NP, ALIQUOTAS_NP, DEDUCOES_NP, REPARTICAO_NP, TRIBUTOS_POR_ANEXO = _montar_tabelas_vetorizadas()
+_COLUNAS_ISENTAS = np.isin(TRIBUTOS_DAS, TRIBUTOS_ISENTOS_EXPORTACAO)
+
+
+def calcular_das_vetorizado(anexos, rbt12, faturamento, exportacao):
+    """
+    Calcula o DAS coluna a coluna para vários registros de uma vez.
+    Recebe arrays (ou listas) de mesmo tamanho e devolve um dicionário de arrays:
+      - faixa_idx: índice da faixa (len(LIMITES_DAS_FAIXAS) quando a RBT12 excede o limite)
+      - fora_limite: máscara dos registros com RBT12 acima de R$ 4.800.000,00
+      - aliquota_efetiva, valor_das: alíquota efetiva (%) e valor do DAS
+      - rateio: matriz (registros x TRIBUTOS_DAS) com o valor de cada tributo
+      - valor_das_centavos, rateio_centavos: os mesmos valores em centavos (int64);
+        o rateio é feito pelos maiores restos e cada linha soma exatamente o DAS
+    A ordem das operações reproduz a de calcular_simples_nacional_from_input,
+    de modo que os resultados são idênticos aos do cálculo individual.
+    """
+    anexos = np.asarray(anexos, dtype=np.int64)
+    rbt12 = np.asarray(rbt12, dtype=float)
+    faturamento = np.asarray(faturamento, dtype=float)
+    exportacao = np.asarray(exportacao, dtype=bool)
+
+    faixa_idx = np.searchsorted(LIMITES_NP, rbt12, side="left")
+    fora_limite = faixa_idx >= len(LIMITES_NP)
+    faixa_tabela = np.minimum(faixa_idx, len(LIMITES_NP) - 1)
+
+    aliquota_nominal = ALIQUOTAS_NP[anexos, faixa_tabela]
+    deducao = DEDUCOES_NP[anexos, faixa_tabela]
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        aliquota_cheia = ((rbt12 * (aliquota_nominal / 100)) - deducao) / rbt12 * 100
+    aliquota_cheia = np.where(rbt12 == 0, aliquota_nominal, aliquota_cheia)
+
+    valor_das_cheio = faturamento * (aliquota_cheia / 100)
+    rateio = valor_das_cheio[:, None] * REPARTICAO_NP[anexos, faixa_tabela]
+
+    # Exportação de serviços (anexos III, IV e V): PIS/COFINS/ISS isentos
+    isento = exportacao & np.isin(anexos, ANEXOS_ISENCAO_EXPORTACAO)
+    rateio[np.ix_(isento, _COLUNAS_ISENTAS)] = 0.0
+
+    # Soma na mesma ordem do cálculo individual (tributos ausentes valem 0.0)
+    valor_das_isento = np.zeros_like(valor_das_cheio)
+    for j in range(rateio.shape[1]):
+        valor_das_isento = valor_das_isento + rateio[:, j]
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        aliquota_isento = np.where(faturamento > 0, (valor_das_isento / faturamento) * 100, 0.0)
+
+    valor_das = np.where(isento, valor_das_isento, valor_das_cheio)
+    valor_das_centavos = arredondar(valor_das)
+    return {
+        "faixa_idx": faixa_idx,
+        "fora_limite": fora_limite,
+        "aliquota_efetiva": np.where(isento, aliquota_isento, aliquota_cheia),
+        "valor_das": valor_das,
+        "rateio": rateio,
+        "valor_das_centavos": valor_das_centavos,
+        "rateio_centavos": ratear_array(valor_das_centavos, rateio),
+    }
+
+
+def _resultados_do_lote(anexos, rbt12, calculo):
+    """Converte a saída de calcular_das_vetorizado no formato de dicionário do cálculo individual."""
+    faixas = calculo["faixa_idx"].tolist()
+    aliquotas = calculo["aliquota_efetiva"].tolist()
+    valores = calculo["valor_das_centavos"].tolist()
+    rateios = calculo["rateio_centavos"].tolist()
+
+    resultados = []
+    for i, anexo in enumerate(anexos):
+        linha = rateios[i]
+        resultados.append({
+            "anexo_usado": anexo,
+            "rbt12": rbt12[i],
+            "faixa": faixas[i] + 1,
+            "aliquota_efetiva_percent": round(aliquotas[i], 8),
+            "valor_das_a_pagar": para_reais(valores[i]),
+            "rateio": {TRIBUTOS_DAS[j]: para_reais(linha[j]) for j in TRIBUTOS_POR_ANEXO[anexo]},
+        })
+    return resultados
+
+
+def calcular_simples_nacional_lote(registros: list):
+    """
+    Calcula o DAS de vários registros de uma só vez (mesmas chaves de
+    calcular_simples_nacional_from_input). Retorna uma lista, na mesma ordem
+    da entrada, com o JSON consolidado de cada registro ou {"erro": mensagem}
+    para os registros inválidos, sem interromper o restante do lote.
+    """
+    saidas = [None] * len(registros)
+    indices, anexos, rbts, faturamentos, exportacoes = [], [], [], [], []
+
+    for i, data in enumerate(registros):
+        try:
+            if not isinstance(data, dict):
+                raise ValueError("Registro deve ser um objeto JSON.")
+            anexo, rbt12, faturamento_mensal, is_exportacao, _ = extrair_entrada(data)
+        except Exception as e:
+            saidas[i] = {"erro": str(e)}
+            continue
+        indices.append(i)
+        anexos.append(anexo)
+        rbts.append(rbt12)
+        faturamentos.append(faturamento_mensal)
+        exportacoes.append(is_exportacao)
+
+    if not indices:
+        return saidas
+
+    calculo = calcular_das_vetorizado(anexos, rbts, faturamentos, exportacoes)
+    padrao = _resultados_do_lote(anexos, rbts, calculo)
+
+    # Cálculo alternativo (como Anexo III) para os registros do Anexo V
+    pos_anexo_v = [k for k, anexo in enumerate(anexos) if anexo == 5]
+    alternativo = {}
+    if pos_anexo_v:
+        rbts_v = [rbts[k] for k in pos_anexo_v]
+        calculo_v = calcular_das_vetorizado(
+            [3] * len(pos_anexo_v),
+            rbts_v,
+            [faturamentos[k] for k in pos_anexo_v],
+            [exportacoes[k] for k in pos_anexo_v],
+        )
+        alternativo = dict(zip(pos_anexo_v, _resultados_do_lote([3] * len(pos_anexo_v), rbts_v, calculo_v)))
+
+    fora_limite = calculo["fora_limite"].tolist()
+    for k, i in enumerate(indices):
+        if fora_limite[k]:
+            saidas[i] = {"erro": "A RBT12 informada ultrapassa o limite de R$ 4.800.000,00 do Simples Nacional."}
+            continue
+        saida = {TITULO_CALCULO_PADRAO: padrao[k]}
+        if k in alternativo:
+            saida[TITULO_CALCULO_ALTERNATIVO] = alternativo[k]
+        saidas[i] = saida
+
+    return saidas
+
+
+# ----------------- PROCESSAMENTO EM MASSA (CLI) -----------------
+COLUNAS_CSV_LOTE = (
+    ["linha", "erro", "anexo_usado", "rbt12", "faixa", "aliquota_efetiva_percent", "valor_das_a_pagar"]
+    + TRIBUTOS_DAS
+    + ["fator_r_aliquota_efetiva_percent", "fator_r_valor_das_a_pagar"]
+)
+
+
+def _formato_por_extensao(caminho, padrao="jsonl"):
+    if caminho and caminho.lower().endswith(".csv"):
+        return "csv"
+    return padrao
+
+
+def ler_registros(caminho, formato):
+    """
+    Gera os registros do arquivo, um por vez, sem carregá-lo inteiro.
+    JSONL: cada linha é entregue crua (str) e decodificada no processo de cálculo.
+    CSV: cada linha é entregue como dicionário (cabeçalho obrigatório).
+    """
+    with open(caminho, "r", encoding="utf-8", newline="") as fh:
+        if formato == "csv":
+            yield from csv.DictReader(fh)
+            return
+        for linha in fh:
+            linha = linha.strip()
+            if linha:
+                yield linha
+
+
+def agrupar_em_blocos(registros, tamanho):
+    """Agrupa um iterável em listas de até `tamanho` itens, sem materializá-lo."""
+    iterador = iter(registros)
+    while True:
+        bloco = list(islice(iterador, tamanho))
+        if not bloco:
+            return
+        yield bloco
+
+
+def _linha_csv(numero, resultado):
+    linha = {"linha": numero, "erro": resultado.get("erro", "")}
+    padrao = resultado.get(TITULO_CALCULO_PADRAO)
+    if padrao:
+        linha.update({k: padrao[k] for k in ("anexo_usado", "rbt12", "faixa", "aliquota_efetiva_percent", "valor_das_a_pagar")})
+        linha.update(padrao["rateio"])
+    alternativo = resultado.get(TITULO_CALCULO_ALTERNATIVO)
+    if alternativo:
+        linha["fator_r_aliquota_efetiva_percent"] = alternativo["aliquota_efetiva_percent"]
+        linha["fator_r_valor_das_a_pagar"] = alternativo["valor_das_a_pagar"]
+    return linha
+
+
+def processar_bloco(primeira_linha, bloco, formato_saida):
+    """
+    Decodifica, calcula e serializa um bloco de registros.
+    Retorna (texto pronto para gravar, quantidade de registros, quantidade com erro).
+    """
+    registros = []
+    erros_leitura = {}
+    for i, item in enumerate(bloco):
+        if isinstance(item, str):
+            try:
+                item = json.loads(item)
+            except ValueError as e:
+                erros_leitura[i] = f"JSON inválido: {e}"
+                continue
+        registros.append(item)
+
+    calculados = iter(calcular_simples_nacional_lote(registros))
+    buffer = io.StringIO()
+    escritor = csv.DictWriter(buffer, fieldnames=COLUNAS_CSV_LOTE, extrasaction="ignore") if formato_saida == "csv" else None
+    erros = 0
+
+    for i in range(len(bloco)):
+        resultado = {"erro": erros_leitura[i]} if i in erros_leitura else next(calculados)
+        if "erro" in resultado:
+            erros += 1
+        numero = primeira_linha + i
+        if escritor:
+            escritor.writerow(_linha_csv(numero, resultado))
+        else:
+            buffer.write(json.dumps({"linha": numero, **resultado}, ensure_ascii=False))
+            buffer.write("\n")
+
+    return buffer.getvalue(), len(bloco), erros
+
+
+def processar_em_paralelo(blocos, formato_saida, workers, primeira_linha=1):
+    """
+    Distribui os blocos num ProcessPoolExecutor mantendo no máximo 2 blocos
+    por worker em andamento, e devolve os resultados na ordem de entrada.
+    primeira_linha é o número do primeiro registro (para retomar um lote no meio).
+    """
+    if workers <= 1:
+        for bloco in blocos:
+            yield processar_bloco(primeira_linha, bloco, formato_saida)
+            primeira_linha += len(bloco)
+        return
+
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        pendentes = deque()
+        for bloco in blocos:
+            pendentes.append(executor.submit(processar_bloco, primeira_linha, bloco, formato_saida))
+            primeira_linha += len(bloco)
+            if len(pendentes) >= workers * 2:
+                yield pendentes.popleft().result()
+        while pendentes:
+            yield pendentes.popleft().result()
+
+
+def executar_lote(entrada, saida=None, formato_entrada=None, formato_saida=None, workers=None, tamanho_bloco=5000):
+    """
+    Processa um arquivo JSONL/CSV de qualquer tamanho com memória constante,
+    gravando os resultados à medida que ficam prontos (JSONL ou CSV).
+    Retorna as estatísticas da execução.
+    """
+    formato_entrada = formato_entrada or _formato_por_extensao(entrada)
+    formato_saida = formato_saida or _formato_por_extensao(saida)
+    workers = workers or os.cpu_count() or 1
+
+    inicio = time.perf_counter()
+    total = erros = 0
+
+    fh = open(saida, "w", encoding="utf-8", newline="") if saida else sys.stdout
+    try:
+        if formato_saida == "csv":
+            csv.DictWriter(fh, fieldnames=COLUNAS_CSV_LOTE).writeheader()
+
+        blocos = agrupar_em_blocos(ler_registros(entrada, formato_entrada), tamanho_bloco)
+        for texto, quantidade, erros_bloco in processar_em_paralelo(blocos, formato_saida, workers):
+            fh.write(texto)
+            fh.flush()
+            total += quantidade
+            erros += erros_bloco
+    finally:
+        if saida:
+            fh.close()
+
+    duracao = time.perf_counter() - inicio
+    return {
+        "registros": total,
+        "erros": erros,
+        "segundos": round(duracao, 3),
+        "registros_por_segundo": round(total / duracao, 1) if duracao > 0 else 0.0,
+        "workers": workers,
+    }
 
 
 # ----------------- ENTRYPOINT -----------------
@@ -216,8 +618,31 @@ def main():
     parser = argparse.ArgumentParser(description="Calcula DAS (entrada via JSON)")
     parser.add_argument("--input", "-i", help="JSON com os dados (ex: '{\"anexo\":3,...}')")
     parser.add_argument("--file", "-f", help="Arquivo JSON contendo os dados de entrada")
+    parser.add_argument("--lote", "-l", help="Arquivo JSONL ou CSV com um registro por linha (modo em massa)")
+    parser.add_argument("--saida", "-o", help="Arquivo de saída do modo em massa (.jsonl ou .csv; padrão: stdout)")
+    parser.add_argument("--formato-entrada", choices=["jsonl", "csv"], help="Força o formato do arquivo --lote")
+    parser.add_argument("--formato-saida", choices=["jsonl", "csv"], help="Força o formato da saída do lote")
+    parser.add_argument("--workers", "-w", type=int, help="Processos do modo em massa (padrão: nº de CPUs)")
+    parser.add_argument("--tamanho-bloco", type=int, default=5000, help="Registros por bloco enviado a cada processo")
     args = parser.parse_args()
 
+    if args.lote:
+        try:
+            estatisticas = executar_lote(
+                args.lote, args.saida, args.formato_entrada, args.formato_saida,
+                args.workers, args.tamanho_bloco,
+            )
+        except Exception as e:
+            print(f"Erro no processamento em massa: {e}", file=sys.stderr)
+            sys.exit(1)
+        print(
+            f"{estatisticas['registros']} registros ({estatisticas['erros']} com erro) em "
+            f"{estatisticas['segundos']:.2f}s — {estatisticas['registros_por_segundo']:,.0f} registros/s "
+            f"com {estatisticas['workers']} worker(s).",
+            file=sys.stderr,
+        )
+        return
+
     raw = None
     if args.input:
         raw = args.input
@@ -229,7 +654,7 @@ def main():
             print(f"Erro ao ler arquivo: {e}", file=sys.stderr)
             sys.exit(1)
     else:
-        print("ERRO: É necessário informar um JSON de entrada via --input ou --file.", file=sys.stderr)
+        print("ERRO: É necessário informar um JSON de entrada via --input, --file ou --lote.", file=sys.stderr)
         print("Exemplo: python calcula_das_json.py --input '{\"anexo\":3,\"rbt\":100000,\"faturamento\":1000,\"exportacao_servico\":0}'", file=sys.stderr)
         sys.exit(2)
 
@@ -240,11 +665,13 @@ def main():
         sys.exit(3)
 
     try:
-        calcular_simples_nacional_from_input(data)
+        saida_json = calcular_simples_nacional_from_input(data)
     except Exception as e:
         print(f"Erro no cálculo: {e}", file=sys.stderr)
         sys.exit(4)
 
+    exibir_resultado(saida_json)
+
 
 if __name__ == "__main__":
     main()
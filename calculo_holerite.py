@@ -0,0 +1,251 @@
+# calculo_holerite.py
+# Folha de pagamento mensal (holerite) de uma lista inteira de funcionários
+#
+# O cálculo é colunar: a entrada vira um array NumPy por campo e INSS, IRRF,
+# FGTS e líquido saem de uma única passada sobre a folha, com as mesmas
+# tabelas 2025 da rescisão (TabelaProgressiva.calcular_array). Os valores
+# exibidos são inteiros de centavos (centavos.py), então o líquido é
+# exatamente proventos - descontos de cada holerite.
+#
+# Campos por funcionário (ausentes valem 0):
+#   matricula, nome                       identificação, devolvida como veio
+#   salario_base (obrigatório, > 0), adicionais, horas_extras, comissoes
+#   dependentes                           dependentes para o IRRF
+#   pensao, adiantamento, outros_descontos
+#   vale_transporte                       custo mensal do VT; o desconto é o menor
+#                                         entre esse custo e 6% do salário base
+#
+# A competência ('YYYY-MM') vale para a folha toda e escolhe a tabela do IRRF.
+
+import io
+import csv
+import sys
+import json
+import math
+import argparse
+import datetime
+
+import numpy as np
+
+from centavos import arredondar, para_reais
+from calculo_rescisao import (
+    DEDUCAO_DEPENDENTE_2025, INICIO_TABELA_IRRF_MAI_2025, TABELA_INSS_2025, CAMPOS_IDENTIFICACAO,
+    ler_funcionarios_csv, tabela_irrf_vigente,
+)
+
+ALIQUOTA_FGTS = 0.08
+PERCENTUAL_VALE_TRANSPORTE = 0.06
+
+# Desconto simplificado mensal do IRRF (25% da faixa isenta), usado quando
+# supera as deduções legais (INSS + dependentes + pensão)
+DESCONTO_SIMPLIFICADO_JAN_ABR_2025 = 564.80
+DESCONTO_SIMPLIFICADO_MAI_2025 = 607.20
+
+CAMPOS_PROVENTOS = ("salario_base", "adicionais", "horas_extras", "comissoes")
+CAMPOS_DESCONTOS = ("pensao", "adiantamento", "outros_descontos")
+CAMPOS_NUMERICOS = CAMPOS_PROVENTOS + CAMPOS_DESCONTOS + ("vale_transporte",)
+
+# Colunas de cada holerite na saída (JSON e CSV), na ordem do demonstrativo
+COLUNAS_HOLERITE = (
+    ["linha", "erro", "matricula", "nome", "dependentes"]
+    + list(CAMPOS_PROVENTOS)
+    + ["total_proventos", "inss", "irrf"]
+    + list(CAMPOS_DESCONTOS)
+    + ["vale_transporte", "total_descontos", "liquido", "fgts", "base_inss", "base_irrf"]
+)
+COLUNAS_MONETARIAS = (
+    list(CAMPOS_PROVENTOS)
+    + ["total_proventos", "inss", "irrf"]
+    + list(CAMPOS_DESCONTOS)
+    + ["vale_transporte", "total_descontos", "liquido", "fgts", "base_inss", "base_irrf"]
+)
+COLUNAS_TOTAIS = ("total_proventos", "inss", "irrf", "total_descontos", "liquido", "fgts")
+
+
+def parse_competencia(valor=None):
+    """'YYYY-MM' (ou 'YYYY-MM-DD') -> date do primeiro dia do mês; sem valor, o mês atual."""
+    if not valor:
+        return datetime.date.today().replace(day=1)
+    try:
+        return datetime.datetime.strptime(str(valor).strip()[:7], "%Y-%m").date()
+    except ValueError:
+        raise ValueError(f"Competência inválida: '{valor}' (use o formato AAAA-MM).")
+
+
+def desconto_simplificado_vigente(competencia):
+    if competencia >= INICIO_TABELA_IRRF_MAI_2025:
+        return DESCONTO_SIMPLIFICADO_MAI_2025
+    return DESCONTO_SIMPLIFICADO_JAN_ABR_2025
+
+
+def _numero(valor):
+    if valor is None or valor == "":
+        return 0.0
+    if isinstance(valor, (int, float)):
+        return float(valor)
+    return float(str(valor).replace(",", "."))
+
+
+def _ler_funcionario(dados):
+    """Valores numéricos de um funcionário, validados. ValueError com a mensagem da linha."""
+    if not isinstance(dados, dict):
+        raise ValueError("Registro deve ser um objeto JSON.")
+    try:
+        valores = [_numero(dados.get(campo)) for campo in CAMPOS_NUMERICOS]
+        dependentes = int(_numero(dados.get("dependentes")))
+    except (ValueError, TypeError, OverflowError) as e:
+        raise ValueError(f"Erro nos dados de entrada: {e}")
+    if valores[0] <= 0:
+        raise ValueError("Informe o salário base.")
+    if not all(math.isfinite(v) for v in valores):
+        raise ValueError("Valores devem ser números finitos.")
+    if dependentes < 0 or any(v < 0 for v in valores):
+        raise ValueError("Valores e dependentes não podem ser negativos.")
+    return valores, dependentes
+
+
+def montar_colunas(funcionarios):
+    """
+    Converte a lista de funcionários (dicts) em colunas NumPy.
+    Retorna (colunas, indices_validos, identificacoes, erros), onde erros
+    mapeia a posição na entrada para a mensagem dos registros inválidos.
+    """
+    linhas, dependentes, indices, identificacoes, erros = [], [], [], [], {}
+    for i, dados in enumerate(funcionarios):
+        try:
+            valores, deps = _ler_funcionario(dados)
+        except ValueError as e:
+            erros[i] = str(e)
+            continue
+        linhas.append(valores)
+        dependentes.append(deps)
+        indices.append(i)
+        identificacoes.append({k: dados[k] for k in CAMPOS_IDENTIFICACAO if k in dados})
+
+    matriz = np.array(linhas, dtype=float).reshape(len(linhas), len(CAMPOS_NUMERICOS))
+    colunas = {campo: matriz[:, j] for j, campo in enumerate(CAMPOS_NUMERICOS)}
+    colunas["dependentes"] = np.array(dependentes, dtype=np.int64)
+    return colunas, indices, identificacoes, erros
+
+
+def calcular_folha_colunar(colunas, competencia):
+    """
+    Calcula a folha inteira numa passada. colunas: arrays de mesmo tamanho
+    com os CAMPOS_NUMERICOS e "dependentes". Retorna um dicionário de arrays
+    int64 em centavos (um por coluna monetária de COLUNAS_HOLERITE).
+    """
+    # Proventos: cada verba é arredondada e o total é a soma das verbas exibidas
+    saida = {campo: arredondar(colunas[campo]) for campo in CAMPOS_PROVENTOS + CAMPOS_DESCONTOS}
+    total_proventos = sum(saida[campo] for campo in CAMPOS_PROVENTOS)
+    remuneracao = para_reais(total_proventos)
+
+    # INSS progressivo sobre a remuneração do mês (limitado ao teto)
+    inss = arredondar(TABELA_INSS_2025.calcular_array(remuneracao))
+
+    # IRRF: deduções legais ou desconto simplificado, o que for mais favorável
+    deducoes_legais = (
+        para_reais(inss) + colunas["dependentes"] * DEDUCAO_DEPENDENTE_2025 + para_reais(saida["pensao"])
+    )
+    deducao = np.maximum(deducoes_legais, desconto_simplificado_vigente(competencia))
+    base_irrf = np.maximum(remuneracao - deducao, 0.0)
+    irrf = arredondar(tabela_irrf_vigente(competencia).calcular_array(base_irrf))
+
+    vale_transporte = arredondar(
+        np.minimum(colunas["vale_transporte"], colunas["salario_base"] * PERCENTUAL_VALE_TRANSPORTE)
+    )
+    total_descontos = inss + irrf + vale_transporte + sum(saida[campo] for campo in CAMPOS_DESCONTOS)
+
+    saida.update({
+        "total_proventos": total_proventos,
+        "inss": inss,
+        "irrf": irrf,
+        "vale_transporte": vale_transporte,
+        "total_descontos": total_descontos,
+        "liquido": total_proventos - total_descontos,
+        "fgts": arredondar(remuneracao * ALIQUOTA_FGTS),
+        "base_inss": np.minimum(total_proventos, arredondar(TABELA_INSS_2025.teto)),
+        "base_irrf": arredondar(base_irrf),
+    })
+    return saida
+
+
+def calcular_holerites(funcionarios, competencia=None):
+    """
+    Holerite de cada funcionário da lista, na ordem de entrada, mais os totais da folha.
+    Registros inválidos voltam como {"linha", "erro"} sem interromper o restante.
+    """
+    competencia = competencia if isinstance(competencia, datetime.date) else parse_competencia(competencia)
+    funcionarios = list(funcionarios)
+    colunas, indices, identificacoes, erros = montar_colunas(funcionarios)
+    folha = calcular_folha_colunar(colunas, competencia)
+
+    # Conversão coluna a coluna (tolist) antes de montar os dicionários: bem mais rápido que item a item
+    valores = {campo: para_reais(folha[campo]).tolist() for campo in COLUNAS_MONETARIAS}
+    dependentes = colunas["dependentes"].tolist()
+
+    resultados = [None] * len(funcionarios)
+    for k, i in enumerate(indices):
+        holerite = {"linha": i + 1, **identificacoes[k], "dependentes": dependentes[k]}
+        for campo in COLUNAS_MONETARIAS:
+            holerite[campo] = valores[campo][k]
+        resultados[i] = holerite
+    for i, mensagem in erros.items():
+        identificacao = funcionarios[i] if isinstance(funcionarios[i], dict) else {}
+        resultados[i] = {"linha": i + 1, **{k: identificacao[k] for k in CAMPOS_IDENTIFICACAO if k in identificacao},
+                         "erro": mensagem}
+
+    totais = {"funcionarios": len(indices), "erros": len(erros)}
+    totais.update({campo: para_reais(int(folha[campo].sum())) for campo in COLUNAS_TOTAIS})
+
+    return {
+        "competencia": competencia.strftime("%Y-%m"),
+        "tabela_irrf_utilizada": "Mai/2025+ (Lei 15.191/2025)" if competencia >= INICIO_TABELA_IRRF_MAI_2025
+                                 else "Jan-Abr/2025 (Lei 14.848/2024)",
+        "resultados": resultados,
+        "totais": totais,
+    }
+
+
+def holerites_para_csv(resultado):
+    """Resultado de calcular_holerites como texto CSV (uma linha por funcionário)."""
+    buffer = io.StringIO()
+    escritor = csv.DictWriter(buffer, fieldnames=COLUNAS_HOLERITE, extrasaction="ignore")
+    escritor.writeheader()
+    escritor.writerows(resultado["resultados"])
+    return buffer.getvalue()
+
+
+# ==============================================================================
+#  EXECUÇÃO VIA LINHA DE COMANDO
+# ==============================================================================
+
+def main():
+    parser = argparse.ArgumentParser(description="Folha de pagamento (holerites) em lote")
+    parser.add_argument("arquivo", help="Arquivo .csv (com cabeçalho) ou .json com a lista de funcionários")
+    parser.add_argument("--competencia", "-c", help="Mês da folha, AAAA-MM (padrão: mês atual)")
+    parser.add_argument("--saida", "-o", help="Arquivo de saída (.csv ou .json; padrão: JSON no stdout)")
+    args = parser.parse_args()
+
+    with open(args.arquivo, encoding="utf-8-sig") as f:
+        if args.arquivo.lower().endswith(".csv"):
+            funcionarios = list(ler_funcionarios_csv(f))
+        else:
+            dados = json.load(f)
+            funcionarios = dados.get("funcionarios") if isinstance(dados, dict) else dados
+
+    resultado = calcular_holerites(funcionarios, args.competencia)
+    if args.saida and args.saida.lower().endswith(".csv"):
+        texto = holerites_para_csv(resultado)
+    else:
+        texto = json.dumps(resultado, ensure_ascii=False, indent=2)
+
+    if args.saida:
+        with open(args.saida, "w", encoding="utf-8", newline="") as f:
+            f.write(texto)
+        print(json.dumps(resultado["totais"], ensure_ascii=False, indent=2), file=sys.stderr)
+    else:
+        print(texto)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,8 +1,18 @@
+import os
+import csv
 import sys
 import json
 import argparse
 import datetime
 from calendar import monthrange
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from itertools import islice
+
+import numpy as np
+
+from centavos import arredondar, para_reais, somar
+from tabela_progressiva import TabelaProgressiva
 
 # ==============================================================================
 #  CONSTANTES ATUALIZADAS 2025
@@ -39,6 +49,12 @@ TABELA_IRRF_MAI_2025 = [
     (float('inf'), 0.275, 908.73)
 ]
 
+# Tabelas pré-compiladas (um bisect + uma multiplicação por cálculo)
+TABELA_INSS_2025 = TabelaProgressiva.por_faixas(FAIXAS_INSS_2025, teto=TETO_INSS_2025)
+TABELA_IRRF_JAN_ABR_2025_COMPILADA = TabelaProgressiva.por_deducao(TABELA_IRRF_JAN_ABR_2025)
+TABELA_IRRF_MAI_2025_COMPILADA = TabelaProgressiva.por_deducao(TABELA_IRRF_MAI_2025)
+INICIO_TABELA_IRRF_MAI_2025 = datetime.date(2025, 5, 1)
+
 # ==============================================================================
 #  FUNÇÕES DE CÁLCULO (Lógica Pura)
 # ==============================================================================
@@ -58,19 +74,7 @@ def calcular_inss_2025(base):
     Calcula INSS com alíquota progressiva (2025).
     Cada faixa aplica sua alíquota apenas sobre a parcela correspondente.
     """
-    base = min(base, TETO_INSS_2025)
-    desconto = 0.0
-    faixa_anterior = 0
-    
-    for limite, aliquota in FAIXAS_INSS_2025:
-        if base > faixa_anterior:
-            base_faixa = min(base, limite) - faixa_anterior
-            desconto += base_faixa * aliquota
-            faixa_anterior = limite
-        else:
-            break
-    
-    return round(desconto, 2)
+    return round(TABELA_INSS_2025.calcular(base), 2)
 
 
 def calcular_irrf_2025(base, dependentes, pensao=0, data_rescisao=None):
@@ -87,53 +91,48 @@ def calcular_irrf_2025(base, dependentes, pensao=0, data_rescisao=None):
     if base_real <= 0:
         return 0.0
     
-    # Determinar qual tabela usar baseado na data da rescisão
-    if data_rescisao and data_rescisao >= datetime.date(2025, 5, 1):
-        tabela = TABELA_IRRF_MAI_2025
-    else:
-        tabela = TABELA_IRRF_JAN_ABR_2025
-    
-    resultado = 0.0
-    for limite, aliquota, deducao in tabela:
-        if base_real <= limite:
-            resultado = (base_real * aliquota) - deducao
-            break
-    
-    return round(max(0.0, resultado), 2)
+    return round(tabela_irrf_vigente(data_rescisao).calcular(base_real), 2)
+
+
+def tabela_irrf_vigente(data_rescisao=None):
+    """Tabela IRRF compilada vigente na data (Mai/2025+ ou Jan-Abr/2025)."""
+    if data_rescisao and data_rescisao >= INICIO_TABELA_IRRF_MAI_2025:
+        return TABELA_IRRF_MAI_2025_COMPILADA
+    return TABELA_IRRF_JAN_ABR_2025_COMPILADA
+
+
+def _diferenca_meses(inicio, fim):
+    """Quantidade de viradas de mês civil entre duas datas."""
+    return (fim.year - inicio.year) * 12 + fim.month - inicio.month
+
+
+def _somar_meses(data, meses, dia):
+    """Soma meses a uma data usando o dia informado, limitado ao último dia do mês."""
+    total = data.year * 12 + data.month - 1 + meses
+    ano, mes = divmod(total, 12)
+    mes += 1
+    return datetime.date(ano, mes, min(dia, monthrange(ano, mes)[1]))
 
 
 def calcular_meses_trabalhados(inicio, fim):
     """
     Calcula meses para 13º Salário (baseado em mês civil: 01 a 30/31).
     Conta 1 mês se trabalhou 15 dias ou mais naquele mês.
+    Os meses intermediários são sempre completos, então só o primeiro e o
+    último mês precisam ser avaliados.
     """
-    meses = 0
-    curr = inicio
-    
-    while curr <= fim:
-        ultimo_dia = monthrange(curr.year, curr.month)[1]
-        
-        # Define início e fim do mês corrente para contagem de dias
-        if curr.month == inicio.month and curr.year == inicio.year:
-            ini_c = curr.day
-        else:
-            ini_c = 1
-            
-        if curr.month == fim.month and curr.year == fim.year:
-            fim_c = fim.day
-        else:
-            fim_c = ultimo_dia
-
-        dias_no_mes = fim_c - ini_c + 1
-        if dias_no_mes >= 15:
-            meses += 1
-
-        # Avança para o próximo mês
-        if curr.month == 12:
-            curr = datetime.date(curr.year + 1, 1, 1)
-        else:
-            curr = datetime.date(curr.year, curr.month + 1, 1)
-    
+    if inicio > fim:
+        return 0
+
+    diferenca = _diferenca_meses(inicio, fim)
+    if diferenca == 0:
+        return 1 if fim.day - inicio.day + 1 >= 15 else 0
+
+    meses = diferenca - 1
+    if monthrange(inicio.year, inicio.month)[1] - inicio.day + 1 >= 15:
+        meses += 1
+    if fim.day >= 15:
+        meses += 1
     return meses
 
 
@@ -143,36 +142,71 @@ def calcular_avos_ferias(inicio_aquisitivo, fim_projetado):
     Cada período de 30 dias a partir da admissão conta como 1 avo.
     Fração de 15 dias ou mais conta como 1 avo adicional.
     Máximo: 12 avos.
+    O k-ésimo "mesversário" é a admissão + k meses (dia limitado ao fim do mês);
+    o período k fecha um dia antes dele, então contam os mesversários até fim + 1 dia.
     """
-    avos = 0
-    curr = inicio_aquisitivo
+    limite = fim_projetado + datetime.timedelta(days=1)
+    dia = inicio_aquisitivo.day
 
-    while True:
-        # Calcula a data do próximo "mesversário"
-        year = curr.year + ((curr.month + 1) // 13)
-        month = (curr.month % 12) + 1
+    avos = _diferenca_meses(inicio_aquisitivo, limite)
+    if avos > 0 and _somar_meses(inicio_aquisitivo, avos, dia) > limite:
+        avos -= 1
+    avos = max(avos, 0)
 
-        # Tratamento para dias inexistentes (ex: 31 de fev vira 28/29)
-        try:
-            next_date = datetime.date(year, month, inicio_aquisitivo.day)
-        except ValueError:
-            last_day = monthrange(year, month)[1]
-            next_date = datetime.date(year, month, last_day)
+    # Fração final: Se trabalhou >= 15 dias neste ciclo incompleto
+    ultimo_mesversario = _somar_meses(inicio_aquisitivo, avos, dia)
+    if (fim_projetado - ultimo_mesversario).days + 1 >= 15:
+        avos += 1
 
-        # O período fecha um dia antes do próximo aniversário
-        periodo_fim = next_date - datetime.timedelta(days=1)
+    return min(avos, 12)
 
-        if periodo_fim <= fim_projetado:
-            avos += 1
-            curr = next_date
-        else:
-            # Fração final: Se trabalhou >= 15 dias neste ciclo incompleto
-            dias_fracao = (fim_projetado - curr).days + 1
-            if dias_fracao >= 15:
-                avos += 1
-            break
 
-    return min(avos, 12)
+def _decompor_datas(datas):
+    """Separa um array datetime64[D] em (mês absoluto, dia, último dia do mês)."""
+    meses = datas.astype("datetime64[M]")
+    inicio_mes = meses.astype("datetime64[D]")
+    dia = (datas - inicio_mes).astype(np.int64) + 1
+    ultimo_dia = ((meses + 1).astype("datetime64[D]") - inicio_mes).astype(np.int64)
+    return meses.astype(np.int64), dia, ultimo_dia
+
+
+def _somar_meses_array(meses_absolutos, meses, dia):
+    alvo = (meses_absolutos + meses).astype("datetime64[M]")
+    inicio_mes = alvo.astype("datetime64[D]")
+    ultimo_dia = ((alvo + 1).astype("datetime64[D]") - inicio_mes).astype(np.int64)
+    return inicio_mes + (np.minimum(dia, ultimo_dia) - 1)
+
+
+def calcular_meses_trabalhados_array(inicios, fins):
+    """Versão vetorizada de calcular_meses_trabalhados (arrays de datas, datetime64[D])."""
+    inicios = np.asarray(inicios, dtype="datetime64[D]")
+    fins = np.asarray(fins, dtype="datetime64[D]")
+    mes_ini, dia_ini, ultimo_dia_ini = _decompor_datas(inicios)
+    mes_fim, dia_fim, _ = _decompor_datas(fins)
+
+    diferenca = mes_fim - mes_ini
+    mesmo_mes = (dia_fim - dia_ini + 1 >= 15).astype(np.int64)
+    meses_distintos = diferenca - 1 + (ultimo_dia_ini - dia_ini + 1 >= 15) + (dia_fim >= 15)
+
+    meses = np.where(diferenca == 0, mesmo_mes, meses_distintos)
+    return np.where(inicios > fins, 0, meses)
+
+
+def calcular_avos_ferias_array(inicios_aquisitivos, fins_projetados):
+    """Versão vetorizada de calcular_avos_ferias (arrays de datas, datetime64[D])."""
+    inicios = np.asarray(inicios_aquisitivos, dtype="datetime64[D]")
+    fins = np.asarray(fins_projetados, dtype="datetime64[D]")
+    limites = fins + np.timedelta64(1, "D")
+    mes_ini, dia_ini, _ = _decompor_datas(inicios)
+    mes_limite, _, _ = _decompor_datas(limites)
+
+    avos = mes_limite - mes_ini
+    passou = (avos > 0) & (_somar_meses_array(mes_ini, avos, dia_ini) > limites)
+    avos = np.maximum(np.where(passou, avos - 1, avos), 0)
+
+    ultimo_mesversario = _somar_meses_array(mes_ini, avos, dia_ini)
+    fracao = (fins - ultimo_mesversario).astype(np.int64) + 1 >= 15
+    return np.minimum(avos + fracao, 12)
 
 
 def gerar_resumo_texto(tipo):
@@ -460,10 +494,12 @@ def processar_rescisao(data_json):
     if adiantamento > 0:
         desc["Adiantamento/Vale"] = round(adiantamento, 2)
 
-    # 6. TOTAIS
-    total_proventos = sum(prov.values())
-    total_descontos = sum(desc.values())
-    total_liquido = total_proventos - total_descontos
+    # 6. TOTAIS (em centavos: o líquido é exatamente proventos - descontos exibidos)
+    proventos_centavos = somar(prov.values())
+    descontos_centavos = somar(desc.values())
+    total_proventos = para_reais(proventos_centavos)
+    total_descontos = para_reais(descontos_centavos)
+    total_liquido = para_reais(proventos_centavos - descontos_centavos)
 
     # 7. RESULTADO
     resultado = {
@@ -498,6 +534,149 @@ def processar_rescisao(data_json):
     return resultado
 
 
+# ==============================================================================
+#  PROCESSAMENTO EM LOTE (DEMISSÕES EM MASSA)
+# ==============================================================================
+
+CAMPOS_BOOLEANOS = ("aviso_indenizado", "aviso_cumprido")
+CAMPOS_IDENTIFICACAO = ("matricula", "nome")
+LIMIAR_PARALELO = 1000  # abaixo disso o lote roda no próprio processo
+TAMANHO_BLOCO_LOTE = 250
+
+
+def normalizar_linha_csv(linha):
+    """
+    Converte uma linha de CSV (tudo texto) para o formato aceito por processar_rescisao:
+    campos vazios são descartados (valem os padrões) e as flags viram booleanos.
+    """
+    dados = {}
+    for chave, valor in linha.items():
+        if chave is None or valor is None:
+            continue
+        chave = chave.strip()
+        valor = valor.strip()
+        if valor == "":
+            continue
+        if chave in CAMPOS_BOOLEANOS:
+            dados[chave] = valor.lower() in ("1", "true", "sim", "s", "yes", "y")
+        else:
+            dados[chave] = valor
+    return dados
+
+
+def ler_funcionarios_csv(arquivo_texto):
+    """Gera os funcionários de um CSV com cabeçalho (aceita ',' ou ';' como separador)."""
+    cabecalho = arquivo_texto.readline()
+    delimitador = ";" if cabecalho.count(";") > cabecalho.count(",") else ","
+    campos = next(csv.reader([cabecalho], delimiter=delimitador))
+    for linha in csv.DictReader(arquivo_texto, fieldnames=campos, delimiter=delimitador):
+        yield normalizar_linha_csv(linha)
+
+
+def processar_rescisao_linha(data_json):
+    """
+    processar_rescisao que devolve {"erro": ...} em vez de interromper o lote.
+    Aceita também a linha NDJSON crua (str), decodificada aqui (no worker).
+    """
+    if isinstance(data_json, str):
+        try:
+            data_json = json.loads(data_json)
+        except ValueError as e:
+            return {"erro": f"JSON inválido: {e}"}
+    identificacao = {}
+    if isinstance(data_json, dict):
+        identificacao = {k: data_json[k] for k in CAMPOS_IDENTIFICACAO if k in data_json}
+    try:
+        if not isinstance(data_json, dict):
+            raise ValueError("Registro deve ser um objeto JSON.")
+        return {**identificacao, **processar_rescisao(data_json)}
+    except Exception as e:
+        return {**identificacao, "erro": str(e)}
+
+
+def _processar_bloco_rescisoes(bloco):
+    return [processar_rescisao_linha(f) for f in bloco]
+
+
+def iterar_rescisoes(funcionarios, workers=1, tamanho_bloco=TAMANHO_BLOCO_LOTE):
+    """
+    Gera o resultado de cada funcionário, na ordem de entrada, à medida que fica pronto.
+    Com workers > 1 os blocos são distribuídos num ProcessPoolExecutor, com no
+    máximo 2 blocos por worker em andamento (memória limitada para listas longas).
+    """
+    iterador = iter(funcionarios)
+    blocos = iter(lambda: list(islice(iterador, tamanho_bloco)), [])
+
+    if workers <= 1:
+        for bloco in blocos:
+            yield from _processar_bloco_rescisoes(bloco)
+        return
+
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        pendentes = deque()
+        for bloco in blocos:
+            pendentes.append(executor.submit(_processar_bloco_rescisoes, bloco))
+            if len(pendentes) >= workers * 2:
+                yield from pendentes.popleft().result()
+        while pendentes:
+            yield from pendentes.popleft().result()
+
+
+TOTAIS_MONETARIOS = ("total_proventos", "total_descontos", "total_liquido", "multas_fgts", "irrf_retido", "inss_retido")
+
+
+def novo_totalizador():
+    """Totais do lote; os valores monetários são acumulados em centavos (int), sem erro de float."""
+    totais = {"funcionarios": 0, "erros": 0}
+    totais.update({chave: 0 for chave in TOTAIS_MONETARIOS})
+    return totais
+
+
+def acumular_totais(totais, resultado):
+    """Soma um resultado individual nos totais agregados do lote."""
+    totais["funcionarios"] += 1
+    if "erro" in resultado:
+        totais["erros"] += 1
+        return totais
+
+    totais["total_proventos"] += arredondar(resultado["totais"]["total_proventos"])
+    totais["total_descontos"] += arredondar(resultado["totais"]["total_descontos"])
+    totais["total_liquido"] += arredondar(resultado["totais"]["total_liquido"])
+    totais["irrf_retido"] += arredondar(resultado["descontos"].get("IRRF", 0.0))
+    totais["inss_retido"] += arredondar(resultado["descontos"].get("INSS", 0.0))
+    for chave, valor in resultado["fgts"].items():
+        if chave.startswith("Multa") and isinstance(valor, (int, float)):
+            totais["multas_fgts"] += arredondar(valor)
+    return totais
+
+
+def arredondar_totais(totais):
+    """Totais prontos para exibição: centavos de volta para reais."""
+    return {k: para_reais(v) if k in TOTAIS_MONETARIOS else v for k, v in totais.items()}
+
+
+def workers_para_lote(quantidade, workers=None):
+    """Quantidade de processos: a informada, ou automática pelo tamanho do lote."""
+    if workers:
+        return max(1, int(workers))
+    return (os.cpu_count() or 1) if quantidade >= LIMIAR_PARALELO else 1
+
+
+def processar_rescisao_lote(funcionarios, workers=None):
+    """
+    Processa a rescisão de uma lista de funcionários (mesmo JSON de processar_rescisao).
+    Linhas com erro são devolvidas como {"erro": ...} sem interromper o lote.
+    Retorna {"resultados": [...], "totais": {...}}.
+    """
+    funcionarios = list(funcionarios)
+    totais = novo_totalizador()
+    resultados = []
+    for resultado in iterar_rescisoes(funcionarios, workers_para_lote(len(funcionarios), workers)):
+        acumular_totais(totais, resultado)
+        resultados.append(resultado)
+    return {"resultados": resultados, "totais": arredondar_totais(totais)}
+
+
 # ==============================================================================
 #  EXECUÇÃO VIA LINHA DE COMANDO
 # ==============================================================================
@@ -0,0 +1,105 @@
+# centavos.py
+# Aritmética de dinheiro em centavos inteiros (int64)
+#
+# Os cálculos continuam em float (alíquotas, frações), mas todo valor que sai
+# para o usuário passa por aqui e vira um inteiro de centavos. Somas e rateios
+# são feitos nos inteiros, então totais e partes sempre conferem.
+#
+# Regra de arredondamento: meio centavo arredonda para longe do zero
+# (0,125 -> 0,13; -0,125 -> -0,13), aplicada ao valor decimal que o float
+# representa. Antes do arredondamento o valor em centavos é limpo do ruído
+# binário (1,005 vira 100,5 centavos, e não 100,4999...), o que o round() do
+# Python não faz.
+#
+# Rateio: método dos maiores restos. Cada parte recebe o piso da sua cota
+# proporcional e os centavos que sobram vão, um a um, para as maiores frações
+# (empate: a parte que vem primeiro). A soma das partes é exatamente o total.
+
+import math
+
+import numpy as np
+
+CASAS_RUIDO = 6  # casas (em centavos) usadas para limpar o ruído binário antes de arredondar
+CASAS_EMPATE = 9  # frações de rateio iguais até aqui contam como empate
+
+# Longe do meio centavo (e das frações vizinhas no rateio) a limpeza do ruído
+# não muda o resultado; o round(), que é o passo caro, só roda perto dos empates
+MARGEM_RUIDO = 1e-5  # em centavos; o round() a CASAS_RUIDO casas move o valor no máximo 5e-7
+MARGEM_EMPATE = 1e-8  # frações de rateio mais próximas que isso são reordenadas com round()
+
+
+def arredondar(valor):
+    """Valor em reais (float) -> centavos (int). Aceita também arrays NumPy (-> int64)."""
+    if isinstance(valor, np.ndarray):
+        if not np.isfinite(valor).all():
+            # O cast para int64 transformaria NaN/inf em INT64_MIN sem aviso
+            raise ValueError("Valores em reais devem ser números finitos.")
+        centavos = np.floor(np.round(np.abs(valor) * 100, CASAS_RUIDO) + 0.5)
+        return (np.sign(valor) * centavos).astype(np.int64)
+    centavos = abs(valor) * 100
+    inteiro = math.floor(centavos + 0.5)
+    if not MARGEM_RUIDO < centavos + 0.5 - inteiro < 1 - MARGEM_RUIDO:
+        inteiro = math.floor(round(centavos, CASAS_RUIDO) + 0.5)
+    return -inteiro if valor < 0 else inteiro
+
+
+def para_reais(centavos):
+    """Centavos (int ou array int64) -> reais (float ou array float)."""
+    return centavos / 100
+
+
+def arredondar_reais(valor):
+    """Atalho para para_reais(arredondar(valor)): o valor em reais já na regra de arredondamento."""
+    return para_reais(arredondar(valor))
+
+
+def ratear(total, pesos):
+    """
+    Divide total (centavos, int) proporcionalmente aos pesos (lista de números
+    não negativos). Retorna a lista de partes em centavos, somando exatamente total.
+    Sem pesos positivos, todas as partes são zero.
+    """
+    soma_pesos = sum(pesos)
+    if not total or soma_pesos <= 0:
+        return [0] * len(pesos)
+    cotas = [total * p / soma_pesos for p in pesos]
+    partes = [math.floor(c) for c in cotas]
+    sobra = total - sum(partes)
+    if sobra:
+        restos = [c - p for c, p in zip(cotas, partes)]
+        ordem = sorted(range(len(pesos)), key=restos.__getitem__, reverse=True)  # estável: empate fica com a primeira
+        if sobra < len(ordem) and restos[ordem[sobra - 1]] - restos[ordem[sobra]] < MARGEM_EMPATE:
+            # Frações quase iguais no corte: decide pela regra de empate (CASAS_EMPATE casas)
+            ordem = sorted(range(len(pesos)), key=lambda j: round(partes[j] - cotas[j], CASAS_EMPATE))
+        for j in ordem[:sobra]:
+            partes[j] += 1
+    return partes
+
+
+def ratear_array(totais, pesos):
+    """
+    Versão vetorizada de ratear: totais é um array (n,) de centavos e pesos uma
+    matriz (n, k). Cada linha é rateada de forma independente; retorna (n, k) int64.
+    """
+    totais = np.asarray(totais, dtype=np.int64)
+    pesos = np.asarray(pesos, dtype=float)
+    if pesos.ndim == 1:
+        return ratear_array(totais.reshape(1), pesos[None, :])[0]
+
+    soma_pesos = np.cumsum(pesos, axis=1)[:, -1]  # soma sequencial, como em ratear
+    validos = (soma_pesos > 0) & (totais != 0)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        cotas = np.where(validos[:, None], totais[:, None] * pesos / soma_pesos[:, None], 0.0)
+    partes = np.floor(cotas).astype(np.int64)
+    sobra = np.where(validos, totais - partes.sum(axis=1), 0)
+
+    # Posição de cada coluna na ordem decrescente de fração (estável: empate fica com a primeira)
+    ordem = np.argsort(np.round(partes - cotas, CASAS_EMPATE), axis=1, kind="stable")
+    posicao = np.empty_like(ordem)
+    np.put_along_axis(posicao, ordem, np.arange(pesos.shape[1])[None, :].repeat(len(pesos), axis=0), axis=1)
+    return partes + (posicao < sobra[:, None])
+
+
+def somar(valores):
+    """Soma valores em reais já arredondados, em centavos (int), sem acúmulo de erro do float."""
+    return sum(arredondar(v) for v in valores)
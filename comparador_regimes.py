@@ -0,0 +1,143 @@
+# comparador_regimes.py
+# Simples Nacional x Lucro Presumido para uma grade de cenários de receita
+#
+# Para um perfil de empresa (anexo, exportação, ISS, folha), avalia os dois
+# regimes em todos os pontos da grade de RBT12 numa única passada vetorizada.
+# Cada cenário supõe receita mensal constante (RBT12 / 12). Dentro de uma faixa
+# do Simples o DAS do mês é (RBT12 x nominal - dedução) / 12, e o Lucro
+# Presumido também é linear por partes, então a interpolação linear entre dois
+# pontos da grade dá o ponto de equilíbrio exato quando não há troca de faixa
+# no intervalo (e uma ótima aproximação quando há).
+
+import numpy as np
+
+from calculo_das import DADOS_DOS_ANEXOS, LIMITES_DAS_FAIXAS, calcular_das_vetorizado
+from calcular_darf_pro_labore import PERCENTUAL_FATOR_R
+# As alíquotas são lidas pelo módulo na hora do cálculo: uma alteração em
+# simulador_lp vale para calcula_imposto e para o comparador ao mesmo tempo
+import simulador_lp
+
+PONTOS_PADRAO = 1000
+PONTOS_MAXIMO = 10000
+RBT12_MAXIMA = float(LIMITES_DAS_FAIXAS[-1])
+ALIQUOTA_CPP_PADRAO = 20.0
+# Anexos em que a CPP não está incluída no DAS e é recolhida à parte sobre a folha
+ANEXOS_CPP_FORA_DO_DAS = [4]
+
+
+def lucro_presumido_mensal_array(faturamento, exportacao, aliquota_iss_percentual, presuncao=None):
+    """
+    Tributos mensais do Lucro Presumido (PIS, COFINS, ISS, CSLL, IRPJ e adicional)
+    para um array de faturamentos, com as mesmas regras de calcula_imposto.
+    Sem presuncao, usa a de simulador_lp.
+    """
+    lp = simulador_lp
+    presuncao = lp.PRESUNCAO_IRPJ_CSLL if presuncao is None else presuncao
+    faturamento = np.asarray(faturamento, dtype=float)
+    if exportacao:
+        pis_cofins_iss = np.zeros_like(faturamento)
+    else:
+        pis_cofins_iss = faturamento * lp.ALIQUOTA_PIS + faturamento * lp.ALIQUOTA_COFINS \
+            + faturamento * (aliquota_iss_percentual / 100)
+
+    base_irpj_csll = faturamento * presuncao
+    csll = base_irpj_csll * lp.ALIQUOTA_CSLL
+    irpj = base_irpj_csll * lp.ALIQUOTA_IRPJ
+    irpj_adicional = np.maximum(base_irpj_csll - lp.DEDUCAO_IRPJ_ADICIONAL, 0.0) * lp.ALIQUOTA_IRPJ_ADICIONAL
+    return pis_cofins_iss + csll + irpj + irpj_adicional
+
+
+def pontos_de_equilibrio(x, diferenca):
+    """
+    Valores de x em que a diferença entre os regimes troca de sinal, por
+    interpolação linear entre pontos vizinhos da grade. Pontos com diferença
+    indefinida (NaN) são ignorados.
+    """
+    x = np.asarray(x, dtype=float)
+    diferenca = np.asarray(diferenca, dtype=float)
+    validos = ~np.isnan(diferenca[:-1]) & ~np.isnan(diferenca[1:])
+    d0, d1 = diferenca[:-1], diferenca[1:]
+    troca = validos & (np.sign(d0) != np.sign(d1)) & (d0 != 0)
+
+    i = np.flatnonzero(troca)
+    x0, x1 = x[i], x[i + 1]
+    return x0 + (x1 - x0) * d0[i] / (d0[i] - d1[i])
+
+
+def _nan_para_none(valores, casas):
+    return [None if np.isnan(v) else round(v, casas) for v in valores.tolist()]
+
+
+def comparar_regimes(dados_json: dict):
+    """
+    Recebe dicionário com:
+      - anexo: int 1..5 (anexo do Simples Nacional)
+      - exportacao_servico: 0 ou 1 (opcional)
+      - aliquota_iss_percentual: ISS no Lucro Presumido, de 2 a 5 (opcional, padrão 0)
+      - presuncao_percentual: presunção do IRPJ/CSLL no Lucro Presumido (opcional, padrão 32)
+      - folha_mensal: folha de salários e pró-labore do mês (opcional) — entra na CPP
+        do Lucro Presumido e do Anexo IV e no Fator-R do Anexo V
+      - aliquota_cpp_percentual: CPP sobre a folha (opcional, padrão 20)
+      - rbt12_minima / rbt12_maxima: limites da grade (opcional, padrão 0 a 4.800.000)
+      - pontos: quantidade de cenários (opcional, padrão 1000, no máximo 10000)
+    Retorna a carga tributária mensal de cada regime por cenário (em colunas),
+    o regime mais barato em cada ponto e os pontos de equilíbrio de RBT12.
+    """
+    try:
+        anexo = int(dados_json.get("anexo", 0))
+        is_exportacao = bool(int(dados_json.get("exportacao_servico", 0)))
+        aliquota_iss = float(dados_json.get("aliquota_iss_percentual", 0))
+        presuncao = float(dados_json.get("presuncao_percentual", simulador_lp.PRESUNCAO_IRPJ_CSLL * 100)) / 100
+        folha_mensal = float(dados_json.get("folha_mensal", 0))
+        aliquota_cpp = float(dados_json.get("aliquota_cpp_percentual", ALIQUOTA_CPP_PADRAO)) / 100
+        rbt12_minima = float(dados_json.get("rbt12_minima", 0))
+        rbt12_maxima = float(dados_json.get("rbt12_maxima", RBT12_MAXIMA))
+        pontos = int(dados_json.get("pontos", PONTOS_PADRAO))
+    except (ValueError, TypeError) as e:
+        raise ValueError(f"Erro nos dados de entrada: {e}")
+
+    if anexo not in DADOS_DOS_ANEXOS:
+        raise ValueError("Anexo inválido. Deve ser 1,2,3,4 ou 5.")
+    if not 2 <= pontos <= PONTOS_MAXIMO:
+        raise ValueError(f"Campo 'pontos' deve estar entre 2 e {PONTOS_MAXIMO}.")
+    if not 0 <= rbt12_minima < rbt12_maxima:
+        raise ValueError("A grade de RBT12 deve ter 0 <= rbt12_minima < rbt12_maxima.")
+
+    rbt12 = np.linspace(rbt12_minima, rbt12_maxima, pontos)
+    faturamento = rbt12 / 12
+    cpp = folha_mensal * aliquota_cpp
+
+    # Simples Nacional: Anexo V migra para o III quando o Fator-R atinge 28%
+    anexos = np.full(pontos, anexo)
+    if anexo == 5 and folha_mensal > 0:
+        with np.errstate(divide="ignore", invalid="ignore"):
+            fator_r = folha_mensal * 12 / rbt12
+        anexos = np.where(fator_r >= PERCENTUAL_FATOR_R, 3, 5)
+
+    das = calcular_das_vetorizado(anexos, rbt12, faturamento, np.full(pontos, is_exportacao))
+    simples = das["valor_das"] + np.where(np.isin(anexos, ANEXOS_CPP_FORA_DO_DAS), cpp, 0.0)
+    simples = np.where(das["fora_limite"], np.nan, simples)
+
+    lucro_presumido = lucro_presumido_mensal_array(faturamento, is_exportacao, aliquota_iss, presuncao) + cpp
+
+    diferenca = simples - lucro_presumido
+    with np.errstate(divide="ignore", invalid="ignore"):
+        carga_simples = np.where(faturamento > 0, simples / faturamento * 100, np.nan)
+        carga_lp = np.where(faturamento > 0, lucro_presumido / faturamento * 100, np.nan)
+
+    melhor = np.where(np.isnan(diferenca) | (diferenca > 0), "lucro_presumido", "simples_nacional")
+
+    return {
+        "anexo": anexo,
+        "cenarios": {
+            "rbt12": rbt12.round(2).tolist(),
+            "faturamento_mensal": faturamento.round(2).tolist(),
+            "anexo_simples": anexos.tolist(),
+            "simples_nacional_mensal": _nan_para_none(simples, 2),
+            "lucro_presumido_mensal": lucro_presumido.round(2).tolist(),
+            "carga_simples_percent": _nan_para_none(carga_simples, 4),
+            "carga_lucro_presumido_percent": _nan_para_none(carga_lp, 4),
+            "melhor_regime": melhor.tolist(),
+        },
+        "pontos_de_equilibrio_rbt12": pontos_de_equilibrio(rbt12, diferenca).round(2).tolist(),
+    }
@@ -0,0 +1,162 @@
+# estaticos.py
+# Páginas pré-renderizadas e arquivos estáticos com cache de longo prazo
+#
+# As páginas dos simuladores não têm dados por requisição: são renderizadas
+# uma vez na subida do app e servidas da memória com ETag / Last-Modified
+# (o navegador revalida e recebe 304 se nada mudou).
+#
+# Os arquivos de static/ são lidos na subida, ganham uma versão (hash do
+# conteúdo) que url_for('static', ...) acrescenta como ?v=<hash>, e com a
+# versão certa são servidos com Cache-Control de um ano, "immutable". As
+# referências url(...) dos CSS para outros arquivos de static/ (as fontes)
+# também recebem a versão. Arquivos de texto e fontes têm a variante gzip
+# pré-comprimida, entregue quando o navegador aceita.
+#
+# Desligue com CALCULA_PRE_RENDERIZAR=0 (ex.: ao editar templates em modo debug).
+
+import os
+import re
+import gzip
+import time
+import hashlib
+import posixpath
+import mimetypes
+from typing import NamedTuple, Optional
+
+from flask import Response, render_template, request, send_from_directory
+
+HABILITADO = os.environ.get("CALCULA_PRE_RENDERIZAR", "1").lower() in ("1", "true", "sim")
+
+PAGINAS_PRE_RENDERIZADAS = (
+    "index.html",
+    "simulador_das.html",
+    "simulador_lp.html",
+    "simulador_rescisao.html",
+    "simulador_nfse.html",
+    "simulador_holerite.html",
+)
+
+CACHE_IMUTAVEL = "public, max-age=31536000, immutable"
+CACHE_REVALIDAR = "no-cache"
+EXTENSOES_COMPRIMIVEIS = (".css", ".js", ".html", ".svg", ".json", ".txt", ".ttf", ".otf")
+_URL_CSS = re.compile(r"""url\((['"]?)([^'")]+)\1\)""")
+
+
+class Ativo(NamedTuple):
+    conteudo: bytes
+    gzip: Optional[bytes]
+    versao: str
+    mimetype: str
+    modificado_em: float
+
+
+ATIVOS = {}   # caminho relativo em static/ -> Ativo
+PAGINAS = {}  # nome do template -> Ativo
+
+
+def _criar_ativo(conteudo, nome, modificado_em, mimetype=None):
+    versao = hashlib.sha256(conteudo).hexdigest()[:12]
+    comprimido = None
+    if nome.endswith(EXTENSOES_COMPRIMIVEIS) and conteudo:
+        comprimido = gzip.compress(conteudo, compresslevel=9, mtime=0)
+        if len(comprimido) >= len(conteudo):
+            comprimido = None
+    mimetype = mimetype or mimetypes.guess_type(nome)[0] or "application/octet-stream"
+    return Ativo(conteudo, comprimido, versao, mimetype, modificado_em)
+
+
+def _versionar_urls_css(texto, caminho_css, url_estatica):
+    """Acrescenta ?v=<hash> às url(...) do CSS que apontam para arquivos de static/."""
+    pasta = posixpath.dirname(caminho_css)
+
+    def trocar(m):
+        aspas, url = m.groups()
+        if "?" in url or "#" in url or ":" in url.split("/")[0]:
+            return m.group(0)
+        if url.startswith(url_estatica + "/"):
+            alvo = url[len(url_estatica) + 1:]
+        elif url.startswith("/"):
+            return m.group(0)
+        else:
+            alvo = posixpath.normpath(posixpath.join(pasta, url))
+        ativo = ATIVOS.get(alvo)
+        if ativo is None:
+            return m.group(0)
+        return f"url({aspas}{url}?v={ativo.versao}{aspas})"
+
+    return _URL_CSS.sub(trocar, texto)
+
+
+def carregar_ativos(pasta_estatica, url_estatica="/static"):
+    """Lê todos os arquivos de static/ para a memória (os CSS por último, pois referenciam os demais)."""
+    ATIVOS.clear()
+    arquivos = []
+    for raiz, _, nomes in os.walk(pasta_estatica):
+        for nome in nomes:
+            caminho = os.path.join(raiz, nome)
+            arquivos.append((os.path.relpath(caminho, pasta_estatica).replace(os.sep, "/"), caminho))
+
+    arquivos.sort(key=lambda item: (item[0].endswith(".css"), item[0]))
+    for relativo, caminho in arquivos:
+        with open(caminho, "rb") as f:
+            conteudo = f.read()
+        if relativo.endswith(".css"):
+            conteudo = _versionar_urls_css(conteudo.decode("utf-8"), relativo, url_estatica).encode("utf-8")
+        ATIVOS[relativo] = _criar_ativo(conteudo, relativo, os.path.getmtime(caminho))
+
+
+def pre_renderizar_paginas(app):
+    PAGINAS.clear()
+    agora = time.time()
+    with app.test_request_context("/"):
+        for template in PAGINAS_PRE_RENDERIZADAS:
+            html = render_template(template).encode("utf-8")
+            PAGINAS[template] = _criar_ativo(html, template, agora, "text/html")
+
+
+def _responder(ativo, cache_control):
+    """Resposta com gzip quando aceito, ETag / Last-Modified e 304 condicional."""
+    usar_gzip = ativo.gzip is not None and "gzip" in request.accept_encodings
+    resposta = Response(ativo.gzip if usar_gzip else ativo.conteudo, mimetype=ativo.mimetype)
+    if ativo.gzip is not None:
+        resposta.vary.add("Accept-Encoding")
+    if usar_gzip:
+        resposta.headers["Content-Encoding"] = "gzip"
+    resposta.set_etag(ativo.versao + ("-gz" if usar_gzip else ""))
+    resposta.last_modified = ativo.modificado_em
+    resposta.headers["Cache-Control"] = cache_control
+    return resposta.make_conditional(request)
+
+
+def pagina(template):
+    """Página pré-renderizada (ou renderizada na hora, com o modo desligado)."""
+    ativo = PAGINAS.get(template)
+    if ativo is None:
+        return render_template(template)
+    return _responder(ativo, CACHE_REVALIDAR)
+
+
+def configurar_estaticos(app):
+    """Pré-renderiza as páginas e troca o handler de static/ (chamar depois de registrar as rotas)."""
+    if not HABILITADO or not app.static_folder:
+        return app
+
+    carregar_ativos(app.static_folder, app.static_url_path)
+
+    @app.url_defaults
+    def _versao_estatica(endpoint, values):
+        if endpoint == "static" and "v" not in values:
+            ativo = ATIVOS.get(values.get("filename"))
+            if ativo is not None:
+                values["v"] = ativo.versao
+
+    def servir_estatico(filename):
+        ativo = ATIVOS.get(filename)
+        if ativo is None:
+            return send_from_directory(app.static_folder, filename)
+        versionado = request.args.get("v") == ativo.versao
+        return _responder(ativo, CACHE_IMUTAVEL if versionado else CACHE_REVALIDAR)
+
+    app.view_functions["static"] = servir_estatico
+    pre_renderizar_paginas(app)
+    return app
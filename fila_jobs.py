@@ -0,0 +1,424 @@
+# fila_jobs.py
+# Fila de jobs em segundo plano para lotes longos (DAS e rescisão), em SQLite
+#
+# Um lote grande demais para o timeout da requisição é enviado como job:
+# os registros são gravados no SQLite e a resposta volta na hora com o id.
+# Em cada processo do app um despachante (thread) pega o próximo job
+# pendente e o calcula em blocos, com os mesmos motores dos lotes síncronos
+# (e os mesmos pools de processos). Cada bloco de resultados é gravado numa
+# transação junto com o progresso, então um job interrompido (processo
+# reiniciado, worker morto) é retomado do último bloco gravado por qualquer
+# processo do app. Não há broker externo: tudo roda numa máquina só.
+#
+# Importar o módulo (ou o app) não abre o banco nem inicia threads: o
+# despachante sobe no primeiro job criado ou na primeira requisição a /jobs
+# do processo (quando também retoma os jobs interrompidos).
+#
+# Configuração:
+#   CALCULA_JOBS=0                  desliga o despachante neste processo (as rotas continuam)
+#   CALCULA_JOBS_DB                 arquivo SQLite (padrão: jobs.sqlite3 na pasta instance/ do app)
+#   CALCULA_JOBS_WORKERS            processos de cálculo por job (padrão: núcleos da máquina)
+#   CALCULA_JOBS_EXPIRACAO          segundos sem progresso para outro processo retomar o job (padrão 300)
+#   CALCULA_JOBS_RETENCAO_HORAS     jobs encerrados são apagados depois disso (padrão 72)
+
+import os
+import json
+import time
+import uuid
+import sqlite3
+import datetime
+import threading
+from itertools import islice
+from typing import Callable, NamedTuple
+
+from metricas import processo_vivo
+
+HABILITADO = os.environ.get("CALCULA_JOBS", "1").lower() in ("1", "true", "sim")
+# Mesma pasta que o Flask usa como instance_path do app.py; iniciar_fila ajusta para a do app
+CAMINHO_DB = os.environ.get("CALCULA_JOBS_DB") or os.path.join(
+    os.path.dirname(os.path.abspath(__file__)), "instance", "jobs.sqlite3")
+WORKERS = int(os.environ.get("CALCULA_JOBS_WORKERS", 0)) or os.cpu_count() or 1
+EXPIRACAO = float(os.environ.get("CALCULA_JOBS_EXPIRACAO", 300))
+RETENCAO_HORAS = float(os.environ.get("CALCULA_JOBS_RETENCAO_HORAS", 72))
+
+INTERVALO_BUSCA = 1.0  # segundos entre buscas por jobs quando a fila está vazia
+TAMANHO_BLOCO_JOB = 500  # registros por bloco gravado (granularidade do progresso e da retomada)
+TAMANHO_PAGINA = 2000  # linhas lidas do SQLite por consulta
+
+RECEBENDO, PENDENTE, EXECUTANDO = "recebendo", "pendente", "executando"
+CONCLUIDO, FALHOU, CANCELADO = "concluido", "erro", "cancelado"
+ENCERRADOS = (CONCLUIDO, FALHOU, CANCELADO)
+
+ESQUEMA = """
+CREATE TABLE IF NOT EXISTS jobs (
+    id TEXT PRIMARY KEY,
+    tipo TEXT NOT NULL,
+    status TEXT NOT NULL,
+    total INTEGER NOT NULL DEFAULT 0,
+    processados INTEGER NOT NULL DEFAULT 0,
+    erros INTEGER NOT NULL DEFAULT 0,
+    resumo TEXT,
+    mensagem TEXT,
+    criado_em REAL NOT NULL,
+    iniciado_em REAL,
+    concluido_em REAL,
+    dono_pid INTEGER,
+    heartbeat REAL
+);
+CREATE INDEX IF NOT EXISTS jobs_status ON jobs (status, criado_em);
+CREATE TABLE IF NOT EXISTS entradas (
+    job_id TEXT NOT NULL,
+    linha INTEGER NOT NULL,
+    dados TEXT NOT NULL,
+    PRIMARY KEY (job_id, linha)
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS resultados (
+    job_id TEXT NOT NULL,
+    linha INTEGER NOT NULL,
+    resultado TEXT NOT NULL,
+    PRIMARY KEY (job_id, linha)
+) WITHOUT ROWID;
+"""
+
+
+# ------------------------------------------------------------------------------
+#  PROCESSADORES (UM POR TIPO DE JOB)
+# ------------------------------------------------------------------------------
+
+class Processador(NamedTuple):
+    # blocos(entradas, primeira_linha, workers, resumo) gera (linhas JSON, erros) por bloco
+    # e acumula o que precisar em resumo (dict gravado junto com o progresso)
+    blocos: Callable
+    exibir_resumo: Callable
+
+
+def _blocos_das(entradas, primeira_linha, workers, resumo):
+    from calculo_das import agrupar_em_blocos, processar_em_paralelo
+
+    blocos = agrupar_em_blocos(entradas, TAMANHO_BLOCO_JOB)
+    for texto, _, erros in processar_em_paralelo(blocos, "jsonl", workers, primeira_linha):
+        yield texto.splitlines(), erros
+
+
+def _blocos_rescisao(entradas, primeira_linha, workers, resumo):
+    from calculo_rescisao import iterar_rescisoes, novo_totalizador, acumular_totais
+
+    if not resumo:
+        resumo.update(novo_totalizador())
+    resultados = enumerate(iterar_rescisoes(entradas, workers), start=primeira_linha)
+    while True:
+        bloco = list(islice(resultados, TAMANHO_BLOCO_JOB))
+        if not bloco:
+            return
+        linhas, erros = [], 0
+        for linha, resultado in bloco:
+            acumular_totais(resumo, resultado)
+            erros += "erro" in resultado
+            linhas.append(json.dumps({"linha": linha, **resultado}, ensure_ascii=False))
+        yield linhas, erros
+
+
+def _resumo_rescisao(resumo):
+    from calculo_rescisao import arredondar_totais
+    return arredondar_totais(resumo) if resumo else {}
+
+
+PROCESSADORES = {
+    "das": Processador(_blocos_das, lambda resumo: {}),
+    "rescisao": Processador(_blocos_rescisao, _resumo_rescisao),
+}
+
+
+# ------------------------------------------------------------------------------
+#  SQLITE
+# ------------------------------------------------------------------------------
+
+_esquema_criado = set()
+
+
+def conectar(caminho=None):
+    """Conexão nova (uma por thread/requisição), em WAL para leituras durante as gravações."""
+    caminho = caminho or CAMINHO_DB
+    if caminho not in _esquema_criado:
+        os.makedirs(os.path.dirname(os.path.abspath(caminho)), exist_ok=True)
+    conexao = sqlite3.connect(caminho, timeout=30)
+    conexao.row_factory = sqlite3.Row
+    conexao.execute("PRAGMA journal_mode=WAL")
+    conexao.execute("PRAGMA synchronous=NORMAL")
+    if caminho not in _esquema_criado:
+        conexao.executescript(ESQUEMA)
+        _esquema_criado.add(caminho)
+    return conexao
+
+
+def _data_iso(instante):
+    if instante is None:
+        return None
+    return datetime.datetime.fromtimestamp(instante).isoformat(timespec="seconds")
+
+
+def _linhas_da_tabela(tabela, coluna, job_id, depois_de=0):
+    """Gera (linha, texto) de entradas/resultados em ordem, em páginas (sem carregar o job inteiro)."""
+    conexao = conectar()
+    try:
+        while True:
+            pagina = conexao.execute(
+                f"SELECT linha, {coluna} FROM {tabela} WHERE job_id = ? AND linha > ? ORDER BY linha LIMIT ?",
+                (job_id, depois_de, TAMANHO_PAGINA),
+            ).fetchall()
+            if not pagina:
+                return
+            for linha, texto in pagina:
+                yield linha, texto
+            depois_de = pagina[-1][0]
+    finally:
+        conexao.close()
+
+
+# ------------------------------------------------------------------------------
+#  API DA FILA
+# ------------------------------------------------------------------------------
+
+def criar_job(tipo, registros):
+    """
+    Grava um job com os registros (dicts ou linhas JSON cruas), em blocos, sem
+    materializar a entrada. Retorna o id. O job só fica visível para os
+    despachantes depois que todos os registros foram gravados.
+    """
+    if tipo not in PROCESSADORES:
+        raise ValueError(f"Tipo de job inválido: '{tipo}' (use {', '.join(sorted(PROCESSADORES))}).")
+
+    job_id = uuid.uuid4().hex
+    conexao = conectar()
+    try:
+        with conexao:
+            conexao.execute("INSERT INTO jobs (id, tipo, status, criado_em) VALUES (?, ?, ?, ?)",
+                            (job_id, tipo, RECEBENDO, time.time()))
+        total = 0
+        iterador = iter(registros)
+        while True:
+            bloco = list(islice(iterador, TAMANHO_PAGINA))
+            if not bloco:
+                break
+            with conexao:
+                conexao.executemany(
+                    "INSERT INTO entradas (job_id, linha, dados) VALUES (?, ?, ?)",
+                    [(job_id, total + k, r if isinstance(r, str) else json.dumps(r, ensure_ascii=False))
+                     for k, r in enumerate(bloco, start=1)],
+                )
+            total += len(bloco)
+        with conexao:
+            conexao.execute("UPDATE jobs SET status = ?, total = ? WHERE id = ?", (PENDENTE, total, job_id))
+    except BaseException:
+        with conexao:
+            conexao.execute("DELETE FROM entradas WHERE job_id = ?", (job_id,))
+            conexao.execute("DELETE FROM jobs WHERE id = ?", (job_id,))
+        raise
+    finally:
+        conexao.close()
+
+    garantir_despachante()
+    _novo_job.set()
+    return job_id
+
+
+def consultar_job(job_id):
+    """Situação e progresso do job (None se não existir)."""
+    conexao = conectar()
+    try:
+        job = conexao.execute("SELECT * FROM jobs WHERE id = ?", (job_id,)).fetchone()
+    finally:
+        conexao.close()
+    if job is None:
+        return None
+
+    resumo = json.loads(job["resumo"]) if job["resumo"] else {}
+    return {
+        "id": job["id"],
+        "tipo": job["tipo"],
+        "status": job["status"],
+        "total": job["total"],
+        "processados": job["processados"],
+        "erros": job["erros"],
+        "progresso_percent": round(job["processados"] / job["total"] * 100, 1) if job["total"] else 0.0,
+        "criado_em": _data_iso(job["criado_em"]),
+        "iniciado_em": _data_iso(job["iniciado_em"]),
+        "concluido_em": _data_iso(job["concluido_em"]),
+        "mensagem": job["mensagem"],
+        "resumo": PROCESSADORES[job["tipo"]].exibir_resumo(resumo),
+    }
+
+
+def listar_jobs(limite=50):
+    conexao = conectar()
+    try:
+        ids = [r[0] for r in conexao.execute("SELECT id FROM jobs ORDER BY criado_em DESC LIMIT ?", (limite,))]
+    finally:
+        conexao.close()
+    return [job for job in map(consultar_job, ids) if job is not None]
+
+
+def cancelar_job(job_id):
+    """Cancela um job ainda não encerrado (o despachante para no fim do bloco atual)."""
+    conexao = conectar()
+    try:
+        with conexao:
+            cursor = conexao.execute(
+                f"UPDATE jobs SET status = ?, concluido_em = ? WHERE id = ? AND status NOT IN ({','.join('?' * len(ENCERRADOS))})",
+                (CANCELADO, time.time(), job_id, *ENCERRADOS),
+            )
+        return cursor.rowcount > 0
+    finally:
+        conexao.close()
+
+
+def iterar_resultados(job_id):
+    """Linhas JSON dos resultados já gravados, em ordem (também durante a execução)."""
+    for _, texto in _linhas_da_tabela("resultados", "resultado", job_id):
+        yield texto
+
+
+# ------------------------------------------------------------------------------
+#  DESPACHANTE
+# ------------------------------------------------------------------------------
+
+_novo_job = threading.Event()
+_despachante = {"pid": None, "thread": None}
+_lock_despachante = threading.Lock()
+
+
+def _retomar_abandonados(conexao):
+    """Devolve à fila os jobs em execução cujo processo morreu ou que estão sem progresso há EXPIRACAO segundos."""
+    agora = time.time()
+    for job in conexao.execute("SELECT id, dono_pid, heartbeat FROM jobs WHERE status = ?", (EXECUTANDO,)).fetchall():
+        if job["dono_pid"] == os.getpid() and agora - (job["heartbeat"] or 0) < EXPIRACAO:
+            continue
+        if job["dono_pid"] and processo_vivo(job["dono_pid"]) and agora - (job["heartbeat"] or 0) < EXPIRACAO:
+            continue
+        with conexao:
+            conexao.execute("UPDATE jobs SET status = ?, dono_pid = NULL WHERE id = ? AND status = ? AND dono_pid IS ?",
+                            (PENDENTE, job["id"], EXECUTANDO, job["dono_pid"]))
+
+
+def _reservar_proximo(conexao):
+    """Marca o job pendente mais antigo como deste processo. Retorna a linha do job ou None."""
+    while True:
+        job = conexao.execute("SELECT id FROM jobs WHERE status = ? ORDER BY criado_em LIMIT 1", (PENDENTE,)).fetchone()
+        if job is None:
+            return None
+        agora = time.time()
+        with conexao:
+            cursor = conexao.execute(
+                "UPDATE jobs SET status = ?, dono_pid = ?, heartbeat = ?, iniciado_em = COALESCE(iniciado_em, ?) "
+                "WHERE id = ? AND status = ?",
+                (EXECUTANDO, os.getpid(), agora, agora, job["id"], PENDENTE),
+            )
+        if cursor.rowcount:  # outro processo pode ter reservado antes
+            return conexao.execute("SELECT * FROM jobs WHERE id = ?", (job["id"],)).fetchone()
+
+
+def executar_job(conexao, job, workers=None):
+    """
+    Calcula o job a partir do primeiro registro ainda não gravado. Cada bloco
+    de resultados é gravado na mesma transação que o progresso e o resumo.
+    """
+    processador = PROCESSADORES[job["tipo"]]
+    resumo = json.loads(job["resumo"]) if job["resumo"] else {}
+    inicio = job["processados"]
+    entradas = (dados for _, dados in _linhas_da_tabela("entradas", "dados", job["id"], depois_de=inicio))
+
+    linha = inicio
+    blocos = processador.blocos(entradas, inicio + 1, workers or WORKERS, resumo)
+    try:
+        for linhas, erros in blocos:
+            with conexao:
+                conexao.executemany(
+                    "INSERT OR REPLACE INTO resultados (job_id, linha, resultado) VALUES (?, ?, ?)",
+                    [(job["id"], linha + k, texto) for k, texto in enumerate(linhas, start=1)],
+                )
+                cursor = conexao.execute(
+                    "UPDATE jobs SET processados = processados + ?, erros = erros + ?, resumo = ?, heartbeat = ? "
+                    "WHERE id = ? AND status = ? AND dono_pid = ?",
+                    (len(linhas), erros, json.dumps(resumo), time.time(), job["id"], EXECUTANDO, os.getpid()),
+                )
+                if not cursor.rowcount:  # cancelado (ou retomado por outro processo): descarta o bloco
+                    conexao.rollback()
+                    return
+            linha += len(linhas)
+    finally:
+        blocos.close()
+
+    with conexao:
+        conexao.execute("UPDATE jobs SET status = ?, concluido_em = ? WHERE id = ? AND status = ? AND dono_pid = ?",
+                        (CONCLUIDO, time.time(), job["id"], EXECUTANDO, os.getpid()))
+
+
+def limpar_antigos(conexao):
+    """Apaga os jobs encerrados (e os que nunca terminaram de chegar) há mais de RETENCAO_HORAS."""
+    limite = time.time() - RETENCAO_HORAS * 3600
+    antigos = [r[0] for r in conexao.execute(
+        f"SELECT id FROM jobs WHERE status IN ({','.join('?' * (len(ENCERRADOS) + 1))}) "
+        "AND COALESCE(concluido_em, criado_em) < ?",
+        (*ENCERRADOS, RECEBENDO, limite),
+    )]
+    for job_id in antigos:
+        with conexao:
+            conexao.execute("DELETE FROM entradas WHERE job_id = ?", (job_id,))
+            conexao.execute("DELETE FROM resultados WHERE job_id = ?", (job_id,))
+            conexao.execute("DELETE FROM jobs WHERE id = ?", (job_id,))
+
+
+def _laco_despachante():
+    conexao = conectar()
+    limpar_antigos(conexao)
+    while True:
+        try:
+            _retomar_abandonados(conexao)
+            job = _reservar_proximo(conexao)
+            if job is None:
+                _novo_job.wait(INTERVALO_BUSCA)
+                _novo_job.clear()
+                continue
+            try:
+                executar_job(conexao, job)
+            except Exception as e:
+                print(f"❌ Erro no job {job['id']}:", e)
+                with conexao:
+                    conexao.execute("UPDATE jobs SET status = ?, mensagem = ?, concluido_em = ? WHERE id = ? AND dono_pid = ?",
+                                    (FALHOU, str(e), time.time(), job["id"], os.getpid()))
+        except sqlite3.OperationalError as e:  # banco ocupado por muito tempo: tenta de novo no próximo ciclo
+            print("❌ Erro no despachante de jobs:", e)
+            time.sleep(INTERVALO_BUSCA)
+
+
+def garantir_despachante():
+    """Inicia o despachante deste processo, se ainda não houver (após um fork, cada processo inicia o seu)."""
+    if not HABILITADO:
+        return
+    with _lock_despachante:
+        thread = _despachante["thread"]
+        if _despachante["pid"] == os.getpid() and thread is not None and thread.is_alive():
+            return
+        thread = threading.Thread(target=_laco_despachante, name="despachante-jobs", daemon=True)
+        thread.start()
+        _despachante.update(pid=os.getpid(), thread=thread)
+
+
+def iniciar_fila(app):
+    """
+    Guarda o banco dos jobs na pasta instance/ do app (a menos que
+    CALCULA_JOBS_DB seja informado). Não inicia o despachante: isso fica para
+    garantir_despachante, chamado no primeiro job e nas rotas de /jobs, ou
+    para o comando "flask --app app despachar-jobs" (processo dedicado, que
+    retoma os jobs interrompidos já na subida).
+    """
+    global CAMINHO_DB
+    if not os.environ.get("CALCULA_JOBS_DB"):
+        CAMINHO_DB = os.path.join(app.instance_path, "jobs.sqlite3")
+
+    @app.cli.command("despachar-jobs")
+    def despachar_jobs():
+        """Roda o despachante de jobs em primeiro plano."""
+        _laco_despachante()
+
+    return app
@@ -0,0 +1,93 @@
+# fluxo_ndjson.py
+# Lotes em NDJSON (um JSON por linha), na entrada e na saída
+#
+# Saída: com "?formato=ndjson" (ou "Accept: application/x-ndjson") os
+# endpoints de lote devolvem uma linha por registro, à medida que são
+# calculados, e uma última linha {"resumo": {...}}. As linhas são enviadas
+# em grupos (a cada LINHAS_POR_ENVIO linhas ou INTERVALO_ENVIO segundos),
+# então o cliente começa a receber antes do fim e o servidor não guarda o
+# lote inteiro.
+#
+# Entrada: com Content-Type application/x-ndjson o corpo é lido do
+# request.stream linha a linha, sem carregar o upload na memória; cada
+# linha é decodificada no cálculo (linhas inválidas viram {"erro": ...}).
+# Entrada NDJSON implica saída NDJSON.
+#
+# Um erro inesperado no meio do fluxo (com o status 200 já enviado) é
+# informado numa última linha {"erro": ...}.
+
+import json
+import time
+
+from flask import Response, request, stream_with_context
+
+from metricas import registrar_excecao
+
+TIPO_NDJSON = "application/x-ndjson"
+TIPOS_ENTRADA_NDJSON = (TIPO_NDJSON, "application/ndjson", "application/jsonl", "application/x-jsonlines")
+
+LINHAS_POR_ENVIO = 500
+INTERVALO_ENVIO = 0.5  # segundos
+TAMANHO_BLOCO_NDJSON = 1000  # registros por bloco de cálculo
+
+
+def entrada_ndjson():
+    """O corpo da requisição é NDJSON (lido em fluxo)?"""
+    return request.mimetype in TIPOS_ENTRADA_NDJSON
+
+
+def saida_ndjson():
+    """A resposta deve ser NDJSON: pedida por ?formato=ndjson, pelo Accept, ou com entrada NDJSON."""
+    if request.args.get("formato") == "ndjson" or entrada_ndjson():
+        return True
+    aceitos = request.accept_mimetypes
+    return aceitos.quality(TIPO_NDJSON) > aceitos.quality("application/json")
+
+
+def ler_linhas_ndjson(stream):
+    """Gera as linhas não vazias do corpo (str, sem decodificar o JSON), uma por vez."""
+    primeira = True
+    for bruta in iter(stream.readline, b""):
+        linha = bruta.decode("utf-8").strip()
+        if primeira:
+            linha = linha.lstrip("\ufeff")
+            primeira = False
+        if linha:
+            yield linha
+
+
+def linha_json(objeto):
+    return json.dumps(objeto, ensure_ascii=False) + "\n"
+
+
+def agrupar_envios(linhas, linhas_por_envio=LINHAS_POR_ENVIO, intervalo=INTERVALO_ENVIO):
+    """Junta as linhas em blocos de texto, enviados ao atingir linhas_por_envio ou depois de intervalo segundos."""
+    pendentes = []
+    ultimo_envio = time.monotonic()
+    for linha in linhas:
+        pendentes.append(linha)
+        agora = time.monotonic()
+        if len(pendentes) >= linhas_por_envio or agora - ultimo_envio >= intervalo:
+            yield "".join(pendentes)
+            pendentes.clear()
+            ultimo_envio = agora
+    if pendentes:
+        yield "".join(pendentes)
+
+
+def _com_erro_final(gerador):
+    try:
+        yield from gerador
+    except Exception as e:
+        registrar_excecao(e)
+        print("❌ Erro no lote NDJSON:", e)
+        yield linha_json({"erro": str(e)})
+
+
+def resposta_ndjson(gerador):
+    """Response em fluxo para um gerador de blocos de texto NDJSON."""
+    return Response(
+        stream_with_context(_com_erro_final(gerador)),
+        mimetype=TIPO_NDJSON,
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
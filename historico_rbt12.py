@@ -0,0 +1,139 @@
+# historico_rbt12.py
+# DAS mês a mês a partir de uma série de receitas mensais
+#
+# A RBT12 de cada mês (soma das receitas dos 12 meses anteriores) é obtida
+# com uma soma acumulada em centavos, num único passe O(n), e o DAS de todos
+# os meses é calculado numa só chamada vetorizada de calcular_das_vetorizado.
+
+import numpy as np
+
+from calculo_das import DADOS_DOS_ANEXOS, calcular_das_vetorizado
+from centavos import para_reais
+
+MESES_RBT12 = 12
+
+
+def _competencias(competencia_inicial, quantidade):
+    """Gera os rótulos 'YYYY-MM' a partir da competência inicial."""
+    try:
+        ano, mes = (int(p) for p in str(competencia_inicial).split("-"))
+    except ValueError:
+        raise ValueError("Campo 'competencia_inicial' deve estar no formato 'YYYY-MM'.")
+    if not 1 <= mes <= 12:
+        raise ValueError("Campo 'competencia_inicial' deve estar no formato 'YYYY-MM'.")
+
+    base = ano * 12 + (mes - 1)
+    return [f"{(base + i) // 12:04d}-{(base + i) % 12 + 1:02d}" for i in range(quantidade)]
+
+
+def calcular_rbt12_series(receitas, inicio_atividade=False):
+    """
+    Calcula a RBT12 de cada mês da série.
+    Retorna (rbt12, historico_suficiente): arrays do mesmo tamanho da série.
+
+    Com inicio_atividade=True o primeiro mês da série é o de início de atividade:
+      - no 1º mês a RBT12 é a receita do próprio mês x 12;
+      - do 2º ao 12º mês, a média das receitas dos meses anteriores x 12.
+    Caso contrário, meses com menos de 12 meses anteriores não têm RBT12.
+    """
+    centavos = np.rint(np.asarray(receitas, dtype=float) * 100).astype(np.int64)
+    n = len(centavos)
+    acumulado = np.concatenate(([0], np.cumsum(centavos)))
+
+    meses = np.arange(n)
+    anteriores = np.minimum(meses, MESES_RBT12)
+    soma_anterior = acumulado[meses] - acumulado[meses - anteriores]
+
+    rbt12 = soma_anterior / 100
+    historico_suficiente = anteriores == MESES_RBT12
+
+    if inicio_atividade:
+        proporcional = anteriores < MESES_RBT12
+        with np.errstate(divide="ignore", invalid="ignore"):
+            media_anterior = soma_anterior / 100 / anteriores
+        rbt12 = np.where(proporcional, media_anterior * MESES_RBT12, rbt12)
+        if n:
+            rbt12[0] = centavos[0] / 100 * MESES_RBT12
+        historico_suficiente = np.ones(n, dtype=bool)
+
+    return rbt12, historico_suficiente
+
+
+def calcular_das_historico(dados_json: dict):
+    """
+    Recebe dicionário com:
+      - anexo: int 1..5
+      - receitas: lista com a receita bruta de cada mês, em ordem cronológica
+      - exportacao_servico: 0 ou 1 (opcional)
+      - competencia_inicial: 'YYYY-MM' do primeiro mês da lista (opcional)
+      - inicio_atividade: true se o primeiro mês da lista é o de início de atividade (opcional)
+    Retorna a tabela mês a mês (RBT12, faixa, alíquota efetiva e DAS) e o total do período.
+    Para o Anexo V inclui também o DAS pelo Anexo III (Fator-R).
+    """
+    try:
+        anexo = int(dados_json.get("anexo", 0))
+        receitas = [float(r) for r in dados_json.get("receitas", [])]
+        is_exportacao = bool(int(dados_json.get("exportacao_servico", 0)))
+        inicio_atividade = bool(dados_json.get("inicio_atividade", False))
+    except (ValueError, TypeError) as e:
+        raise ValueError(f"Erro nos dados de entrada: {e}")
+
+    if anexo not in DADOS_DOS_ANEXOS:
+        raise ValueError("Anexo inválido. Deve ser 1,2,3,4 ou 5.")
+    if not receitas:
+        raise ValueError("Campo 'receitas' deve conter ao menos um mês.")
+
+    n = len(receitas)
+    if dados_json.get("competencia_inicial"):
+        rotulos = _competencias(dados_json["competencia_inicial"], n)
+    else:
+        rotulos = list(range(1, n + 1))
+
+    rbt12, historico_suficiente = calcular_rbt12_series(receitas, inicio_atividade)
+
+    exportacao = [is_exportacao] * n
+    calculo = calcular_das_vetorizado([anexo] * n, rbt12, receitas, exportacao)
+    calculo_fator_r = calcular_das_vetorizado([3] * n, rbt12, receitas, exportacao) if anexo == 5 else None
+
+    rbt12_lista = rbt12.tolist()
+    suficiente = historico_suficiente.tolist()
+    fora_limite = calculo["fora_limite"].tolist()
+    faixas = calculo["faixa_idx"].tolist()
+    aliquotas = calculo["aliquota_efetiva"].tolist()
+    valores = calculo["valor_das_centavos"].tolist()
+    if calculo_fator_r is not None:
+        aliquotas_fator_r = calculo_fator_r["aliquota_efetiva"].tolist()
+        valores_fator_r = calculo_fator_r["valor_das_centavos"].tolist()
+
+    meses = []
+    total_das = 0  # centavos
+    total_das_fator_r = 0
+    for i in range(n):
+        linha = {"competencia": rotulos[i], "receita": receitas[i]}
+        if not suficiente[i]:
+            linha["erro"] = "Histórico insuficiente: são necessários os 12 meses anteriores para a RBT12."
+        elif fora_limite[i]:
+            linha["rbt12"] = round(rbt12_lista[i], 2)
+            linha["erro"] = "A RBT12 informada ultrapassa o limite de R$ 4.800.000,00 do Simples Nacional."
+        else:
+            linha.update({
+                "rbt12": round(rbt12_lista[i], 2),
+                "faixa": faixas[i] + 1,
+                "aliquota_efetiva_percent": round(aliquotas[i], 8),
+                "valor_das_a_pagar": para_reais(valores[i]),
+            })
+            total_das += valores[i]
+            if calculo_fator_r is not None:
+                linha["fator_r_aliquota_efetiva_percent"] = round(aliquotas_fator_r[i], 8)
+                linha["fator_r_valor_das_a_pagar"] = para_reais(valores_fator_r[i])
+                total_das_fator_r += valores_fator_r[i]
+        meses.append(linha)
+
+    resultado = {
+        "anexo": anexo,
+        "meses": meses,
+        "total_das": para_reais(total_das),
+    }
+    if calculo_fator_r is not None:
+        resultado["total_das_fator_r"] = para_reais(total_das_fator_r)
+    return resultado
@@ -0,0 +1,191 @@
+# inverso_liquido.py
+# Do líquido para o bruto: pró-labore e rescisão
+#
+# INSS e IRRF são lineares por faixa, então o líquido também é linear por
+# partes em função do bruto. Em vez de tentativas (bisseção), os pontos de
+# quebra são calculados a partir das tabelas e o bruto sai em forma fechada,
+# faixa a faixa, para um array inteiro de líquidos desejados.
+
+import numpy as np
+
+from centavos import arredondar, arredondar_reais, para_reais
+from calcular_darf_pro_labore import PISO_PRO_LABORE, TABELA_INSS_PRO_LABORE, TABELA_IRPF_COMPILADA
+from calculo_rescisao import (
+    DEDUCAO_DEPENDENTE_2025,
+    TABELA_INSS_2025,
+    parse_data,
+    processar_rescisao,
+    tabela_irrf_vigente,
+)
+
+# Remuneração usada para medir os coeficientes lineares da rescisão
+# (grande o bastante para o arredondamento em centavos ser desprezível)
+REMUNERACAO_SONDA = 1_000_000.0
+
+
+def _lista_de_liquidos(dados_json):
+    if "liquidos" in dados_json:
+        liquidos = dados_json["liquidos"]
+    elif "liquido" in dados_json:
+        liquidos = [dados_json["liquido"]]
+    else:
+        raise ValueError("Informe 'liquido' ou a lista 'liquidos' desejada.")
+    try:
+        liquidos = np.array([float(v) for v in liquidos], dtype=float)
+    except (TypeError, ValueError) as e:
+        raise ValueError(f"Valores líquidos inválidos: {e}")
+    if not np.isfinite(liquidos).all():
+        raise ValueError("Valores líquidos inválidos: devem ser números finitos.")
+    return liquidos
+
+
+# ------------------------------------------------------------------------------
+#  PRÓ-LABORE
+# ------------------------------------------------------------------------------
+
+def pro_labore_por_liquido(liquidos):
+    """
+    Pró-labore bruto que resulta em cada líquido desejado (bruto - INSS - IRPF).
+    Inverte primeiro o IRPF (líquido -> base do IRPF) e depois o INSS
+    (base do IRPF -> pró-labore), ambos em forma fechada.
+    """
+    liquidos = np.asarray(liquidos, dtype=float)
+    base_irpf = TABELA_IRPF_COMPILADA.inverter_liquido_array(liquidos)
+    pro_labore_centavos = arredondar(TABELA_INSS_PRO_LABORE.inverter_liquido_array(base_irpf))
+    pro_labore = para_reais(pro_labore_centavos)
+
+    inss = TABELA_INSS_PRO_LABORE.calcular_array(pro_labore)
+    irpf = TABELA_IRPF_COMPILADA.calcular_array(pro_labore - inss)
+    inss_centavos = arredondar(inss)
+    irpf_centavos = arredondar(irpf)
+
+    return {
+        "liquido_desejado": arredondar_reais(liquidos).tolist(),
+        "pro_labore": pro_labore.tolist(),
+        "inss": para_reais(inss_centavos).tolist(),
+        "ir": para_reais(irpf_centavos).tolist(),
+        "liquido": para_reais(pro_labore_centavos - inss_centavos - irpf_centavos).tolist(),
+        "abaixo_do_piso": (pro_labore < PISO_PRO_LABORE).tolist(),
+    }
+
+
+def pro_labore_por_liquido_from_input(dados_json: dict):
+    return pro_labore_por_liquido(_lista_de_liquidos(dados_json))
+
+
+# ------------------------------------------------------------------------------
+#  RESCISÃO
+# ------------------------------------------------------------------------------
+
+def _coeficientes_rescisao(dados_json):
+    """
+    Todas as verbas da rescisão são proporcionais à remuneração total (R).
+    Uma única simulação com R = REMUNERACAO_SONDA dá os coeficientes por real de R.
+    """
+    sonda = dict(dados_json)
+    sonda.update({"salario_base": REMUNERACAO_SONDA, "adicionais": 0, "media_he": 0, "media_comissao": 0,
+                  "pensao": 0, "adiantamento": 0, "dependentes": 0})
+    resultado = processar_rescisao(sonda)
+
+    descontos = resultado["descontos"]
+    descontos_proporcionais = sum(v for k, v in descontos.items() if k not in ("INSS", "IRRF"))
+    return {
+        "proventos": resultado["totais"]["total_proventos"] / REMUNERACAO_SONDA,
+        "descontos": descontos_proporcionais / REMUNERACAO_SONDA,
+        "base_inss": resultado["observacoes"]["base_inss"] / REMUNERACAO_SONDA,
+        "tributaveis": resultado["totais"]["verbas_tributaveis"] / REMUNERACAO_SONDA,
+    }
+
+
+def _pontos_de_quebra(k, tabela_irrf, deducoes_irrf):
+    """Remunerações em que o INSS ou o IRRF mudam de faixa."""
+    pontos = {0.0}
+    inferior_inss = 0.0
+    for limite, inferior, aliquota, acumulado in zip(TABELA_INSS_2025.limites, TABELA_INSS_2025.inferiores,
+                                                     TABELA_INSS_2025.aliquotas, TABELA_INSS_2025.acumulados):
+        fim_segmento = limite / k["base_inss"]
+        pontos.add(fim_segmento)
+
+        # Dentro do segmento: base IRRF = (tributaveis - a * base_inss) * R - (acumulado - a * inferior) - deduções
+        inclinacao = k["tributaveis"] - aliquota * k["base_inss"]
+        constante = -(acumulado - aliquota * inferior) - deducoes_irrf
+        if inclinacao:
+            for limite_irrf in tabela_irrf.limites:
+                if limite_irrf != float("inf"):
+                    r = (limite_irrf - constante) / inclinacao
+                    if inferior_inss <= r <= fim_segmento:
+                        pontos.add(r)
+        inferior_inss = fim_segmento
+
+    # Acima do teto do INSS a base do IRRF cresce com inclinação "tributaveis"
+    inss_teto = TABELA_INSS_2025.calcular(TABELA_INSS_2025.teto)
+    if k["tributaveis"]:
+        for limite_irrf in tabela_irrf.limites:
+            if limite_irrf != float("inf"):
+                r = (limite_irrf + inss_teto + deducoes_irrf) / k["tributaveis"]
+                if r >= inferior_inss:
+                    pontos.add(r)
+
+    return np.array(sorted(pontos))
+
+
+def _liquido_rescisao(remuneracoes, k, tabela_irrf, deducoes_irrf, outros_descontos):
+    inss = TABELA_INSS_2025.calcular_array(remuneracoes * k["base_inss"])
+    irrf = tabela_irrf.calcular_array(remuneracoes * k["tributaveis"] - inss - deducoes_irrf)
+    return remuneracoes * (k["proventos"] - k["descontos"]) - inss - irrf - outros_descontos
+
+
+def salario_por_liquido_rescisao(dados_json: dict, liquidos):
+    """
+    Salário base que produz cada total líquido desejado na rescisão, mantendo
+    fixos os demais campos (datas, motivo, adicionais, médias, dependentes...).
+    O líquido é linear entre os pontos de quebra das tabelas, então basta
+    avaliá-lo nesses pontos e resolver a reta do segmento de cada alvo.
+    """
+    liquidos = np.asarray(liquidos, dtype=float)
+    try:
+        outros = sum(float(dados_json.get(c, 0)) for c in ("adicionais", "media_he", "media_comissao"))
+        dependentes = int(dados_json.get("dependentes", 0))
+        pensao = float(dados_json.get("pensao", 0))
+        adiantamento = float(dados_json.get("adiantamento", 0))
+    except (ValueError, TypeError) as e:
+        raise ValueError(f"Erro nos dados de entrada: {e}")
+
+    k = _coeficientes_rescisao(dados_json)
+    tabela_irrf = tabela_irrf_vigente(parse_data(dados_json.get("data_demissao")))
+    deducoes_irrf = dependentes * DEDUCAO_DEPENDENTE_2025 + pensao
+    outros_descontos = pensao + adiantamento
+
+    pontos_r = _pontos_de_quebra(k, tabela_irrf, deducoes_irrf)
+    # Um ponto extra além do último para a reta final (extrapolação)
+    pontos_r = np.append(pontos_r, pontos_r[-1] + REMUNERACAO_SONDA)
+    pontos_liquido = _liquido_rescisao(pontos_r, k, tabela_irrf, deducoes_irrf, outros_descontos)
+    if np.any(np.diff(pontos_liquido) <= 0):
+        raise ValueError("Neste cenário o líquido não cresce com o salário (ex.: indenização do Art. 480); não há inverso.")
+
+    segmento = np.clip(np.searchsorted(pontos_liquido, liquidos, side="left"), 1, len(pontos_r) - 1)
+    r0, r1 = pontos_r[segmento - 1], pontos_r[segmento]
+    l0, l1 = pontos_liquido[segmento - 1], pontos_liquido[segmento]
+    remuneracao = r0 + (liquidos - l0) * (r1 - r0) / (l1 - l0)
+
+    salarios = arredondar_reais(remuneracao - outros)
+    viavel = (liquidos >= pontos_liquido[0]) & (salarios >= 0)
+
+    resultados = []
+    for alvo, salario, ok in zip(liquidos.tolist(), salarios.tolist(), viavel.tolist()):
+        if not ok:
+            resultados.append({"liquido_desejado": arredondar_reais(alvo), "erro": "Líquido desejado inatingível com os dados informados."})
+            continue
+        conferencia = processar_rescisao({**dados_json, "salario_base": salario})
+        resultados.append({
+            "liquido_desejado": arredondar_reais(alvo),
+            "salario_base": salario,
+            "total_proventos": conferencia["totais"]["total_proventos"],
+            "total_descontos": conferencia["totais"]["total_descontos"],
+            "total_liquido": conferencia["totais"]["total_liquido"],
+        })
+    return resultados
+
+
+def salario_por_liquido_rescisao_from_input(dados_json: dict):
+    return {"resultados": salario_por_liquido_rescisao(dados_json, _lista_de_liquidos(dados_json))}
@@ -0,0 +1,320 @@
+# metricas.py
+# Métricas das rotas do app no formato texto do Prometheus
+#
+# Para cada rota: total de requisições (por método e status), erros por tipo
+# de exceção, histograma de latência e requisições em andamento. A coleta é
+# feita pelos ganchos before_request / after_request / teardown_request do
+# Flask; os handlers que tratam a exceção e devolvem 400 informam o tipo com
+# registrar_excecao(e).
+#
+# Com vários processos (workers do gunicorn) cada um tem a sua memória. Se a
+# variável CALCULA_METRICAS_DIR apontar para um diretório compartilhado, cada
+# processo grava ali um arquivo metricas_<pid>_<início>.json (no máximo a cada
+# CALCULA_METRICAS_INTERVALO segundos, padrão 1) e /metrics soma todos os
+# arquivos. O início do processo no nome evita que um processo novo com um pid
+# reaproveitado sobrescreva o arquivo de um que já terminou. Os arquivos de
+# processos encerrados são incorporados ao total acumulado
+# (metricas_aposentadas.json) e apagados, então os contadores nunca diminuem;
+# as requisições em andamento só contam processos vivos.
+
+import os
+import json
+import time
+import fcntl
+import atexit
+import threading
+
+from flask import Response, g, request
+
+DIRETORIO = os.environ.get("CALCULA_METRICAS_DIR")
+INTERVALO_GRAVACAO = float(os.environ.get("CALCULA_METRICAS_INTERVALO", 1.0))
+
+# Limites superiores dos baldes do histograma de latência, em segundos
+BALDES_LATENCIA = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+ROTA_DESCONHECIDA = "desconhecida"
+ARQUIVO_APOSENTADAS = "metricas_aposentadas.json"
+ARQUIVO_TRAVA = "metricas.lock"
+TIPO_CONTENT = "text/plain; version=0.0.4; charset=utf-8"
+
+
+class RegistroMetricas:
+    """Métricas de um processo. Os rótulos são guardados como chaves 'a|b|c'."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.requisicoes = {}    # rota|metodo|status -> total
+        self.erros = {}          # rota|tipo -> total
+        self.baldes = {}         # rota -> contagem por balde (não acumulada) + "+Inf"
+        self.soma_latencia = {}  # rota -> segundos
+        self.em_andamento = {}   # rota -> requisições
+        self._ultima_gravacao = 0.0
+
+    def iniciar(self, rota):
+        with self._lock:
+            self.em_andamento[rota] = self.em_andamento.get(rota, 0) + 1
+
+    def finalizar(self, rota, metodo, status, duracao, tipo_erro=None):
+        i = 0
+        while i < len(BALDES_LATENCIA) and duracao > BALDES_LATENCIA[i]:
+            i += 1
+        with self._lock:
+            self.em_andamento[rota] = self.em_andamento.get(rota, 1) - 1
+            chave = f"{rota}|{metodo}|{status}"
+            self.requisicoes[chave] = self.requisicoes.get(chave, 0) + 1
+            if tipo_erro:
+                chave = f"{rota}|{tipo_erro}"
+                self.erros[chave] = self.erros.get(chave, 0) + 1
+            baldes = self.baldes.setdefault(rota, [0] * (len(BALDES_LATENCIA) + 1))
+            baldes[i] += 1
+            self.soma_latencia[rota] = self.soma_latencia.get(rota, 0.0) + duracao
+
+    def _identidade(self):
+        """(pid, início) deste processo; recalculada após um fork."""
+        pid = os.getpid()
+        if getattr(self, "_pid", None) != pid:
+            self._pid = pid
+            self._inicio = _inicio_processo(pid)
+            self._sufixo = self._inicio if self._inicio is not None else time.time_ns()
+        return pid, self._inicio
+
+    def instantaneo(self):
+        pid, inicio = self._identidade()
+        with self._lock:
+            return {
+                "pid": pid,
+                "inicio": inicio,
+                "requisicoes": dict(self.requisicoes),
+                "erros": dict(self.erros),
+                "baldes": {rota: list(b) for rota, b in self.baldes.items()},
+                "soma_latencia": dict(self.soma_latencia),
+                "em_andamento": dict(self.em_andamento),
+            }
+
+    def gravar(self, forcar=False):
+        """Grava o instantâneo do processo em CALCULA_METRICAS_DIR (escrita atômica)."""
+        if not DIRETORIO:
+            return
+        agora = time.monotonic()
+        if not forcar and agora - self._ultima_gravacao < INTERVALO_GRAVACAO:
+            return
+        self._ultima_gravacao = agora
+        dados = self.instantaneo()
+        caminho = os.path.join(DIRETORIO, f"metricas_{dados['pid']}_{self._sufixo}.json")
+        temporario = caminho + ".tmp"
+        with open(temporario, "w", encoding="utf-8") as f:
+            json.dump(dados, f)
+        os.replace(temporario, caminho)
+
+
+REGISTRO = RegistroMetricas()
+
+
+def registrar_excecao(e):
+    """Chamado nos handlers que tratam a exceção: marca o tipo para a contagem de erros."""
+    g.excecao = type(e).__name__
+
+
+def processo_vivo(pid):
+    """Existe um processo com esse pid? (usado também pela fila de jobs)"""
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    return True
+
+
+def _inicio_processo(pid):
+    """Instante de início do processo (em ticks desde o boot, de /proc), ou None fora do Linux."""
+    try:
+        with open(f"/proc/{pid}/stat", encoding="ascii") as f:
+            return int(f.read().rsplit(")", 1)[1].split()[19])
+    except (OSError, IndexError, ValueError):
+        return None
+
+
+def _processo_ativo(dados):
+    """O processo que gravou o instantâneo ainda está rodando (e não é outro com o mesmo pid)?"""
+    if not processo_vivo(dados["pid"]):
+        return False
+    return dados.get("inicio") is None or _inicio_processo(dados["pid"]) == dados["inicio"]
+
+
+def _ler_json(caminho):
+    try:
+        with open(caminho, encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+
+def _novo_acumulado():
+    return {"requisicoes": {}, "erros": {}, "baldes": {}, "soma_latencia": {}, "em_andamento": {}, "arquivos": []}
+
+
+def _acumular(destino, dados):
+    _somar(destino["requisicoes"], dados["requisicoes"])
+    _somar(destino["erros"], dados["erros"])
+    _somar(destino["soma_latencia"], dados["soma_latencia"])
+    for rota, contagens in dados["baldes"].items():
+        total = destino["baldes"].setdefault(rota, [0] * (len(BALDES_LATENCIA) + 1))
+        for i, n in enumerate(contagens):
+            total[i] += n
+
+
+def _aposentar(encerrados):
+    """
+    Incorpora os arquivos de processos encerrados ao total acumulado e os apaga,
+    sob uma trava de arquivo (vários workers podem atender /metrics ao mesmo tempo).
+    O total guarda os nomes incorporados, para que um arquivo cuja remoção falhou
+    não seja somado duas vezes.
+    """
+    caminho = os.path.join(DIRETORIO, ARQUIVO_APOSENTADAS)
+    with open(os.path.join(DIRETORIO, ARQUIVO_TRAVA), "a") as trava:
+        fcntl.flock(trava, fcntl.LOCK_EX)
+        acumulado = _ler_json(caminho) or _novo_acumulado()
+        acumulado["arquivos"] = [n for n in acumulado["arquivos"] if os.path.exists(os.path.join(DIRETORIO, n))]
+        novos = []
+        for nome in encerrados:
+            dados = _ler_json(os.path.join(DIRETORIO, nome))
+            if dados is None or nome in acumulado["arquivos"]:
+                continue
+            _acumular(acumulado, dados)
+            acumulado["arquivos"].append(nome)
+            novos.append(nome)
+        if novos:
+            temporario = caminho + f".{os.getpid()}.tmp"
+            with open(temporario, "w", encoding="utf-8") as f:
+                json.dump(acumulado, f)
+            os.replace(temporario, caminho)
+        for nome in acumulado["arquivos"]:
+            try:
+                os.remove(os.path.join(DIRETORIO, nome))
+            except FileNotFoundError:
+                pass
+    return acumulado
+
+
+def _instantaneos():
+    """Instantâneos dos processos vivos mais o total dos encerrados (ou só deste, sem CALCULA_METRICAS_DIR)."""
+    if not DIRETORIO:
+        return [REGISTRO.instantaneo()]
+
+    REGISTRO.gravar(forcar=True)
+    instantaneos, encerrados = [], []
+    for nome in sorted(os.listdir(DIRETORIO)):
+        if not (nome.startswith("metricas_") and nome.endswith(".json")) or nome == ARQUIVO_APOSENTADAS:
+            continue
+        dados = _ler_json(os.path.join(DIRETORIO, nome))
+        if dados is None:
+            continue
+        if _processo_ativo(dados):
+            instantaneos.append(dados)
+        else:
+            encerrados.append(nome)
+    if encerrados:
+        instantaneos.append(_aposentar(encerrados))
+    else:
+        instantaneos.append(_ler_json(os.path.join(DIRETORIO, ARQUIVO_APOSENTADAS)) or _novo_acumulado())
+    return instantaneos
+
+
+def _somar(destino, origem):
+    for chave, valor in origem.items():
+        destino[chave] = destino.get(chave, 0) + valor
+
+
+def _rotulo(valor):
+    return str(valor).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _formatar_numero(valor):
+    return repr(float(valor)) if isinstance(valor, float) else str(valor)
+
+
+def gerar_texto_prometheus():
+    """Soma os instantâneos dos processos e gera o texto de exposição do Prometheus."""
+    total = _novo_acumulado()
+    for dados in _instantaneos():
+        _acumular(total, dados)
+        _somar(total["em_andamento"], dados["em_andamento"])
+    requisicoes, erros, soma_latencia = total["requisicoes"], total["erros"], total["soma_latencia"]
+    em_andamento, baldes = total["em_andamento"], total["baldes"]
+
+    linhas = [
+        "# HELP calcula_requisicoes_total Requisições atendidas por rota, método e status.",
+        "# TYPE calcula_requisicoes_total counter",
+    ]
+    for chave in sorted(requisicoes):
+        rota, metodo, status = chave.split("|")
+        linhas.append(f'calcula_requisicoes_total{{rota="{_rotulo(rota)}",metodo="{metodo}",status="{status}"}} '
+                      f"{requisicoes[chave]}")
+
+    linhas += [
+        "# HELP calcula_erros_total Erros por rota e tipo de exceção.",
+        "# TYPE calcula_erros_total counter",
+    ]
+    for chave in sorted(erros):
+        rota, tipo = chave.split("|")
+        linhas.append(f'calcula_erros_total{{rota="{_rotulo(rota)}",tipo="{_rotulo(tipo)}"}} {erros[chave]}')
+
+    linhas += [
+        "# HELP calcula_latencia_segundos Latência das requisições por rota.",
+        "# TYPE calcula_latencia_segundos histogram",
+    ]
+    for rota in sorted(baldes):
+        r = _rotulo(rota)
+        acumulado = 0
+        for limite, n in zip(BALDES_LATENCIA, baldes[rota]):
+            acumulado += n
+            linhas.append(f'calcula_latencia_segundos_bucket{{rota="{r}",le="{limite}"}} {acumulado}')
+        acumulado += baldes[rota][-1]
+        linhas.append(f'calcula_latencia_segundos_bucket{{rota="{r}",le="+Inf"}} {acumulado}')
+        linhas.append(f'calcula_latencia_segundos_sum{{rota="{r}"}} {_formatar_numero(soma_latencia.get(rota, 0.0))}')
+        linhas.append(f'calcula_latencia_segundos_count{{rota="{r}"}} {acumulado}')
+
+    linhas += [
+        "# HELP calcula_requisicoes_em_andamento Requisições sendo atendidas agora, por rota.",
+        "# TYPE calcula_requisicoes_em_andamento gauge",
+    ]
+    for rota in sorted(em_andamento):
+        linhas.append(f'calcula_requisicoes_em_andamento{{rota="{_rotulo(rota)}"}} {em_andamento[rota]}')
+
+    return "\n".join(linhas) + "\n"
+
+
+def instrumentar(app, caminho="/metrics"):
+    """Registra os ganchos de coleta em todas as rotas do app e expõe o endpoint de métricas."""
+    if DIRETORIO:
+        os.makedirs(DIRETORIO, exist_ok=True)
+        atexit.register(REGISTRO.gravar, True)
+
+    @app.before_request
+    def _inicio_metricas():
+        g.metricas_rota = request.url_rule.rule if request.url_rule else ROTA_DESCONHECIDA
+        g.metricas_inicio = time.perf_counter()
+        REGISTRO.iniciar(g.metricas_rota)
+
+    @app.after_request
+    def _status_metricas(resposta):
+        g.metricas_status = resposta.status_code
+        return resposta
+
+    @app.teardown_request
+    def _fim_metricas(excecao=None):
+        rota = g.pop("metricas_rota", None)
+        if rota is None:
+            return
+        duracao = time.perf_counter() - g.pop("metricas_inicio")
+        status = g.pop("metricas_status", 500)
+        tipo_erro = type(excecao).__name__ if excecao is not None else g.pop("excecao", None)
+        REGISTRO.finalizar(rota, request.method, status, duracao, tipo_erro)
+        REGISTRO.gravar()
+
+    @app.route(caminho)
+    def metricas():
+        return Response(gerar_texto_prometheus(), content_type=TIPO_CONTENT)
+
+    return app
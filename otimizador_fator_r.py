@@ -0,0 +1,109 @@
+# otimizador_fator_r.py
+# Otimizador do pró-labore para o Fator-R (Anexo V x Anexo III)
+#
+# Com Fator-R (folha de 12 meses / RBT12) >= 28% a empresa do Anexo V é
+# tributada pelo Anexo III. Aumentar o pró-labore eleva o Fator-R, mas também
+# o INSS e o IRPF do sócio. Este módulo avalia, num único passe vetorizado,
+# o custo total (DAS + INSS + IRPF) para uma faixa de pró-labores e devolve o
+# ponto de menor custo junto com a curva completa.
+
+import math
+
+import numpy as np
+
+from calculo_das import calcular_das_vetorizado, extrair_entrada
+from calcular_darf_pro_labore import (
+    PISO_PRO_LABORE,
+    PERCENTUAL_FATOR_R,
+    TABELA_INSS_PRO_LABORE,
+    TABELA_IRPF_COMPILADA,
+)
+
+PONTOS_PADRAO = 200
+
+
+def _darf_vetorizado(pro_labores):
+    """INSS (11% até o teto) e IRPF do sócio para um array de pró-labores."""
+    inss = TABELA_INSS_PRO_LABORE.calcular_array(pro_labores)
+    irpf = TABELA_IRPF_COMPILADA.calcular_array(pro_labores - inss)
+    return inss, irpf
+
+
+def otimizar_pro_labore(dados_json: dict):
+    """
+    Recebe dicionário com:
+      - rbt: RBT12 (receita bruta dos últimos 12 meses)
+      - faturamento: faturamento do mês
+      - exportacao_servico: 0 ou 1 (opcional)
+      - folha_12_meses: demais salários e encargos dos últimos 12 meses, sem o pró-labore (opcional)
+      - pro_labore_maximo: maior pró-labore a considerar (opcional, padrão = faturamento)
+      - pontos: quantidade de pontos da curva (opcional, padrão 200)
+    Considera o pró-labore constante nos 12 meses. Retorna o pró-labore ótimo,
+    o pró-labore mínimo que atinge o Fator-R e a curva de custo.
+    """
+    entrada = dict(dados_json)
+    entrada["anexo"] = 5
+    entrada.setdefault("exportacao_servico", 0)
+    _, rbt12, faturamento_mensal, is_exportacao, _ = extrair_entrada(entrada)
+
+    if faturamento_mensal <= 0:
+        raise ValueError("Campo 'faturamento' deve ser maior que zero.")
+
+    folha_12_meses = float(dados_json.get("folha_12_meses", 0))
+    pro_labore_maximo = float(dados_json.get("pro_labore_maximo", faturamento_mensal))
+    pontos = int(dados_json.get("pontos", PONTOS_PADRAO))
+    if pontos < 2:
+        raise ValueError("Campo 'pontos' deve ser pelo menos 2.")
+
+    # DAS nos dois anexos possíveis (não depende do pró-labore)
+    das = calcular_das_vetorizado([5, 3], [rbt12, rbt12], [faturamento_mensal] * 2, [is_exportacao] * 2)
+    if das["fora_limite"].any():
+        raise ValueError("A RBT12 informada ultrapassa o limite de R$ 4.800.000,00 do Simples Nacional.")
+    das_anexo_v, das_anexo_iii = das["valor_das"].tolist()
+
+    # Sem histórico (início de atividade) a RBT12 é estimada pelo mês atual
+    rbt12_fator_r = rbt12 if rbt12 > 0 else faturamento_mensal * 12
+
+    # Solução analítica: dentro de cada anexo o custo só cresce com o pró-labore,
+    # então o ótimo é o piso ou o menor pró-labore que atinge o Fator-R
+    # (arredondado para cima no centavo, para não ficar abaixo dos 28%).
+    pro_labore_fator_r = (PERCENTUAL_FATOR_R * rbt12_fator_r - folha_12_meses) / 12
+    pro_labore_fator_r = max(math.ceil(round(pro_labore_fator_r * 100, 6)) / 100, PISO_PRO_LABORE)
+
+    pro_labore_maximo = max(pro_labore_maximo, PISO_PRO_LABORE)
+    candidatos = np.linspace(PISO_PRO_LABORE, pro_labore_maximo, pontos)
+    if pro_labore_fator_r <= pro_labore_maximo:
+        candidatos = np.union1d(candidatos, [pro_labore_fator_r])
+
+    fator_r = (candidatos * 12 + folha_12_meses) / rbt12_fator_r
+    usa_anexo_iii = fator_r >= PERCENTUAL_FATOR_R - 1e-12  # tolerância de arredondamento no ponto analítico
+    valor_das = np.where(usa_anexo_iii, das_anexo_iii, das_anexo_v)
+    inss, irpf = _darf_vetorizado(candidatos)
+    custo_total = valor_das + inss + irpf
+
+    i = int(np.argmin(custo_total))
+    otimo = {
+        "pro_labore": round(float(candidatos[i]), 2),
+        "fator_r_percent": round(float(fator_r[i]) * 100, 4),
+        "anexo": 3 if usa_anexo_iii[i] else 5,
+        "das": round(float(valor_das[i]), 2),
+        "inss": round(float(inss[i]), 2),
+        "ir": round(float(irpf[i]), 2),
+        "custo_total": round(float(custo_total[i]), 2),
+    }
+
+    return {
+        "otimo": otimo,
+        "pro_labore_minimo_fator_r": round(pro_labore_fator_r, 2),
+        "das_anexo_v": round(das_anexo_v, 2),
+        "das_anexo_iii": round(das_anexo_iii, 2),
+        "curva": {
+            "pro_labore": candidatos.round(2).tolist(),
+            "fator_r_percent": (fator_r * 100).round(4).tolist(),
+            "anexo": np.where(usa_anexo_iii, 3, 5).tolist(),
+            "das": valor_das.round(2).tolist(),
+            "inss": inss.round(2).tolist(),
+            "ir": irpf.round(2).tolist(),
+            "custo_total": custo_total.round(2).tolist(),
+        },
+    }
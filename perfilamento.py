@@ -0,0 +1,155 @@
+# perfilamento.py
+# Perfil (cProfile) de requisições, sob demanda ou por amostragem
+#
+# Sob demanda: com CALCULA_PROFILING=1, uma requisição com o cabeçalho
+# "X-Perfilar: 1" ou o parâmetro "?perfilar=1" roda sob o cProfile e as
+# funções mais custosas voltam na própria resposta JSON, na chave "perfil".
+# Sem CALCULA_PROFILING o cabeçalho e o parâmetro são ignorados.
+#
+# Amostragem: com CALCULA_PROFILING_AMOSTRA=N (N > 0), 1 a cada N requisições
+# é perfilada e as estatísticas são somadas por rota e gravadas em
+# CALCULA_PROFILING_DIR (padrão "perfis") como <rota>_<pid>.prof, para
+# análise com pstats / snakeviz.
+#
+# Só um perfil roda por vez no processo; se outro já estiver ativo a
+# requisição segue sem perfil.
+#
+# Respostas em fluxo (NDJSON, ZIP de PDFs, CSV) fazem o trabalho enquanto o
+# corpo é enviado, depois do after_request: o perfil só é encerrado quando o
+# servidor fecha a resposta. Como aí o corpo já foi enviado, o perfil sob
+# demanda dessas respostas vai para o arquivo da rota, como na amostragem.
+
+import os
+import io
+import time
+import cProfile
+import pstats
+import threading
+from itertools import count
+
+from flask import g, request
+
+HABILITADO = os.environ.get("CALCULA_PROFILING", "0").lower() in ("1", "true", "sim")
+AMOSTRA = int(os.environ.get("CALCULA_PROFILING_AMOSTRA", 0))
+DIRETORIO = os.environ.get("CALCULA_PROFILING_DIR", "perfis")
+TOP_FUNCOES = int(os.environ.get("CALCULA_PROFILING_TOP", 20))
+
+CABECALHO = "X-Perfilar"
+PARAMETRO = "perfilar"
+
+_lock_perfil = threading.Lock()
+_lock_amostras = threading.Lock()
+_contador = count(1)
+_amostras = {}  # rota -> pstats.Stats acumulado
+
+
+def _pedido_de_perfil():
+    valor = request.headers.get(CABECALHO) or request.args.get(PARAMETRO)
+    return str(valor).lower() in ("1", "true", "sim")
+
+
+def _nome_funcao(chave):
+    arquivo, linha, funcao = chave
+    if arquivo == "~":
+        return funcao
+    return f"{os.path.basename(arquivo)}:{linha}({funcao})"
+
+
+def funcoes_mais_custosas(perfil, top=TOP_FUNCOES, ordem="tottime"):
+    """Lista as funções do perfil ordenadas por tempo próprio (ou acumulado), em ms."""
+    estatisticas = pstats.Stats(perfil, stream=io.StringIO()).stats
+    indice = 2 if ordem == "tottime" else 3
+    linhas = sorted(estatisticas.items(), key=lambda item: item[1][indice], reverse=True)[:top]
+    return [
+        {
+            "funcao": _nome_funcao(chave),
+            "chamadas": nc,
+            "tempo_proprio_ms": round(tt * 1000, 3),
+            "tempo_acumulado_ms": round(ct * 1000, 3),
+        }
+        for chave, (_, nc, tt, ct, _) in linhas
+    ]
+
+
+def _arquivo_da_rota(rota):
+    nome = rota.strip("/").replace("/", "_").replace("<", "").replace(">", "") or "index"
+    return os.path.join(DIRETORIO, f"{nome}_{os.getpid()}.prof")
+
+
+def _acumular_amostra(rota, perfil):
+    """Soma o perfil às amostras da rota e regrava o arquivo agregado."""
+    with _lock_amostras:
+        if rota in _amostras:
+            _amostras[rota].add(perfil)
+        else:
+            _amostras[rota] = pstats.Stats(perfil, stream=io.StringIO())
+        os.makedirs(DIRETORIO, exist_ok=True)
+        _amostras[rota].dump_stats(_arquivo_da_rota(rota))
+
+
+def ativar_perfilamento(app):
+    """Registra os ganchos de perfil no app (sem efeito se nenhum modo estiver configurado)."""
+    if not HABILITADO and AMOSTRA <= 0:
+        return app
+
+    @app.before_request
+    def _iniciar_perfil():
+        sob_demanda = HABILITADO and _pedido_de_perfil()
+        amostrada = AMOSTRA > 0 and next(_contador) % AMOSTRA == 0
+        if not (sob_demanda or amostrada):
+            return
+        if not _lock_perfil.acquire(blocking=False):
+            return
+        g.perfil = cProfile.Profile()
+        g.perfil_sob_demanda = sob_demanda
+        g.perfil_amostrado = amostrada
+        g.perfil_inicio = time.perf_counter()
+        g.perfil.enable()
+
+    @app.after_request
+    def _encerrar_perfil(resposta):
+        perfil = g.pop("perfil", None)
+        if perfil is None:
+            return resposta
+        inicio = g.pop("perfil_inicio")
+        sob_demanda = g.pop("perfil_sob_demanda", False)
+        amostrada = g.pop("perfil_amostrado", False)
+        rota = request.url_rule.rule if request.url_rule else request.path
+
+        if resposta.is_streamed:
+            # O gerador do corpo ainda vai rodar: o perfil continua até o servidor fechar a resposta
+            def _encerrar_fluxo():
+                perfil.disable()
+                _lock_perfil.release()
+                _acumular_amostra(rota, perfil)
+
+            resposta.call_on_close(_encerrar_fluxo)
+            return resposta
+
+        perfil.disable()
+        duracao = time.perf_counter() - inicio
+        _lock_perfil.release()
+
+        if amostrada:
+            _acumular_amostra(rota, perfil)
+
+        if sob_demanda:
+            resposta.headers["X-Perfil-Tempo-Ms"] = f"{duracao * 1000:.3f}"
+            corpo = resposta.get_json(silent=True) if resposta.is_json else None
+            if isinstance(corpo, dict):
+                corpo["perfil"] = {
+                    "tempo_total_ms": round(duracao * 1000, 3),
+                    "funcoes": funcoes_mais_custosas(perfil),
+                }
+                resposta.set_data(app.json.dumps(corpo))
+        return resposta
+
+    @app.teardown_request
+    def _liberar_perfil(excecao=None):
+        # Exceção não tratada: after_request pode não ter rodado
+        perfil = g.pop("perfil", None)
+        if perfil is not None:
+            perfil.disable()
+            _lock_perfil.release()
+
+    return app
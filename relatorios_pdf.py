@@ -0,0 +1,633 @@
+# relatorios_pdf.py
+# Relatórios em PDF (PyMuPDF): termo de rescisão (modelo TRCT) e holerite
+#
+# A parte fixa de cada documento (molduras, faixas, rótulos, linhas de
+# assinatura) é desenhada uma única vez por processo e guardada como PDF em
+# bytes; cada documento abre uma cópia desse modelo e só escreve os valores,
+# num único fluxo de conteúdo, com as fontes padrão do PDF (não embutidas).
+#
+# Em lote, os documentos são renderizados em blocos num ProcessPoolExecutor
+# (com no máximo 2 blocos por worker em andamento) e saem, na ordem de
+# entrada, direto para um ZIP escrito em fluxo: cada PDF é entregue ao
+# cliente assim que entra no ZIP, sem guardar o lote inteiro na memória.
+# Registros com erro não interrompem o lote e são listados em erros.json.
+#
+# Linha de comando:
+#   python relatorios_pdf.py gerar holerite folha.csv -o holerites.zip --competencia 2025-06
+#   python relatorios_pdf.py medir -n 2000 -w 1 4      (documentos por segundo)
+
+import os
+import re
+import sys
+import json
+import time
+import zipfile
+import argparse
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from itertools import islice
+
+import fitz  # PyMuPDF
+
+from calculo_rescisao import processar_rescisao_linha
+
+LARGURA_A4, ALTURA_A4 = 595, 842
+MARGEM_ESQ, MARGEM_DIR = 36, 559
+
+COR_LINHA = (0.55, 0.57, 0.65)
+COR_FAIXA = (0.91, 0.92, 0.96)
+COR_ROTULO = (0.35, 0.35, 0.4)
+COR_TEXTO = (0, 0, 0)
+
+TAMANHO_BLOCO_PDF = 50
+LIMIAR_PARALELO_PDF = 200  # abaixo disso os PDFs são gerados no próprio processo
+LINHAS_TABELA = 16
+ALTURA_LINHA = 15
+
+RODAPE = "Documento gerado pelo Calcula DAS. Simulação, sem valor fiscal ou legal."
+
+# Fontes padrão do PDF (não embutidas): cada documento fica com poucos KB
+FONTE_NORMAL, FONTE_NEGRITO = "helv", "hebo"
+
+_MODELOS = {}  # tipo -> bytes do PDF com a parte fixa
+
+
+# ------------------------------------------------------------------------------
+#  FORMATAÇÃO
+# ------------------------------------------------------------------------------
+
+def formatar_moeda(valor):
+    """1234.5 -> '1.234,50'."""
+    return f"{valor:,.2f}".replace(",", "_").replace(".", ",").replace("_", ".")
+
+
+def formatar_data(iso):
+    """'2025-03-20' -> '20/03/2025' (outros formatos voltam como vieram)."""
+    partes = str(iso or "").split("-")
+    return "/".join(reversed(partes)) if len(partes) == 3 else str(iso or "")
+
+
+def formatar_competencia(competencia):
+    """'2025-06' -> '06/2025'."""
+    partes = str(competencia or "").split("-")
+    return f"{partes[1]}/{partes[0]}" if len(partes) >= 2 else str(competencia or "")
+
+
+_AVANCOS = {FONTE_NORMAL: {}, FONTE_NEGRITO: {}}  # fonte -> caractere -> largura (em unidades de 1 pt)
+_METRICAS = {}
+
+
+def _fonte(negrito=False):
+    return FONTE_NEGRITO if negrito else FONTE_NORMAL
+
+
+def largura_texto(texto, tamanho, negrito=False):
+    """Largura do texto em pt, com as larguras de cada caractere guardadas após a primeira consulta."""
+    fonte = _fonte(negrito)
+    avancos = _AVANCOS[fonte]
+    total = 0.0
+    for c in texto:
+        avanco = avancos.get(c)
+        if avanco is None:
+            metrica = _METRICAS.get(fonte)
+            if metrica is None:
+                metrica = _METRICAS[fonte] = fitz.Font(fonte)
+            avanco = avancos[c] = metrica.glyph_advance(ord(c))
+        total += avanco
+    return total * tamanho
+
+
+def _caber(texto, largura, tamanho, negrito=False):
+    """Corta o texto com reticências para caber na largura."""
+    texto = str(texto)
+    if largura_texto(texto, tamanho, negrito) <= largura:
+        return texto
+    while texto and largura_texto(texto + "…", tamanho, negrito) > largura:
+        texto = texto[:-1]
+    return texto + "…"
+
+
+def _string_pdf(texto):
+    """Texto -> string literal do PDF em WinAnsi (cp1252), com os escapes necessários."""
+    dados = texto.encode("cp1252", errors="replace")
+    return "(" + dados.decode("latin-1").replace("\\", "\\\\").replace("(", "\\(").replace(")", "\\)") + ")"
+
+
+class _Escritor:
+    """
+    Acumula os textos da página e grava todos num único fluxo de conteúdo.
+    Usa as fontes padrão do PDF (Helvetica, WinAnsi, sem embutir), registradas
+    no modelo; os operadores de texto são escritos diretamente, o que é bem
+    mais rápido que uma chamada do PyMuPDF por texto.
+    """
+
+    def __init__(self, pagina):
+        self.pagina = pagina
+        self.operadores = []
+
+    def texto(self, x, y, texto, tamanho=9, negrito=False, direita=False, largura=None, cor=COR_TEXTO):
+        if texto is None or texto == "":
+            return
+        texto = str(texto)
+        if largura is not None:
+            texto = _caber(texto, largura, tamanho, negrito)
+        if direita:
+            x -= largura_texto(texto, tamanho, negrito)
+        r, g, b = cor
+        self.operadores.append(
+            f"BT /{_fonte(negrito)} {tamanho:g} Tf {r:g} {g:g} {b:g} rg "
+            f"1 0 0 1 {x:.2f} {ALTURA_A4 - y:.2f} Tm {_string_pdf(texto)} Tj ET"
+        )
+
+    def gravar(self):
+        if not self.operadores:
+            return
+        doc = self.pagina.parent
+        conteudo = ("q\n" + "\n".join(self.operadores) + "\nQ\n").encode("latin-1")
+        xref = doc.get_new_xref()
+        doc.update_object(xref, "<<>>")
+        doc.update_stream(xref, conteudo)
+        fluxos = " ".join(f"{x} 0 R" for x in self.pagina.get_contents())
+        doc.xref_set_key(self.pagina.xref, "Contents", f"[{fluxos} {xref} 0 R]")
+        self.operadores = []
+
+
+# ------------------------------------------------------------------------------
+#  MODELOS (PARTE FIXA, DESENHADA UMA VEZ POR PROCESSO)
+# ------------------------------------------------------------------------------
+
+def _caixa(pagina, x0, y0, x1, y1, preenchimento=None):
+    pagina.draw_rect(fitz.Rect(x0, y0, x1, y1), color=COR_LINHA, fill=preenchimento, width=0.6)
+
+
+def _linha(pagina, x0, y0, x1, y1):
+    pagina.draw_line((x0, y0), (x1, y1), color=COR_LINHA, width=0.6)
+
+
+def _faixa(pagina, escritor, y, titulo):
+    """Faixa cinza com o título de uma seção (14 pt de altura)."""
+    _caixa(pagina, MARGEM_ESQ, y, MARGEM_DIR, y + 14, COR_FAIXA)
+    escritor.texto(MARGEM_ESQ + 8, y + 10, titulo, tamanho=8, negrito=True)
+
+
+def _rotulo(escritor, x, y, texto):
+    escritor.texto(x, y, texto, tamanho=7, cor=COR_ROTULO)
+
+
+def _modelo_holerite(pagina, escritor):
+    # Cabeçalho
+    _caixa(pagina, MARGEM_ESQ, 36, MARGEM_DIR, 96)
+    escritor.texto(44, 58, "RECIBO DE PAGAMENTO DE SALÁRIO", tamanho=12, negrito=True)
+    _rotulo(escritor, 44, 76, "Empresa")
+    _linha(pagina, 430, 36, 430, 96)
+    _rotulo(escritor, 438, 50, "Competência")
+
+    # Funcionário
+    _caixa(pagina, MARGEM_ESQ, 96, MARGEM_DIR, 136)
+    _rotulo(escritor, 44, 106, "Matrícula")
+    _rotulo(escritor, 130, 106, "Funcionário")
+    _rotulo(escritor, 438, 106, "Dependentes IRRF")
+    _linha(pagina, 122, 96, 122, 136)
+    _linha(pagina, 430, 96, 430, 136)
+
+    # Tabela de verbas
+    _caixa(pagina, MARGEM_ESQ, 136, MARGEM_DIR, 156, COR_FAIXA)
+    escritor.texto(44, 149, "Descrição", tamanho=8, negrito=True)
+    escritor.texto(332, 149, "Referência", tamanho=8, negrito=True, direita=True)
+    escritor.texto(442, 149, "Proventos", tamanho=8, negrito=True, direita=True)
+    escritor.texto(551, 149, "Descontos", tamanho=8, negrito=True, direita=True)
+    fim_tabela = 156 + LINHAS_TABELA * ALTURA_LINHA
+    _caixa(pagina, MARGEM_ESQ, 156, MARGEM_DIR, fim_tabela)
+    for x in (340, 450):
+        _linha(pagina, x, 136, x, fim_tabela + 30)
+
+    # Totais e líquido
+    _caixa(pagina, MARGEM_ESQ, fim_tabela, MARGEM_DIR, fim_tabela + 30)
+    _rotulo(escritor, 348, fim_tabela + 10, "Total de Proventos")
+    _rotulo(escritor, 458, fim_tabela + 10, "Total de Descontos")
+    _caixa(pagina, 340, fim_tabela + 30, MARGEM_DIR, fim_tabela + 60, COR_FAIXA)
+    escritor.texto(348, fim_tabela + 49, "Valor Líquido", tamanho=9, negrito=True)
+
+    # Bases
+    y = fim_tabela + 66
+    _caixa(pagina, MARGEM_ESQ, y, MARGEM_DIR, y + 36)
+    largura = (MARGEM_DIR - MARGEM_ESQ) / 5
+    for k, rotulo in enumerate(("Salário Base", "Base Cálc. INSS", "Base Cálc. FGTS", "FGTS do Mês", "Base Cálc. IRRF")):
+        x = MARGEM_ESQ + k * largura
+        if k:
+            _linha(pagina, x, y, x, y + 36)
+        _rotulo(escritor, x + 8, y + 11, rotulo)
+
+    # Declaração e assinatura
+    y += 60
+    escritor.texto(44, y, "Declaro ter recebido a importância líquida discriminada neste recibo.", tamanho=8)
+    _linha(pagina, 60, y + 50, 200, y + 50)
+    _linha(pagina, 260, y + 50, 535, y + 50)
+    _rotulo(escritor, 60, y + 60, "Data")
+    _rotulo(escritor, 260, y + 60, "Assinatura do Funcionário")
+
+
+def _modelo_rescisao(pagina, escritor):
+    _caixa(pagina, MARGEM_ESQ, 36, MARGEM_DIR, 76)
+    escritor.texto(44, 56, "TERMO DE RESCISÃO DO CONTRATO DE TRABALHO", tamanho=12, negrito=True)
+    _rotulo(escritor, 44, 69, "Simulação no modelo do TRCT (não substitui o termo oficial)")
+
+    _faixa(pagina, escritor, 82, "IDENTIFICAÇÃO DO TRABALHADOR")
+    _caixa(pagina, MARGEM_ESQ, 96, MARGEM_DIR, 126)
+    _rotulo(escritor, 44, 105, "Matrícula")
+    _rotulo(escritor, 140, 105, "Nome")
+    _linha(pagina, 132, 96, 132, 126)
+
+    _faixa(pagina, escritor, 132, "DADOS DO CONTRATO")
+    _caixa(pagina, MARGEM_ESQ, 146, MARGEM_DIR, 206)
+    _linha(pagina, MARGEM_ESQ, 176, MARGEM_DIR, 176)
+    for x, rotulo in ((44, "Data de Admissão"), (170, "Data de Afastamento"), (296, "Projeção do Aviso Prévio"),
+                      (422, "Tempo de Serviço")):
+        _rotulo(escritor, x, 155, rotulo)
+    _rotulo(escritor, 44, 185, "Causa do Afastamento")
+    _rotulo(escritor, 422, 185, "Remuneração p/ Fins Rescisórios")
+    for x in (164, 290, 416):
+        _linha(pagina, x, 146, x, 176)
+    _linha(pagina, 416, 176, 416, 206)
+
+    _faixa(pagina, escritor, 212, "DISCRIMINAÇÃO DAS VERBAS RESCISÓRIAS")
+    _caixa(pagina, MARGEM_ESQ, 226, MARGEM_DIR, 242, COR_FAIXA)
+    escritor.texto(44, 237, "Verbas", tamanho=8, negrito=True)
+    escritor.texto(290, 237, "Valor", tamanho=8, negrito=True, direita=True)
+    escritor.texto(306, 237, "Deduções", tamanho=8, negrito=True)
+    escritor.texto(551, 237, "Valor", tamanho=8, negrito=True, direita=True)
+    fim_tabela = 242 + LINHAS_TABELA * ALTURA_LINHA
+    _caixa(pagina, MARGEM_ESQ, 242, MARGEM_DIR, fim_tabela)
+    _linha(pagina, 298, 226, 298, fim_tabela + 30)
+
+    _caixa(pagina, MARGEM_ESQ, fim_tabela, MARGEM_DIR, fim_tabela + 30)
+    _rotulo(escritor, 44, fim_tabela + 10, "Total Bruto")
+    _rotulo(escritor, 306, fim_tabela + 10, "Total de Deduções")
+    _caixa(pagina, MARGEM_ESQ, fim_tabela + 30, MARGEM_DIR, fim_tabela + 55, COR_FAIXA)
+    escritor.texto(44, fim_tabela + 46, "VALOR LÍQUIDO A RECEBER", tamanho=10, negrito=True)
+
+    y = fim_tabela + 61
+    _faixa(pagina, escritor, y, "FGTS")
+    _caixa(pagina, MARGEM_ESQ, y + 14, MARGEM_DIR, y + 54)
+
+    y += 60
+    _faixa(pagina, escritor, y, "OBSERVAÇÕES")
+    _caixa(pagina, MARGEM_ESQ, y + 14, MARGEM_DIR, y + 104)
+
+    _linha(pagina, 60, 740, 270, 740)
+    _linha(pagina, 325, 740, 535, 740)
+    _rotulo(escritor, 60, 750, "Assinatura do Empregador")
+    _rotulo(escritor, 325, 750, "Assinatura do Trabalhador")
+
+
+CONSTRUTORES_MODELO = {"holerite": _modelo_holerite, "rescisao": _modelo_rescisao}
+
+
+def modelo(tipo):
+    """PDF (bytes) com a parte fixa do documento, montado na primeira chamada do processo."""
+    conteudo = _MODELOS.get(tipo)
+    if conteudo is None:
+        doc = fitz.open()
+        pagina = doc.new_page(width=LARGURA_A4, height=ALTURA_A4)
+        pagina.insert_font(fontname=FONTE_NORMAL)
+        pagina.insert_font(fontname=FONTE_NEGRITO)
+        escritor = _Escritor(pagina)
+        CONSTRUTORES_MODELO[tipo](pagina, escritor)
+        escritor.texto(MARGEM_ESQ, 812, RODAPE, tamanho=6, cor=COR_ROTULO)
+        escritor.gravar()
+        conteudo = _MODELOS[tipo] = doc.tobytes(garbage=3, deflate=True)
+        doc.close()
+    return conteudo
+
+
+def _preencher(tipo, desenhar):
+    """Abre uma cópia do modelo, escreve os valores e devolve o PDF em bytes."""
+    doc = fitz.open("pdf", modelo(tipo))
+    escritor = _Escritor(doc[0])
+    desenhar(escritor)
+    escritor.gravar()
+    conteudo = doc.tobytes(deflate=True)
+    doc.close()
+    return conteudo
+
+
+# ------------------------------------------------------------------------------
+#  DOCUMENTOS
+# ------------------------------------------------------------------------------
+
+def _linhas_holerite(holerite):
+    """(descrição, referência, provento, desconto) de cada verba com valor."""
+    linhas = [("Salário Base", "30 dias", holerite["salario_base"], None)]
+    for campo, descricao in (("adicionais", "Adicionais"), ("horas_extras", "Horas Extras"), ("comissoes", "Comissões")):
+        if holerite.get(campo):
+            linhas.append((descricao, "", holerite[campo], None))
+
+    base_inss = holerite.get("base_inss") or 0
+    referencia_inss = f"{formatar_moeda(holerite['inss'] / base_inss * 100)}%" if base_inss else ""
+    linhas.append(("INSS", referencia_inss, None, holerite["inss"]))
+    if holerite.get("irrf"):
+        linhas.append(("IRRF", f"{holerite.get('dependentes', 0)} dep.", None, holerite["irrf"]))
+    for campo, descricao, referencia in (
+        ("pensao", "Pensão Alimentícia", ""),
+        ("vale_transporte", "Vale-Transporte", "6%"),
+        ("adiantamento", "Adiantamento", ""),
+        ("outros_descontos", "Outros Descontos", ""),
+    ):
+        if holerite.get(campo):
+            linhas.append((descricao, referencia, None, holerite[campo]))
+    return linhas
+
+
+def gerar_pdf_holerite(holerite, competencia="", empresa=""):
+    """PDF do holerite de um funcionário (um item de calcular_holerites()["resultados"])."""
+
+    def desenhar(e):
+        e.texto(44, 88, empresa, tamanho=10, largura=380)
+        e.texto(438, 66, formatar_competencia(competencia), tamanho=12, negrito=True)
+        e.texto(44, 126, holerite.get("matricula", ""), tamanho=10, largura=74)
+        e.texto(130, 126, holerite.get("nome", ""), tamanho=10, negrito=True, largura=292)
+        e.texto(438, 126, holerite.get("dependentes", 0), tamanho=10)
+
+        y = 156 + 11
+        for descricao, referencia, provento, desconto in _linhas_holerite(holerite)[:LINHAS_TABELA]:
+            e.texto(44, y, descricao, largura=200)
+            e.texto(332, y, referencia, direita=True)
+            if provento is not None:
+                e.texto(442, y, formatar_moeda(provento), direita=True)
+            if desconto is not None:
+                e.texto(551, y, formatar_moeda(desconto), direita=True)
+            y += ALTURA_LINHA
+
+        fim_tabela = 156 + LINHAS_TABELA * ALTURA_LINHA
+        e.texto(442, fim_tabela + 24, formatar_moeda(holerite["total_proventos"]), tamanho=10, direita=True)
+        e.texto(551, fim_tabela + 24, formatar_moeda(holerite["total_descontos"]), tamanho=10, direita=True)
+        e.texto(551, fim_tabela + 49, formatar_moeda(holerite["liquido"]), tamanho=11, negrito=True, direita=True)
+
+        y = fim_tabela + 66 + 28
+        largura = (MARGEM_DIR - MARGEM_ESQ) / 5
+        bases = (holerite["salario_base"], holerite["base_inss"], holerite["total_proventos"], holerite["fgts"],
+                 holerite["base_irrf"])
+        for k, valor in enumerate(bases):
+            e.texto(MARGEM_ESQ + (k + 1) * largura - 8, y, formatar_moeda(valor), direita=True)
+
+    return _preencher("holerite", desenhar)
+
+
+def gerar_pdf_rescisao(resultado, identificacao=None):
+    """PDF no modelo TRCT de um resultado de processar_rescisao (matrícula e nome opcionais)."""
+    identificacao = identificacao or resultado
+    entrada = resultado["dados_entrada"]
+    totais = resultado["totais"]
+    causa = (resultado.get("resumo") or [""])[0].replace("Motivo: ", "").rstrip(".")
+
+    def desenhar(e):
+        e.texto(44, 119, identificacao.get("matricula", ""), tamanho=10, largura=84)
+        e.texto(140, 119, identificacao.get("nome", ""), tamanho=10, negrito=True, largura=410)
+
+        e.texto(44, 169, formatar_data(entrada["data_admissao"]), tamanho=10)
+        e.texto(170, 169, formatar_data(entrada["data_demissao"]), tamanho=10)
+        e.texto(296, 169, formatar_data(entrada["data_projecao_aviso"]), tamanho=10)
+        anos = entrada.get("tempo_servico_anos", 0)
+        e.texto(422, 169, f"{anos} ano{'s' if anos != 1 else ''} ({entrada['dias_aviso_direito']} dias de aviso)",
+                tamanho=9, largura=130)
+        e.texto(44, 199, causa, tamanho=9, largura=366)
+        e.texto(422, 199, formatar_moeda(entrada["remuneracao_total"]), tamanho=10)
+
+        y = 242 + 11
+        for descricao, valor in list(resultado["proventos"].items())[:LINHAS_TABELA]:
+            e.texto(44, y, descricao, largura=190)
+            e.texto(290, y, formatar_moeda(valor), direita=True)
+            y += ALTURA_LINHA
+        y = 242 + 11
+        for descricao, valor in list(resultado["descontos"].items())[:LINHAS_TABELA]:
+            e.texto(306, y, descricao, largura=185)
+            e.texto(551, y, formatar_moeda(valor), direita=True)
+            y += ALTURA_LINHA
+
+        fim_tabela = 242 + LINHAS_TABELA * ALTURA_LINHA
+        e.texto(290, fim_tabela + 24, formatar_moeda(totais["total_proventos"]), tamanho=10, direita=True)
+        e.texto(551, fim_tabela + 24, formatar_moeda(totais["total_descontos"]), tamanho=10, direita=True)
+        e.texto(551, fim_tabela + 47, formatar_moeda(totais["total_liquido"]), tamanho=12, negrito=True, direita=True)
+
+        y = fim_tabela + 61 + 14
+        largura = (MARGEM_DIR - MARGEM_ESQ) / 3
+        for k, (descricao, valor) in enumerate(list(resultado["fgts"].items())[:3]):
+            x = MARGEM_ESQ + 8 + k * largura
+            _rotulo(e, x, y + 11, descricao)
+            e.texto(x, y + 30, formatar_moeda(valor) if isinstance(valor, (int, float)) else valor,
+                    tamanho=10, largura=largura - 16)
+
+        y += 60 + 11
+        observacoes = resultado.get("observacoes", {})
+        for linha in (resultado.get("resumo") or [])[1:]:
+            e.texto(44, y, linha, tamanho=8, largura=507)
+            y += 12
+        e.texto(44, y, f"Tabela IRRF: {observacoes.get('tabela_irrf_utilizada', '')}"
+                       f"  |  Base INSS: {formatar_moeda(observacoes.get('base_inss', 0))}"
+                       f"  |  Base IRRF: {formatar_moeda(observacoes.get('base_irrf', 0))}", tamanho=8, largura=507)
+
+    return _preencher("rescisao", desenhar)
+
+
+# ------------------------------------------------------------------------------
+#  LOTE: PROCESSOS + ZIP EM FLUXO
+# ------------------------------------------------------------------------------
+
+def nome_arquivo(tipo, registro, linha):
+    """Nome do PDF no ZIP: tipo, número da linha (garante unicidade) e matrícula/nome."""
+    rotulo = registro.get("matricula")
+    if rotulo is None or rotulo == "":
+        rotulo = registro.get("nome") or ""
+    rotulo = re.sub(r"[^\w-]+", "_", str(rotulo)).strip("_")[:40]
+    return f"{tipo}_{linha:05d}{'_' + rotulo if rotulo else ''}.pdf"
+
+
+def _pdf_rescisao(dados, linha, contexto):
+    resultado = processar_rescisao_linha(dados)
+    nome = nome_arquivo("rescisao", resultado, linha)
+    if "erro" in resultado:
+        return nome, None, resultado["erro"]
+    return nome, gerar_pdf_rescisao(resultado), None
+
+
+def _pdf_holerite(holerite, linha, contexto):
+    nome = nome_arquivo("holerite", holerite, linha)
+    if "erro" in holerite:
+        return nome, None, holerite["erro"]
+    return nome, gerar_pdf_holerite(holerite, **contexto), None
+
+
+RENDERIZADORES = {"rescisao": _pdf_rescisao, "holerite": _pdf_holerite}
+
+
+def _renderizar_bloco(tipo, primeira_linha, bloco, contexto):
+    renderizar = RENDERIZADORES[tipo]
+    saida = []
+    for linha, item in enumerate(bloco, start=primeira_linha):
+        try:
+            saida.append(renderizar(item, linha, contexto))
+        except Exception as e:
+            saida.append((nome_arquivo(tipo, item if isinstance(item, dict) else {}, linha), None, str(e)))
+    return saida
+
+
+def workers_para_pdfs(quantidade, workers=None):
+    """Quantidade de processos: a informada, ou automática pelo tamanho do lote."""
+    if workers:
+        return max(1, int(workers))
+    return (os.cpu_count() or 1) if quantidade >= LIMIAR_PARALELO_PDF else 1
+
+
+def iterar_pdfs(tipo, itens, workers=1, contexto=None, tamanho_bloco=TAMANHO_BLOCO_PDF):
+    """
+    Gera (nome_arquivo, pdf_bytes, erro) de cada item, na ordem de entrada.
+    tipo "rescisao": itens são os JSON de entrada de processar_rescisao (calculados nos workers).
+    tipo "holerite": itens são os resultados de calcular_holerites; contexto traz competencia/empresa.
+    """
+    contexto = contexto or {}
+    iterador = iter(itens)
+    blocos = iter(lambda: list(islice(iterador, tamanho_bloco)), [])
+
+    if workers <= 1:
+        linha = 1
+        for bloco in blocos:
+            yield from _renderizar_bloco(tipo, linha, bloco, contexto)
+            linha += len(bloco)
+        return
+
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        pendentes = deque()
+        linha = 1
+        for bloco in blocos:
+            pendentes.append(executor.submit(_renderizar_bloco, tipo, linha, bloco, contexto))
+            linha += len(bloco)
+            if len(pendentes) >= workers * 2:
+                yield from pendentes.popleft().result()
+        while pendentes:
+            yield from pendentes.popleft().result()
+
+
+class _SaidaZip:
+    """Destino só de escrita para o ZipFile: guarda os bytes até serem retirados."""
+
+    def __init__(self):
+        self._partes = []
+
+    def write(self, dados):
+        self._partes.append(bytes(dados))
+        return len(dados)
+
+    def flush(self):
+        pass
+
+    def retirar(self):
+        dados = b"".join(self._partes)
+        self._partes.clear()
+        return dados
+
+
+def gerar_zip(pdfs):
+    """
+    Recebe (nome, pdf, erro) e gera os bytes de um ZIP à medida que cada PDF entra.
+    Os PDFs já vêm comprimidos, então entram sem nova compressão (ZIP_STORED).
+    """
+    saida = _SaidaZip()
+    erros = []
+    with zipfile.ZipFile(saida, "w", compression=zipfile.ZIP_STORED) as arquivo_zip:
+        for nome, pdf, erro in pdfs:
+            if erro is not None:
+                erros.append({"arquivo": nome, "erro": erro})
+                continue
+            arquivo_zip.writestr(nome, pdf)
+            yield saida.retirar()
+        if erros:
+            arquivo_zip.writestr("erros.json", json.dumps(erros, ensure_ascii=False, indent=2))
+    yield saida.retirar()
+
+
+# ------------------------------------------------------------------------------
+#  MEDIÇÃO (DOCUMENTOS POR SEGUNDO)
+# ------------------------------------------------------------------------------
+
+def _documentos_exemplo(tipo, quantidade):
+    if tipo == "holerite":
+        from calculo_holerite import calcular_holerites
+        funcionarios = [
+            {"matricula": i, "nome": f"Funcionário {i}", "salario_base": 1518.0 + (i * 137) % 15000,
+             "horas_extras": (i * 31) % 900, "dependentes": i % 4, "vale_transporte": 220.0}
+            for i in range(quantidade)
+        ]
+        return calcular_holerites(funcionarios, "2025-06")["resultados"], {"competencia": "2025-06",
+                                                                          "empresa": "Empresa Exemplo Ltda"}
+    return [
+        {"matricula": i, "nome": f"Funcionário {i}", "motivo": 1 + i % 7, "salario_base": 1518.0 + (i * 137) % 15000,
+         "data_admissao": f"{2010 + i % 14}-03-10", "data_demissao": "2025-06-18", "data_prevista_fim": "2025-08-30",
+         "dependentes": i % 3, "saldo_fgts": 18500.0, "aviso_indenizado": True}
+        for i in range(quantidade)
+    ], {}
+
+
+def medir_documentos_por_segundo(tipo, quantidade, workers):
+    """Gera o ZIP completo (descartando os bytes) e devolve documentos/s e o tamanho total."""
+    itens, contexto = _documentos_exemplo(tipo, quantidade)
+    inicio = time.perf_counter()
+    tamanho = sum(len(parte) for parte in gerar_zip(iterar_pdfs(tipo, itens, workers, contexto)))
+    duracao = time.perf_counter() - inicio
+    return {"tipo": tipo, "documentos": quantidade, "workers": workers, "segundos": round(duracao, 3),
+            "documentos_por_segundo": round(quantidade / duracao, 1), "bytes_zip": tamanho}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="PDFs de rescisão e holerite em lote")
+    sub = parser.add_subparsers(dest="comando", required=True)
+
+    p_medir = sub.add_parser("medir", help="Documentos por segundo (ZIP completo, descartado)")
+    p_medir.add_argument("--tipo", choices=sorted(RENDERIZADORES), nargs="+", default=sorted(RENDERIZADORES))
+    p_medir.add_argument("--quantidade", "-n", type=int, default=1000)
+    p_medir.add_argument("--workers", "-w", type=int, nargs="+", default=sorted({1, workers_para_pdfs(LIMIAR_PARALELO_PDF)}))
+    p_medir.add_argument("--json", action="store_true", help="Saída em JSON")
+
+    p_gerar = sub.add_parser("gerar", help="Gera o ZIP a partir de um arquivo JSON/CSV")
+    p_gerar.add_argument("tipo", choices=sorted(RENDERIZADORES))
+    p_gerar.add_argument("arquivo", help=".csv (com cabeçalho) ou .json com a lista de funcionários")
+    p_gerar.add_argument("--saida", "-o", required=True, help="Arquivo .zip de saída")
+    p_gerar.add_argument("--competencia", "-c", help="Mês da folha (holerite), AAAA-MM")
+    p_gerar.add_argument("--empresa", default="", help="Nome da empresa (holerite)")
+    p_gerar.add_argument("--workers", "-w", type=int)
+    args = parser.parse_args()
+
+    if args.comando == "medir":
+        medicoes = [medir_documentos_por_segundo(t, args.quantidade, w) for t in args.tipo for w in args.workers]
+        if args.json:
+            print(json.dumps(medicoes, ensure_ascii=False, indent=2))
+        else:
+            for m in medicoes:
+                print(f"{m['tipo']:<10} {m['documentos']:>6} docs  workers={m['workers']:<3} "
+                      f"{m['segundos']:8.2f} s  {m['documentos_por_segundo']:10.1f} docs/s  "
+                      f"{m['bytes_zip'] / 1e6:8.2f} MB")
+        return 0
+
+    from calculo_rescisao import ler_funcionarios_csv
+    with open(args.arquivo, encoding="utf-8-sig") as f:
+        if args.arquivo.lower().endswith(".csv"):
+            funcionarios = list(ler_funcionarios_csv(f))
+        else:
+            dados = json.load(f)
+            funcionarios = dados.get("funcionarios") if isinstance(dados, dict) else dados
+
+    contexto = {}
+    if args.tipo == "holerite":
+        from calculo_holerite import calcular_holerites
+        folha = calcular_holerites(funcionarios, args.competencia)
+        funcionarios = folha["resultados"]
+        contexto = {"competencia": folha["competencia"], "empresa": args.empresa}
+
+    workers = workers_para_pdfs(len(funcionarios), args.workers)
+    with open(args.saida, "wb") as f:
+        for parte in gerar_zip(iterar_pdfs(args.tipo, funcionarios, workers, contexto)):
+            f.write(parte)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
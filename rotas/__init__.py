@@ -0,0 +1,22 @@
+# rotas/__init__.py
+# Blueprints do app, um por simulador
+#
+# Os módulos de cálculo (e o NumPy que eles usam) não são importados aqui:
+# cada handler importa o que precisa na primeira requisição, então o app
+# sobe só com o Flask carregado.
+
+from rotas.paginas import paginas
+from rotas.das import das
+from rotas.lucro_presumido import lucro_presumido
+from rotas.valor_bruto import valor_bruto
+from rotas.rescisao import rescisao
+from rotas.holerite import holerite
+from rotas.jobs import jobs
+
+BLUEPRINTS = (paginas, das, lucro_presumido, valor_bruto, rescisao, holerite, jobs)
+
+
+def registrar_blueprints(app):
+    for blueprint in BLUEPRINTS:
+        app.register_blueprint(blueprint)
+    return app
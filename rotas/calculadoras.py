@@ -0,0 +1,62 @@
+# rotas/calculadoras.py
+# Acesso preguiçoso às calculadoras com cache
+#
+# Cada função importa o módulo de cálculo na primeira chamada e devolve a
+# função já envolvida pelo cache (tamanho/TTL via CALCULA_CACHE_TAMANHO e
+# CALCULA_CACHE_TTL). As chamadas seguintes devolvem o mesmo objeto.
+
+from functools import lru_cache
+
+from cache_calculos import em_cache
+
+
+@lru_cache(maxsize=None)
+def das():
+    import calculo_das
+    return em_cache(
+        "das",
+        normalizar=calculo_das.extrair_entrada,
+        # O cálculo lê só a tabela compilada (alíquotas, deduções e repartição já embutidas)
+        tabelas=lambda: (calculo_das.TABELA_SIMPLES,),
+    )(calculo_das.calcular_simples_nacional_from_input)
+
+
+@lru_cache(maxsize=None)
+def darf_pro_labore():
+    import calcular_darf_pro_labore as darf
+    return em_cache(
+        "darf_pro_labore",
+        tabelas=lambda: (darf.TABELA_IRPF_COMPILADA, darf.TABELA_INSS_PRO_LABORE,
+                         darf.PISO_PRO_LABORE, darf.PERCENTUAL_FATOR_R),
+    )(darf.calcular_darf_pro_labore)
+
+
+@lru_cache(maxsize=None)
+def lucro_presumido():
+    import simulador_lp as lp
+    return em_cache(
+        "lucro_presumido",
+        tabelas=lambda: (lp.ALIQUOTA_PIS, lp.ALIQUOTA_COFINS, lp.PRESUNCAO_IRPJ_CSLL, lp.ALIQUOTA_CSLL,
+                         lp.ALIQUOTA_IRPJ, lp.ALIQUOTA_IRPJ_ADICIONAL, lp.DEDUCAO_IRPJ_ADICIONAL),
+    )(lp.calcula_imposto)
+
+
+@lru_cache(maxsize=None)
+def valor_bruto():
+    import centavos
+    from valor_bruto import calcular_valor_bruto_from_input
+    # Sem tabelas próprias: o resultado só depende da entrada e da regra de arredondamento
+    return em_cache(
+        "valor_bruto",
+        tabelas=lambda: (centavos.CASAS_RUIDO, centavos.MARGEM_RUIDO),
+    )(calcular_valor_bruto_from_input)
+
+
+@lru_cache(maxsize=None)
+def rescisao():
+    import calculo_rescisao
+    return em_cache(
+        "rescisao",
+        tabelas=lambda: (calculo_rescisao.TABELA_INSS_2025, calculo_rescisao.TABELA_IRRF_JAN_ABR_2025_COMPILADA,
+                         calculo_rescisao.TABELA_IRRF_MAI_2025_COMPILADA, calculo_rescisao.DEDUCAO_DEPENDENTE_2025),
+    )(calculo_rescisao.processar_rescisao)
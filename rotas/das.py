@@ -0,0 +1,162 @@
+# rotas/das.py
+# Simples Nacional: DAS, DARF do pró-labore e ferramentas do Fator-R
+
+from flask import Blueprint, request, jsonify
+
+from metricas import registrar_excecao
+from fluxo_ndjson import (
+    TAMANHO_BLOCO_NDJSON, entrada_ndjson, saida_ndjson, ler_linhas_ndjson, linha_json, resposta_ndjson,
+)
+from rotas import calculadoras
+
+das = Blueprint("das", __name__)
+
+
+@das.route("/calcular_das", methods=["POST"])
+def calcular_das():
+    try:
+        data = request.get_json(force=True)
+        resultado = calculadoras.das()(data)
+        return jsonify(resultado)
+    except Exception as e:
+        registrar_excecao(e)
+        print("❌ Erro no cálculo:", e)
+        return jsonify({"erro": str(e)}), 400
+
+
+@das.route("/calcular_das_darf", methods=["POST"])
+def calcular_das_darf():
+    """
+    DAS e DARF do pró-labore numa única requisição (a página do simulador
+    fazia duas chamadas em sequência). A entrada é lida uma vez e o mesmo
+    faturamento alimenta os dois cálculos. O DARF só é calculado quando há
+    o cálculo alternativo pelo Fator-R (Anexo V); caso contrário vem null.
+    Um erro só do DARF vem em darf.erro, sem perder o DAS.
+    """
+    from calculo_das import TITULO_CALCULO_ALTERNATIVO, extrair_entrada
+
+    try:
+        data = request.get_json(force=True)
+        _, _, faturamento, _, _ = extrair_entrada(data)
+        resultado_das = calculadoras.das()(data)
+        tem_fator_r = TITULO_CALCULO_ALTERNATIVO in resultado_das
+        darf = None
+        if tem_fator_r:
+            try:
+                darf = calculadoras.darf_pro_labore()({"faturamento": faturamento})
+            except ValueError as e:
+                darf = {"erro": str(e)}
+        return jsonify({"das": resultado_das, "darf": darf})
+    except Exception as e:
+        registrar_excecao(e)
+        print("❌ Erro no cálculo DAS + DARF:", e)
+        return jsonify({"erro": str(e)}), 400
+
+
+@das.route("/calcular_das_lote", methods=["POST"])
+def calcular_das_lote():
+    """
+    Lista de registros em JSON, ou NDJSON em fluxo (Content-Type application/x-ndjson).
+    Com ?formato=ndjson (ou entrada NDJSON) a resposta é NDJSON, bloco a bloco,
+    terminando com {"resumo": {"total", "erros"}}; ?workers=N distribui os blocos em processos.
+    """
+    from calculo_das import calcular_simples_nacional_lote
+
+    try:
+        if entrada_ndjson():
+            registros = ler_linhas_ndjson(request.stream)
+        else:
+            data = request.get_json(force=True)
+            registros = data.get("registros") if isinstance(data, dict) else data
+            if not isinstance(registros, list):
+                raise ValueError("Envie uma lista de registros (ou um objeto com a chave 'registros').")
+
+        if saida_ndjson():
+            return resposta_ndjson(_das_lote_ndjson(registros, request.args.get("workers", 1, type=int)))
+
+        resultados = calcular_simples_nacional_lote(registros)
+        erros = sum(1 for r in resultados if "erro" in r)
+        return jsonify({"total": len(resultados), "erros": erros, "resultados": resultados})
+    except Exception as e:
+        registrar_excecao(e)
+        print("❌ Erro no cálculo em lote:", e)
+        return jsonify({"erro": str(e)}), 400
+
+
+def _das_lote_ndjson(registros, workers):
+    """Blocos de linhas NDJSON (o mesmo processamento em blocos do lote via CLI) e a linha de resumo."""
+    from calculo_das import agrupar_em_blocos, processar_em_paralelo
+
+    total = erros = 0
+    blocos = agrupar_em_blocos(registros, TAMANHO_BLOCO_NDJSON)
+    for texto, quantidade, erros_bloco in processar_em_paralelo(blocos, "jsonl", max(workers, 1)):
+        total += quantidade
+        erros += erros_bloco
+        yield texto
+    yield linha_json({"resumo": {"total": total, "erros": erros}})
+
+
+@das.route("/calcular_das_historico", methods=["POST"])
+def calcular_das_historico_api():
+    from historico_rbt12 import calcular_das_historico
+
+    try:
+        data = request.get_json(force=True)
+        resultado = calcular_das_historico(data)
+        return jsonify(resultado)
+    except Exception as e:
+        registrar_excecao(e)
+        print("❌ Erro no cálculo do histórico:", e)
+        return jsonify({"erro": str(e)}), 400
+
+
+@das.route("/calcular_darf_pro_labore", methods=["POST"])
+def calcular_darf():
+    try:
+        data = request.get_json(force=True)
+        print("\n📦 JSON recebido para DARF:", data)
+        resultado = calculadoras.darf_pro_labore()(data)
+        return jsonify(resultado)
+    except Exception as e:
+        registrar_excecao(e)
+        print("❌ Erro no cálculo DARF:", e)
+        return jsonify({"erro": str(e)}), 400
+    
+@das.route("/otimizar_fator_r", methods=["POST"])
+def otimizar_fator_r():
+    from otimizador_fator_r import otimizar_pro_labore
+
+    try:
+        data = request.get_json(force=True)
+        resultado = otimizar_pro_labore(data)
+        return jsonify(resultado)
+    except Exception as e:
+        registrar_excecao(e)
+        print("❌ Erro na otimização do Fator-R:", e)
+        return jsonify({"erro": str(e)}), 400
+
+@das.route("/comparar_regimes", methods=["POST"])
+def comparar_regimes_api():
+    from comparador_regimes import comparar_regimes
+
+    try:
+        data = request.get_json(force=True)
+        resultado = comparar_regimes(data)
+        return jsonify(resultado)
+    except Exception as e:
+        registrar_excecao(e)
+        print("❌ Erro na comparação de regimes:", e)
+        return jsonify({"erro": str(e)}), 400
+
+@das.route("/pro_labore_por_liquido", methods=["POST"])
+def pro_labore_por_liquido_api():
+    from inverso_liquido import pro_labore_por_liquido_from_input
+
+    try:
+        data = request.get_json(force=True)
+        resultado = pro_labore_por_liquido_from_input(data)
+        return jsonify(resultado)
+    except Exception as e:
+        registrar_excecao(e)
+        print("❌ Erro no cálculo do pró-labore pelo líquido:", e)
+        return jsonify({"erro": str(e)}), 400
@@ -0,0 +1,80 @@
+# rotas/holerite.py
+# Folha de pagamento: holerites de uma lista de funcionários (JSON ou CSV)
+
+import io
+
+from flask import Blueprint, Response, request, jsonify, stream_with_context
+
+from metricas import registrar_excecao
+
+holerite = Blueprint("holerite", __name__)
+
+
+def _ler_folha():
+    """
+    Funcionários, competência e empresa da requisição: JSON ({"competencia",
+    "empresa", "funcionarios": [...]}) ou CSV no campo de arquivo 'arquivo'
+    (competência e empresa nos campos do formulário).
+    """
+    from calculo_rescisao import ler_funcionarios_csv
+
+    arquivo = request.files.get("arquivo")
+    if arquivo:
+        funcionarios = list(ler_funcionarios_csv(io.TextIOWrapper(arquivo.stream, encoding="utf-8-sig")))
+        opcoes = request.form
+    else:
+        data = request.get_json(force=True)
+        funcionarios = data.get("funcionarios") if isinstance(data, dict) else data
+        opcoes = data if isinstance(data, dict) else {}
+        if not isinstance(funcionarios, list):
+            raise ValueError("Envie uma lista de funcionários (ou um objeto com a chave 'funcionarios').")
+    competencia = opcoes.get("competencia") or request.args.get("competencia")
+    return funcionarios, competencia, opcoes.get("empresa") or ""
+
+
+@holerite.route("/calcular_holerite_lote", methods=["POST"])
+def calcular_holerite_lote():
+    """Holerites da folha em JSON, ou CSV com ?formato=csv."""
+    from calculo_holerite import calcular_holerites, holerites_para_csv
+
+    try:
+        funcionarios, competencia, _ = _ler_folha()
+        resultado = calcular_holerites(funcionarios, competencia)
+        if request.args.get("formato") == "csv":
+            return Response(
+                holerites_para_csv(resultado),
+                mimetype="text/csv",
+                headers={"Content-Disposition": f"attachment; filename=holerites_{resultado['competencia']}.csv"},
+            )
+        return jsonify(resultado)
+    except Exception as e:
+        registrar_excecao(e)
+        print("❌ Erro no cálculo dos holerites:", e)
+        return jsonify({"erro": str(e)}), 400
+
+
+@holerite.route("/gerar_pdf_holerite_lote", methods=["POST"])
+def gerar_pdf_holerite_lote():
+    """
+    Holerites da folha em PDF, num ZIP enviado em fluxo à medida que os
+    documentos ficam prontos (mesma entrada de /calcular_holerite_lote).
+    """
+    from calculo_holerite import calcular_holerites
+    from relatorios_pdf import gerar_zip, iterar_pdfs, workers_para_pdfs
+
+    try:
+        funcionarios, competencia, empresa = _ler_folha()
+        folha = calcular_holerites(funcionarios, competencia)
+        holerites = folha["resultados"]
+        workers = workers_para_pdfs(len(holerites), request.args.get("workers", type=int))
+    except Exception as e:
+        registrar_excecao(e)
+        print("❌ Erro na geração dos holerites em PDF:", e)
+        return jsonify({"erro": str(e)}), 400
+
+    contexto = {"competencia": folha["competencia"], "empresa": empresa}
+    return Response(
+        stream_with_context(gerar_zip(iterar_pdfs("holerite", holerites, workers, contexto))),
+        mimetype="application/zip",
+        headers={"Content-Disposition": f"attachment; filename=holerites_{folha['competencia']}.zip"},
+    )
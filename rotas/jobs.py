@@ -0,0 +1,124 @@
+# rotas/jobs.py
+# Jobs em segundo plano: envio de lotes longos, acompanhamento e download (fila_jobs.py)
+
+import io
+
+from flask import Blueprint, request, jsonify, url_for
+
+from metricas import registrar_excecao
+from fluxo_ndjson import entrada_ndjson, ler_linhas_ndjson, linha_json, agrupar_envios, resposta_ndjson
+
+jobs = Blueprint("jobs", __name__)
+
+
+@jobs.before_request
+def _despachante_jobs():
+    """Sobe o despachante deste processo no primeiro acesso (retoma também os jobs interrompidos)."""
+    from fila_jobs import garantir_despachante
+
+    garantir_despachante()
+
+
+def _links(job_id):
+    return {
+        "status": url_for("jobs.status_job", job_id=job_id),
+        "resultados": url_for("jobs.resultados_job", job_id=job_id),
+    }
+
+
+def _ler_registros():
+    """
+    Tipo do job e registros da requisição: corpo NDJSON (gravado em fluxo),
+    CSV no campo de arquivo 'arquivo' (rescisão) ou JSON com a lista em
+    "registros" ou "funcionarios". O tipo vem de ?tipo= ou da chave "tipo".
+    """
+    from calculo_rescisao import ler_funcionarios_csv
+
+    tipo = request.args.get("tipo") or request.form.get("tipo")
+    if entrada_ndjson():
+        return tipo, ler_linhas_ndjson(request.stream)
+    arquivo = request.files.get("arquivo")
+    if arquivo:
+        return tipo, ler_funcionarios_csv(io.TextIOWrapper(arquivo.stream, encoding="utf-8-sig"))
+    data = request.get_json(force=True)
+    registros = data
+    if isinstance(data, dict):
+        tipo = tipo or data.get("tipo")
+        registros = data.get("registros", data.get("funcionarios"))
+    if not isinstance(registros, list):
+        raise ValueError("Envie uma lista de registros (ou um objeto com a chave 'registros' ou 'funcionarios').")
+    return tipo, registros
+
+
+@jobs.route("/jobs", methods=["POST"])
+def criar_job():
+    """
+    Enfileira um lote (?tipo=das ou ?tipo=rescisao) e responde 202 na hora,
+    com o id e os links de status e resultados.
+    """
+    from fila_jobs import criar_job, consultar_job
+
+    try:
+        tipo, registros = _ler_registros()
+        job_id = criar_job(tipo, registros)
+        job = consultar_job(job_id)
+        return jsonify({"id": job_id, "status": job["status"], "total": job["total"], "links": _links(job_id)}), 202
+    except Exception as e:
+        registrar_excecao(e)
+        print("❌ Erro ao criar o job:", e)
+        return jsonify({"erro": str(e)}), 400
+
+
+@jobs.route("/jobs", methods=["GET"])
+def listar_jobs():
+    from fila_jobs import listar_jobs
+
+    return jsonify({"jobs": listar_jobs(request.args.get("limite", 50, type=int))})
+
+
+@jobs.route("/jobs/<job_id>", methods=["GET"])
+def status_job(job_id):
+    """Situação, progresso e resumo do job."""
+    from fila_jobs import consultar_job
+
+    job = consultar_job(job_id)
+    if job is None:
+        return jsonify({"erro": "Job não encontrado."}), 404
+    return jsonify({**job, "links": _links(job_id)})
+
+
+@jobs.route("/jobs/<job_id>/resultados", methods=["GET"])
+def resultados_job(job_id):
+    """
+    Resultados em NDJSON, lidos do SQLite em páginas, terminando com
+    {"resumo": {...}}. Antes do fim devolve só as linhas já calculadas
+    (o resumo traz o status); com ?parcial=0 responde 409 até concluir.
+    """
+    from fila_jobs import CONCLUIDO, consultar_job, iterar_resultados
+
+    job = consultar_job(job_id)
+    if job is None:
+        return jsonify({"erro": "Job não encontrado."}), 404
+    if job["status"] != CONCLUIDO and request.args.get("parcial") == "0":
+        return jsonify({"erro": "Job ainda não concluído.", "status": job["status"]}), 409
+
+    def gerar():
+        yield from agrupar_envios(linha + "\n" for linha in iterar_resultados(job_id))
+        yield linha_json({"resumo": {"status": job["status"], "total": job["total"],
+                                     "processados": job["processados"], "erros": job["erros"], **job["resumo"]}})
+
+    resposta = resposta_ndjson(gerar())
+    resposta.headers["Content-Disposition"] = f"attachment; filename=job_{job_id}.ndjson"
+    return resposta
+
+
+@jobs.route("/jobs/<job_id>", methods=["DELETE"])
+def cancelar_job(job_id):
+    """Cancela o job (o bloco em andamento é descartado); os resultados já gravados continuam disponíveis."""
+    from fila_jobs import cancelar_job, consultar_job
+
+    if consultar_job(job_id) is None:
+        return jsonify({"erro": "Job não encontrado."}), 404
+    if not cancelar_job(job_id):
+        return jsonify({"erro": "Job já encerrado.", **consultar_job(job_id)}), 409
+    return jsonify(consultar_job(job_id))
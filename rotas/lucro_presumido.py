@@ -0,0 +1,41 @@
+# rotas/lucro_presumido.py
+# Lucro Presumido: impostos por NFS-e e lote mensal de notas
+
+from flask import Blueprint, request, jsonify
+
+from metricas import registrar_excecao
+from rotas import calculadoras
+
+lucro_presumido = Blueprint("lucro_presumido", __name__)
+
+
+@lucro_presumido.route("/calcular_lp", methods=["POST"])
+def calcular_lp():
+    try:
+        data = request.get_json(force=True)
+        print("\n📦 JSON recebido para LP:", data)
+
+        valor_nfse = float(data.get("valor_nfse", 0))
+        faturamento_mensal = float(data.get("faturamento_mensal", 0))
+        natureza_exportacao = int(data.get("natureza_exportacao", 1))
+        aliquota_iss = float(data.get("aliquota_iss_percentual", 0))
+
+        resultado = calculadoras.lucro_presumido()(valor_nfse, faturamento_mensal, natureza_exportacao, aliquota_iss)
+        return jsonify(resultado)
+    except Exception as e:
+        registrar_excecao(e)
+        print("❌ Erro no cálculo LP:", e)
+        return jsonify({"erro": str(e)}), 400
+
+@lucro_presumido.route("/calcular_lp_lote", methods=["POST"])
+def calcular_lp_lote():
+    from simulador_lp import calcula_imposto_lote_from_input
+
+    try:
+        data = request.get_json(force=True)
+        resultado = calcula_imposto_lote_from_input(data)
+        return jsonify(resultado)
+    except Exception as e:
+        registrar_excecao(e)
+        print("❌ Erro no cálculo LP em lote:", e)
+        return jsonify({"erro": str(e)}), 400
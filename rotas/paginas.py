@@ -0,0 +1,34 @@
+# rotas/paginas.py
+# Páginas dos simuladores (pré-renderizadas na subida, ver estaticos.py)
+
+from flask import Blueprint
+
+from estaticos import pagina
+
+paginas = Blueprint("paginas", __name__)
+
+
+@paginas.route("/")
+def index():
+    return pagina("index.html")
+
+@paginas.route("/simulador_das")
+def simulador_das():
+    return pagina("simulador_das.html")
+
+@paginas.route("/simulador_lp")
+def simulador_lp():
+    return pagina("simulador_lp.html")
+
+@paginas.route("/simulador_rescisao")
+def simulador_rescisao():
+    return pagina("simulador_rescisao.html")
+
+@paginas.route("/simulador_nfse")
+def simulador_nfse():
+    return pagina("simulador_nfse.html")
+
+
+@paginas.route("/simulador_holerite")
+def simulador_holerite():
+    return pagina("simulador_holerite.html")
@@ -0,0 +1,143 @@
+# rotas/rescisao.py
+# Rescisão de contrato: cálculo individual, inverso pelo líquido e lote
+
+import io
+import json
+
+from flask import Blueprint, Response, request, jsonify, stream_with_context
+
+from metricas import registrar_excecao
+from fluxo_ndjson import entrada_ndjson, saida_ndjson, ler_linhas_ndjson, linha_json, agrupar_envios, resposta_ndjson
+from rotas import calculadoras
+
+rescisao = Blueprint("rescisao", __name__)
+
+
+@rescisao.route('/calcular_rescisao', methods=['POST'])
+def api_calcular_rescisao():
+    data = request.get_json()
+    
+    try:
+        # Chama a função do arquivo calculo_rescisao.py
+        # Ela já devolve o dicionário pronto (resumo, proventos, descontos, totais)
+        resultado = calculadoras.rescisao()(data)
+        
+        # Retorna como JSON para o JavaScript do navegador
+        return jsonify(resultado)
+        
+    except Exception as e:
+        registrar_excecao(e)
+        # Se der erro (ex: data inválida), devolve mensagem de erro
+        return jsonify({"erro": f"Erro no servidor: {str(e)}"}), 400
+
+@rescisao.route('/rescisao_por_liquido', methods=['POST'])
+def api_rescisao_por_liquido():
+    from inverso_liquido import salario_por_liquido_rescisao_from_input
+
+    data = request.get_json()
+
+    try:
+        resultado = salario_por_liquido_rescisao_from_input(data)
+        return jsonify(resultado)
+    except Exception as e:
+        registrar_excecao(e)
+        return jsonify({"erro": f"Erro no servidor: {str(e)}"}), 400
+
+def _ler_funcionarios():
+    """
+    Funcionários do corpo JSON, do CSV no campo de arquivo 'arquivo', ou do corpo
+    NDJSON (gerador lido em fluxo; as linhas são decodificadas no cálculo).
+    """
+    from calculo_rescisao import ler_funcionarios_csv
+
+    if entrada_ndjson():
+        return ler_linhas_ndjson(request.stream)
+    arquivo = request.files.get("arquivo")
+    if arquivo:
+        return list(ler_funcionarios_csv(io.TextIOWrapper(arquivo.stream, encoding="utf-8-sig")))
+    data = request.get_json(force=True)
+    funcionarios = data.get("funcionarios") if isinstance(data, dict) else data
+    if not isinstance(funcionarios, list):
+        raise ValueError("Envie uma lista de funcionários (ou um objeto com a chave 'funcionarios').")
+    return funcionarios
+
+
+@rescisao.route('/calcular_rescisao_lote', methods=['POST'])
+def api_calcular_rescisao_lote():
+    """
+    Recebe uma lista de funcionários (JSON, CSV no campo de arquivo 'arquivo' ou
+    NDJSON em fluxo) e devolve os resultados à medida que são calculados,
+    seguidos dos totais do lote. Com ?formato=ndjson (ou entrada NDJSON) a
+    saída é uma linha por funcionário e uma última linha {"resumo": {...}}.
+    """
+    from calculo_rescisao import (
+        LIMIAR_PARALELO, iterar_rescisoes, novo_totalizador, acumular_totais, arredondar_totais, workers_para_lote,
+    )
+
+    try:
+        funcionarios = _ler_funcionarios()
+        # Entrada em fluxo: o tamanho só é conhecido no fim, então o padrão é o lote grande
+        quantidade = len(funcionarios) if isinstance(funcionarios, list) else LIMIAR_PARALELO
+        workers = workers_para_lote(quantidade, request.args.get("workers", type=int))
+    except Exception as e:
+        registrar_excecao(e)
+        return jsonify({"erro": f"Erro no servidor: {str(e)}"}), 400
+
+    if saida_ndjson():
+        def linhas():
+            totais = novo_totalizador()
+            for i, resultado in enumerate(iterar_rescisoes(funcionarios, workers)):
+                acumular_totais(totais, resultado)
+                yield linha_json({"linha": i + 1, **resultado})
+            yield linha_json({"resumo": arredondar_totais(totais)})
+
+        return resposta_ndjson(agrupar_envios(linhas()))
+
+    def gerar():
+        totais = novo_totalizador()
+        yield '{"resultados": ['
+        for i, resultado in enumerate(iterar_rescisoes(funcionarios, workers)):
+            acumular_totais(totais, resultado)
+            yield ("," if i else "") + json.dumps({"linha": i + 1, **resultado}, ensure_ascii=False)
+        yield '], "totais": ' + json.dumps(arredondar_totais(totais), ensure_ascii=False) + "}"
+
+    return Response(stream_with_context(gerar()), mimetype="application/json")
+
+@rescisao.route('/gerar_pdf_rescisao', methods=['POST'])
+def api_gerar_pdf_rescisao():
+    """Termo de rescisão (modelo TRCT) em PDF, com a mesma entrada de /calcular_rescisao."""
+    from relatorios_pdf import gerar_pdf_rescisao
+
+    try:
+        data = request.get_json(force=True)
+        resultado = calculadoras.rescisao()(data)
+        return Response(
+            gerar_pdf_rescisao(resultado, data),
+            mimetype="application/pdf",
+            headers={"Content-Disposition": "attachment; filename=rescisao.pdf"},
+        )
+    except Exception as e:
+        registrar_excecao(e)
+        return jsonify({"erro": f"Erro no servidor: {str(e)}"}), 400
+
+@rescisao.route('/gerar_pdf_rescisao_lote', methods=['POST'])
+def api_gerar_pdf_rescisao_lote():
+    """
+    PDFs de rescisão de uma lista de funcionários (JSON ou CSV), num ZIP enviado
+    em fluxo à medida que os documentos ficam prontos. Registros com erro vão para erros.json.
+    """
+    from relatorios_pdf import LIMIAR_PARALELO_PDF, gerar_zip, iterar_pdfs, workers_para_pdfs
+
+    try:
+        funcionarios = _ler_funcionarios()
+        quantidade = len(funcionarios) if isinstance(funcionarios, list) else LIMIAR_PARALELO_PDF
+        workers = workers_para_pdfs(quantidade, request.args.get("workers", type=int))
+    except Exception as e:
+        registrar_excecao(e)
+        return jsonify({"erro": f"Erro no servidor: {str(e)}"}), 400
+
+    return Response(
+        stream_with_context(gerar_zip(iterar_pdfs("rescisao", funcionarios, workers))),
+        mimetype="application/zip",
+        headers={"Content-Disposition": "attachment; filename=rescisoes.zip"},
+    )
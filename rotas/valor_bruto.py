@@ -0,0 +1,37 @@
+# rotas/valor_bruto.py
+# Valor bruto a cobrar a partir do líquido desejado
+
+from flask import Blueprint, request, jsonify
+
+from metricas import registrar_excecao
+from rotas import calculadoras
+
+valor_bruto = Blueprint("valor_bruto", __name__)
+
+
+@valor_bruto.route("/calcular_valor_bruto", methods=["POST"])
+def calcular_valor_bruto_api():
+    try:
+        data = request.get_json(force=True)
+        print("\n📦 JSON recebido (Valor Bruto):", data)
+
+        resultado = calculadoras.valor_bruto()(data)
+        return jsonify(resultado)
+
+    except Exception as e:
+        registrar_excecao(e)
+        print("❌ Erro no cálculo de Valor Bruto:", e)
+        return jsonify({"erro": str(e)}), 400
+
+@valor_bruto.route("/calcular_valor_bruto_grade", methods=["POST"])
+def calcular_valor_bruto_grade_api():
+    from valor_bruto import calcular_valor_bruto_grade_from_input
+
+    try:
+        data = request.get_json(force=True)
+        resultado = calcular_valor_bruto_grade_from_input(data)
+        return jsonify(resultado)
+    except Exception as e:
+        registrar_excecao(e)
+        print("❌ Erro no cálculo da grade de Valor Bruto:", e)
+        return jsonify({"erro": str(e)}), 400
@@ -1,5 +1,19 @@
 # simulador_lp.py
 # Simulador de Lucro Presumido - Cálculo de Impostos proporcionais à NFS-e
+import numpy as np
+
+from centavos import arredondar, para_reais, ratear_array
+
+# Alíquotas e presunção do Lucro Presumido (serviços), usadas por todos os cálculos
+ALIQUOTA_PIS = 0.0065
+ALIQUOTA_COFINS = 0.03
+PRESUNCAO_IRPJ_CSLL = 0.32
+ALIQUOTA_CSLL = 0.09
+ALIQUOTA_IRPJ = 0.15
+ALIQUOTA_IRPJ_ADICIONAL = 0.10
+DEDUCAO_IRPJ_ADICIONAL = 20000  # IRPJ adicional sobre o que exceder R$ 20.000/mês
+
+
 def calcula_imposto(valor_nfse, faturamento_mensal, natureza_exportacao, aliquota_iss_percentual):
     """
     valor_nfse: valor da nota emitida
@@ -8,9 +22,6 @@ def calcula_imposto(valor_nfse, faturamento_mensal, natureza_exportacao, aliquot
     aliquota_iss_percentual: valor entre 2 e 5 (%)
     """
 
-    # Aliquotas fixas do Lucro Presumido (PIS e COFINS)
-    aliquota_pis = 0.0065
-    aliquota_cofins = 0.03
     aliquota_iss = aliquota_iss_percentual / 100
 
     # Isenções em caso de exportação
@@ -19,22 +30,21 @@ def calcula_imposto(valor_nfse, faturamento_mensal, natureza_exportacao, aliquot
         cofins_valor = 0.0
         iss_valor = 0.0
     else:
-        pis_valor = valor_nfse * aliquota_pis
-        cofins_valor = valor_nfse * aliquota_cofins
+        pis_valor = valor_nfse * ALIQUOTA_PIS
+        cofins_valor = valor_nfse * ALIQUOTA_COFINS
         iss_valor = valor_nfse * aliquota_iss
 
     # Base de cálculo presumida IRPJ/CSLL (32% do faturamento)
-    base_irpj_csll = faturamento_mensal * 0.32
+    base_irpj_csll = faturamento_mensal * PRESUNCAO_IRPJ_CSLL
 
     # Totais mensais sobre a base presumida
-    csll_mensal_total = base_irpj_csll * 0.09
-    irpj_mensal_total = base_irpj_csll * 0.15
+    csll_mensal_total = base_irpj_csll * ALIQUOTA_CSLL
+    irpj_mensal_total = base_irpj_csll * ALIQUOTA_IRPJ
 
     # IRPJ adicional (10% sobre o que exceder R$ 20.000/mês)
-    deducao_irpj_adicional = 20000
-    if base_irpj_csll > deducao_irpj_adicional:
-        base_irpj_adicional = base_irpj_csll - deducao_irpj_adicional
-        irpj_adicional_mensal_total = base_irpj_adicional * 0.10
+    if base_irpj_csll > DEDUCAO_IRPJ_ADICIONAL:
+        base_irpj_adicional = base_irpj_csll - DEDUCAO_IRPJ_ADICIONAL
+        irpj_adicional_mensal_total = base_irpj_adicional * ALIQUOTA_IRPJ_ADICIONAL
     else:
         irpj_adicional_mensal_total = 0.0
 
@@ -78,6 +88,108 @@ def calcula_imposto(valor_nfse, faturamento_mensal, natureza_exportacao, aliquot
     return resultado
 
 
+# ==============================
+# Lote mensal de notas
+# ==============================
+
+def calcula_imposto_lote(notas, faturamento_mensal=None):
+    """
+    Impostos do mês para uma lista de NFS-e, numa única passada.
+    notas: lista de dicts com
+      - valor_nfse
+      - natureza_exportacao: 1 = operação normal | 2 = exportação de serviços (padrão 1)
+      - aliquota_iss_percentual: valor entre 2 e 5 (%) (ignorado na exportação)
+      - numero: identificação da nota (opcional)
+    faturamento_mensal: faturamento total do mês; se omitido, a soma das notas.
+
+    A base presumida e o IRPJ adicional são calculados uma vez sobre o mês.
+    CSLL/IRPJ/IRPJ adicional são arredondados no total e rateados entre as notas
+    em centavos (maiores restos, ver centavos.py); PIS/COFINS/ISS são arredondados por nota.
+    Assim os totais consolidados batem exatamente com a soma das notas.
+    """
+    try:
+        valores = np.array([float(n.get("valor_nfse", 0)) for n in notas], dtype=float)
+        exportacao = np.array([int(n.get("natureza_exportacao", 1)) == 2 for n in notas], dtype=bool)
+        aliquotas_iss = np.array([float(n.get("aliquota_iss_percentual", 0)) for n in notas], dtype=float) / 100
+    except (AttributeError, TypeError, ValueError) as e:
+        raise ValueError(f"Erro nos dados das notas: {e}")
+    if not len(valores):
+        raise ValueError("Informe ao menos uma nota.")
+    # Uma nota negativa ficaria com PIS/COFINS/ISS negativos e uma cota negativa do rateio
+    invalidas = ~(np.isfinite(valores) & (valores > 0))
+    if invalidas.any():
+        i = int(np.argmax(invalidas))
+        raise ValueError(f"Nota {notas[i].get('numero', i + 1)}: valor_nfse deve ser um número finito maior que zero.")
+    if not np.isfinite(aliquotas_iss).all():
+        raise ValueError("A alíquota de ISS das notas deve ser um número finito.")
+
+    soma_notas = float(valores.sum())
+    if faturamento_mensal is None:
+        faturamento_mensal = soma_notas
+    if not np.isfinite(faturamento_mensal):
+        raise ValueError("O faturamento mensal deve ser um número finito.")
+    if faturamento_mensal < soma_notas:
+        raise ValueError("O faturamento mensal não pode ser menor que a soma das notas.")
+
+    # Base presumida e IRPJ adicional do mês, uma única vez
+    base_irpj_csll = faturamento_mensal * PRESUNCAO_IRPJ_CSLL
+    base_irpj_adicional = max(base_irpj_csll - DEDUCAO_IRPJ_ADICIONAL, 0.0)
+    mensais = {
+        "csll": base_irpj_csll * ALIQUOTA_CSLL,
+        "irpj": base_irpj_csll * ALIQUOTA_IRPJ,
+        "irpj_adicional": base_irpj_adicional * ALIQUOTA_IRPJ_ADICIONAL,
+    }
+    participacao = soma_notas / faturamento_mensal if faturamento_mensal > 0 else 0.0
+
+    centavos = {
+        "pis": np.where(exportacao, 0, arredondar(valores * ALIQUOTA_PIS)),
+        "cofins": np.where(exportacao, 0, arredondar(valores * ALIQUOTA_COFINS)),
+        "iss": np.where(exportacao, 0, arredondar(valores * aliquotas_iss)),
+    }
+    for tributo, total_mensal in mensais.items():
+        centavos[tributo] = ratear_array(arredondar(total_mensal * participacao), valores)
+
+    tributos = ("pis", "cofins", "iss", "csll", "irpj", "irpj_adicional")
+    total_centavos = sum(centavos[t] for t in tributos)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        aliquota_efetiva = np.where(valores > 0, total_centavos / valores, 0.0)
+
+    colunas = {t: para_reais(centavos[t]).tolist() for t in tributos}
+    totais_nota = para_reais(total_centavos).tolist()
+    aliquotas_nota = aliquota_efetiva.tolist()
+
+    resultado_notas = []
+    for i, nota in enumerate(notas):
+        linha = {"numero": nota.get("numero", i + 1), "valor_nfse": valores[i].item()}
+        for t in tributos:
+            linha[t] = colunas[t][i]
+        linha["total_tributos"] = totais_nota[i]
+        linha["aliquota_efetiva_percent"] = round(aliquotas_nota[i], 4)
+        resultado_notas.append(linha)
+
+    consolidado = {t: para_reais(int(centavos[t].sum())) for t in tributos}
+    consolidado["total_tributos"] = para_reais(int(total_centavos.sum()))
+    return {
+        "faturamento_mensal": round(faturamento_mensal, 2),
+        "soma_notas": round(soma_notas, 2),
+        "base_irpj_csll": round(base_irpj_csll, 2),
+        "base_irpj_adicional": round(base_irpj_adicional, 2),
+        "notas": resultado_notas,
+        "totais": consolidado,
+    }
+
+
+def calcula_imposto_lote_from_input(dados_json):
+    """Recebe {"notas": [...], "faturamento_mensal": opcional} (ou a lista de notas diretamente)."""
+    if isinstance(dados_json, list):
+        dados_json = {"notas": dados_json}
+    notas = dados_json.get("notas")
+    if not isinstance(notas, list):
+        raise ValueError("Envie a lista de notas (ou um objeto com a chave 'notas').")
+    faturamento = dados_json.get("faturamento_mensal")
+    return calcula_imposto_lote(notas, float(faturamento) if faturamento not in (None, "") else None)
+
+
 # ==============================
 # Execução direta via terminal
 # ==============================
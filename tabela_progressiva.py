@@ -0,0 +1,109 @@
+# tabela_progressiva.py
+# Motor comum para tabelas progressivas (INSS) e tabelas com parcela a deduzir (IRRF/IRPF)
+#
+# Cada faixa é reduzida a três números: limite inferior, alíquota e valor
+# acumulado até o início da faixa. O imposto de qualquer base é então
+#     (base - inferior) * aliquota + acumulado
+# depois de localizar a faixa com um bisect — sem percorrer a tabela.
+# Como o imposto é linear dentro de cada faixa, o inverso (achar a base cujo
+# valor líquido base - imposto é um alvo) também é fechado, faixa a faixa.
+
+from bisect import bisect_left
+
+import numpy as np
+
+
+class TabelaProgressiva:
+    """
+    Tabela de faixas pré-compilada. Use os construtores:
+      - por_faixas: alíquota aplicada só sobre a parcela de cada faixa (INSS progressivo)
+      - por_deducao: base x alíquota - parcela a deduzir (tabelas do IRRF/IRPF)
+    Os limites são superiores e inclusivos (base <= limite cai na faixa).
+    """
+    __slots__ = ("limites", "inferiores", "aliquotas", "acumulados", "teto", "_arrays", "_liquidos_nos_limites")
+
+    def __init__(self, limites, inferiores, aliquotas, acumulados, teto=None):
+        self.limites = tuple(limites)
+        self.inferiores = tuple(inferiores)
+        self.aliquotas = tuple(aliquotas)
+        self.acumulados = tuple(acumulados)
+        self.teto = teto
+        self._arrays = (
+            np.array(self.limites, dtype=float),
+            np.array(self.inferiores, dtype=float),
+            np.array(self.aliquotas, dtype=float),
+            np.array(self.acumulados, dtype=float),
+        )
+        # Valor líquido (base - imposto) em cada limite finito, até o teto: pontos de quebra do inverso
+        limites_finitos = [l for l in self.limites if l != float("inf") and (teto is None or l <= teto)]
+        self._liquidos_nos_limites = np.array([l - self.calcular(l) for l in limites_finitos], dtype=float)
+
+    @classmethod
+    def por_faixas(cls, faixas, teto=None):
+        """faixas: lista de (limite, aliquota); o acumulado soma as faixas anteriores completas."""
+        limites, inferiores, aliquotas, acumulados = [], [], [], []
+        inferior = 0
+        acumulado = 0.0
+        for limite, aliquota in faixas:
+            limites.append(limite)
+            inferiores.append(inferior)
+            aliquotas.append(aliquota)
+            acumulados.append(acumulado)
+            acumulado += (limite - inferior) * aliquota
+            inferior = limite
+        return cls(limites, inferiores, aliquotas, acumulados, teto)
+
+    @classmethod
+    def por_deducao(cls, tabela, teto=None):
+        """tabela: lista de (limite, aliquota, parcela_a_deduzir)."""
+        return cls(
+            [limite for limite, _, _ in tabela],
+            [0] * len(tabela),
+            [aliquota for _, aliquota, _ in tabela],
+            [-deducao for _, _, deducao in tabela],
+            teto,
+        )
+
+    def faixa(self, base):
+        """Índice (0-based) da faixa da base; acima do último limite, a última faixa."""
+        return min(bisect_left(self.limites, base), len(self.limites) - 1)
+
+    def calcular(self, base):
+        """Imposto (sem arredondamento) de uma base; nunca negativo."""
+        if self.teto is not None and base > self.teto:
+            base = self.teto
+        i = self.faixa(base)
+        valor = (base - self.inferiores[i]) * self.aliquotas[i] + self.acumulados[i]
+        return valor if valor > 0 else 0.0
+
+    def calcular_array(self, bases):
+        """Imposto (sem arredondamento) de um array de bases, numa única passada."""
+        limites, inferiores, aliquotas, acumulados = self._arrays
+        bases = np.asarray(bases, dtype=float)
+        if self.teto is not None:
+            bases = np.minimum(bases, self.teto)
+        i = np.minimum(np.searchsorted(limites, bases, side="left"), len(limites) - 1)
+        return np.maximum((bases - inferiores[i]) * aliquotas[i] + acumulados[i], 0.0)
+
+    def inverter_liquido_array(self, liquidos):
+        """
+        Inverso de base - imposto(base): para cada valor líquido devolve a base que o produz.
+        A faixa é localizada pelos líquidos nos limites e a base sai em forma fechada:
+            base = (liquido - inferior * aliquota + acumulado) / (1 - aliquota)
+        Acima do teto o imposto é fixo, então base = liquido + imposto(teto).
+        """
+        _, inferiores, aliquotas, acumulados = self._arrays
+        liquidos = np.asarray(liquidos, dtype=float)
+
+        i = np.searchsorted(self._liquidos_nos_limites, liquidos, side="left")
+        faixa = np.minimum(i, len(aliquotas) - 1)
+        bases = (liquidos - inferiores[faixa] * aliquotas[faixa] + acumulados[faixa]) / (1 - aliquotas[faixa])
+
+        if self.teto is not None:
+            bases = np.where(i >= len(self._liquidos_nos_limites), liquidos + self.calcular(self.teto), bases)
+        # Bases negativas não pagam imposto: o líquido é a própria base
+        return np.where(liquidos < 0, liquidos, bases)
+
+    def inverter_liquido(self, liquido):
+        """Versão escalar de inverter_liquido_array."""
+        return float(self.inverter_liquido_array([liquido])[0])
@@ -0,0 +1,110 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Relatório do tempo de importação (partida a frio) do app.
+
+Roda `python -X importtime -c "import app"` num processo novo, lê o
+relatório do interpretador e mostra os módulos mais custosos (tempo próprio
+e acumulado). Com um orçamento definido, o comando sai com código 1 quando
+o tempo total de importação do módulo passa do limite — próprio para CI.
+
+Uso:
+    python tempo_importacao.py [--modulo app] [--top 25] [--orcamento-ms 400] [--repeticoes 3] [--json]
+
+O orçamento padrão vem de CALCULA_ORCAMENTO_IMPORTACAO_MS (sem ele, só o relatório).
+Com --repeticoes > 1 vale a menor medição (menos sensível a ruído da máquina).
+"""
+
+import os
+import sys
+import json
+import argparse
+import subprocess
+
+ORCAMENTO_PADRAO = os.environ.get("CALCULA_ORCAMENTO_IMPORTACAO_MS")
+
+
+def medir_importacao(modulo="app"):
+    """
+    Importa o módulo num interpretador novo com -X importtime.
+    Retorna a lista de (modulo, proprio_us, acumulado_us, nivel) na ordem do relatório.
+    """
+    processo = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {modulo}"],
+        cwd=os.path.dirname(os.path.abspath(__file__)),
+        capture_output=True,
+        text=True,
+    )
+    if processo.returncode != 0:
+        raise RuntimeError(f"Falha ao importar '{modulo}':\n{processo.stderr}")
+
+    registros = []
+    for linha in processo.stderr.splitlines():
+        if not linha.startswith("import time:") or "self [us]" in linha:
+            continue
+        proprio, acumulado, nome = linha[len("import time:"):].split("|", 2)
+        nivel = (len(nome) - len(nome.lstrip())) // 2
+        registros.append((nome.strip(), int(proprio), int(acumulado), nivel))
+    return registros
+
+
+def resumir(registros, modulo, top):
+    """Total do módulo pedido e os módulos de maior tempo acumulado e próprio."""
+    total_us = next((acumulado for nome, _, acumulado, _ in registros if nome == modulo), 0)
+    # Pacotes de primeiro nível (ex.: numpy, flask) e seu custo acumulado
+    pacotes = {}
+    for nome, _, acumulado, _ in registros:
+        raiz = nome.split(".")[0]
+        if nome == raiz:
+            pacotes[raiz] = max(pacotes.get(raiz, 0), acumulado)
+
+    return {
+        "modulo": modulo,
+        "total_ms": round(total_us / 1000, 2),
+        "modulos_importados": len(registros),
+        "pacotes": [
+            {"pacote": nome, "acumulado_ms": round(us / 1000, 2)}
+            for nome, us in sorted(pacotes.items(), key=lambda item: item[1], reverse=True)[:top]
+        ],
+        "mais_lentos": [
+            {"modulo": nome, "proprio_ms": round(proprio / 1000, 2), "acumulado_ms": round(acumulado / 1000, 2)}
+            for nome, proprio, acumulado, _ in sorted(registros, key=lambda r: r[1], reverse=True)[:top]
+        ],
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Tempo de importação do app (partida a frio)")
+    parser.add_argument("--modulo", "-m", default="app", help="Módulo a importar (padrão: app)")
+    parser.add_argument("--top", "-t", type=int, default=25, help="Quantidade de módulos no relatório")
+    parser.add_argument("--orcamento-ms", type=float, default=float(ORCAMENTO_PADRAO) if ORCAMENTO_PADRAO else None,
+                        help="Tempo máximo de importação, em ms (sai com código 1 se ultrapassar)")
+    parser.add_argument("--repeticoes", "-n", type=int, default=3, help="Medições (vale a menor)")
+    parser.add_argument("--json", action="store_true", help="Saída em JSON")
+    args = parser.parse_args()
+
+    resumos = [resumir(medir_importacao(args.modulo), args.modulo, args.top) for _ in range(max(args.repeticoes, 1))]
+    resumo = min(resumos, key=lambda r: r["total_ms"])
+    resumo["orcamento_ms"] = args.orcamento_ms
+    resumo["dentro_do_orcamento"] = args.orcamento_ms is None or resumo["total_ms"] <= args.orcamento_ms
+
+    if args.json:
+        print(json.dumps(resumo, ensure_ascii=False, indent=2))
+    else:
+        print(f"Importação de '{args.modulo}': {resumo['total_ms']:.2f} ms "
+              f"({resumo['modulos_importados']} módulos, menor de {len(resumos)} medições)")
+        print("\nPacotes (acumulado):")
+        for item in resumo["pacotes"]:
+            print(f"  {item['pacote']:<40} {item['acumulado_ms']:10.2f} ms")
+        print("\nMódulos mais lentos (tempo próprio / acumulado):")
+        for item in resumo["mais_lentos"]:
+            print(f"  {item['modulo']:<40} {item['proprio_ms']:10.2f} ms {item['acumulado_ms']:10.2f} ms")
+        if args.orcamento_ms is not None:
+            situacao = "dentro do" if resumo["dentro_do_orcamento"] else "ACIMA DO"
+            print(f"\n{situacao} orçamento de {args.orcamento_ms:.0f} ms")
+
+    return 0 if resumo["dentro_do_orcamento"] else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
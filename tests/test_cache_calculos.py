@@ -0,0 +1,97 @@
+# tests/test_cache_calculos.py
+# Invalidação do cache por alteração de tabela e resultados somente leitura
+
+import copy
+import json
+
+import pytest
+
+import calculo_das
+import simulador_lp
+from cache_calculos import ResultadoCongelado, em_cache
+from rotas import calculadoras
+from tabela_progressiva import TabelaProgressiva
+
+FAIXAS = [[100.0, 0.1], [float("inf"), 0.2]]
+
+
+def _calculadora(nome, tabelas, chamadas, intervalo=0.0):
+    @em_cache(nome, tabelas=lambda: tabelas)
+    def calcular(base):
+        chamadas.append(base)
+        return {"base": base, "imposto": base * tabelas[0][0][1], "faixas": [list(f) for f in tabelas[0]]}
+    calcular.cache._intervalo = intervalo
+    return calcular
+
+
+def test_alteracao_no_proprio_objeto_invalida():
+    faixas = [list(f) for f in FAIXAS]
+    chamadas = []
+    calcular = _calculadora("teste_lista", (faixas,), chamadas)
+
+    assert calcular(50.0)["imposto"] == pytest.approx(5.0)
+    assert calcular(50.0)["imposto"] == pytest.approx(5.0)
+    assert chamadas == [50.0]
+
+    faixas[0][1] = 0.075  # faixa editada no lugar, mesmo objeto
+    assert calcular(50.0)["imposto"] == pytest.approx(3.75)
+    assert chamadas == [50.0, 50.0]
+    assert calcular.cache.estatisticas()["invalidacoes"] == 1
+
+
+def test_alteracao_de_tabela_compilada_invalida():
+    tabela = TabelaProgressiva.por_faixas(FAIXAS)
+    chamadas = []
+
+    @em_cache("teste_progressiva", tabelas=lambda: (tabela,))
+    def calcular(base):
+        chamadas.append(base)
+        return {"imposto": tabela.calcular(base)}
+    calcular.cache._intervalo = 0.0
+
+    calcular(150.0)
+    calcular(150.0)
+    tabela.aliquotas = (0.1, 0.3)
+    calcular(150.0)
+    assert chamadas == [150.0, 150.0]
+
+
+def test_resultado_somente_leitura():
+    calcular = _calculadora("teste_congelado", ([list(f) for f in FAIXAS],), [])
+    resultado = calcular(10.0)
+
+    assert isinstance(resultado, ResultadoCongelado) and isinstance(resultado["faixas"], tuple)
+    with pytest.raises(TypeError):
+        resultado["imposto"] = 0
+    with pytest.raises(TypeError):
+        resultado.update(base=1)
+    assert calcular(10.0) is resultado and resultado["imposto"] == pytest.approx(1.0)
+
+    # Continua serializável e copiável
+    assert json.loads(json.dumps(resultado))["imposto"] == pytest.approx(1.0)
+    copia = dict(copy.deepcopy(resultado))
+    copia["imposto"] = 0
+    assert resultado["imposto"] == pytest.approx(1.0)
+
+
+def test_lucro_presumido_acompanha_as_aliquotas(monkeypatch):
+    calcular = calculadoras.lucro_presumido()
+    entrada = (10000.0, 10000.0, 1, 2.0)
+    antes = calcular(*entrada)
+
+    monkeypatch.setattr(simulador_lp, "ALIQUOTA_CSLL", simulador_lp.ALIQUOTA_CSLL * 2)
+    depois = calcular(*entrada)
+    assert depois != antes
+    assert depois == simulador_lp.calcula_imposto(*entrada)
+
+
+def test_das_acompanha_a_tabela_compilada(monkeypatch):
+    calcular = calculadoras.das()
+    entrada = {"anexo": 1, "rbt": 100000, "faturamento": 10000, "exportacao_servico": 0}
+    valor = calcular(entrada)["Cálculo Padrão"]["valor_das_a_pagar"]
+
+    dados = copy.deepcopy(calculo_das.DADOS_DOS_ANEXOS)
+    dados[1]["aliquotas"][0] *= 2
+    monkeypatch.setattr(calculo_das, "TABELA_SIMPLES", calculo_das.TabelaSimplesCompilada(
+        dados, calculo_das.LIMITES_DAS_FAIXAS, calculo_das.reparticao_simples_nacional))
+    assert calcular(entrada)["Cálculo Padrão"]["valor_das_a_pagar"] == pytest.approx(valor * 2)
@@ -0,0 +1,57 @@
+# tests/test_calculo_das.py
+# O lote vetorizado deve dar, registro a registro, o mesmo que o cálculo individual
+
+import random
+
+import pytest
+
+from calculo_das import LIMITES_DAS_FAIXAS, calcular_simples_nacional_from_input, calcular_simples_nacional_lote
+
+SEMENTE = 2025
+QUANTIDADE = 20000
+
+
+def _individual(registro):
+    try:
+        return calcular_simples_nacional_from_input(registro)
+    except (ValueError, TypeError, OverflowError) as e:
+        return {"erro": str(e)}
+
+
+def _corpus():
+    sorteio = random.Random(SEMENTE)
+    limites = [0.0] + list(LIMITES_DAS_FAIXAS)
+    registros = []
+    for _ in range(QUANTIDADE):
+        if sorteio.random() < 0.2:
+            # Em cima (ou a um centavo) dos limites das faixas, inclusive acima do teto
+            rbt = round(sorteio.choice(limites) + sorteio.choice((-0.01, 0, 0.01)), 2)
+        else:
+            rbt = round(sorteio.uniform(0, 5_000_000), 2)
+        registros.append({
+            "anexo": sorteio.randint(1, 5),
+            "rbt": max(rbt, 0.0),
+            "faturamento": sorteio.choice((0, round(sorteio.uniform(0, 500_000), 2), round(sorteio.uniform(0, 1000), 3))),
+            "exportacao_servico": sorteio.randint(0, 1),
+        })
+    return registros
+
+
+def test_lote_igual_ao_calculo_individual():
+    registros = _corpus()
+    for registro, saida in zip(registros, calcular_simples_nacional_lote(registros)):
+        assert saida == _individual(registro), registro
+
+
+@pytest.mark.parametrize("campo, valor", [
+    ("faturamento", float("nan")),
+    ("faturamento", float("inf")),
+    ("rbt", float("-inf")),
+    ("rbt", "nan"),
+])
+def test_valor_nao_finito_vira_erro_nos_dois_caminhos(campo, valor):
+    registro = {"anexo": 3, "rbt": 180000, "faturamento": 15000, "exportacao_servico": 0, campo: valor}
+    lote = calcular_simples_nacional_lote([registro, {**registro, campo: 1000}])
+    assert "erro" in lote[0]
+    assert lote[0] == _individual(registro)
+    assert "erro" not in lote[1]
@@ -0,0 +1,30 @@
+# tests/test_calculo_holerite.py
+# Registros inválidos da folha voltam como {"erro"} na própria linha, sem afetar os demais
+
+import warnings
+
+import pytest
+
+from calculo_holerite import calcular_holerites
+
+
+@pytest.mark.parametrize("campo, valor", [
+    ("salario_base", "nan"),
+    ("salario_base", float("inf")),
+    ("horas_extras", "inf"),
+    ("pensao", float("nan")),
+    ("vale_transporte", "-inf"),
+    ("dependentes", "inf"),
+])
+def test_valor_nao_finito_vira_erro_da_linha(campo, valor):
+    folha = [{"matricula": 1, "salario_base": 3000.0}, {"matricula": 2, "salario_base": 3000.0, campo: valor}]
+
+    with warnings.catch_warnings():
+        warnings.simplefilter("error")  # nenhum RuntimeWarning do NumPy
+        resultado = calcular_holerites(folha, "2025-06")
+
+    valido, invalido = resultado["resultados"]
+    assert "erro" not in valido and valido["liquido"] > 0
+    assert invalido["linha"] == 2 and invalido["matricula"] == 2 and "erro" in invalido
+    assert resultado["totais"]["funcionarios"] == 1 and resultado["totais"]["erros"] == 1
+    assert resultado["totais"]["liquido"] == valido["liquido"]
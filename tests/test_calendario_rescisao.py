@@ -0,0 +1,151 @@
+# tests/test_calendario_rescisao.py
+# Meses do 13º e avos de férias: as fórmulas fechadas (escalares e vetorizadas)
+# comparadas com os laços mês a mês originais, sobre um corpus aleatório fixo
+
+import random
+import datetime
+from calendar import monthrange
+
+import numpy as np
+import pytest
+
+from calculo_rescisao import (
+    calcular_avos_ferias, calcular_avos_ferias_array, calcular_meses_trabalhados, calcular_meses_trabalhados_array,
+)
+
+SEMENTE = 2025
+QUANTIDADE = 20000
+
+
+# ------------------------------------------------------------------------------
+#  REFERÊNCIA: implementações originais, mês a mês
+# ------------------------------------------------------------------------------
+
+def meses_trabalhados_referencia(inicio, fim):
+    meses = 0
+    curr = inicio
+
+    while curr <= fim:
+        ultimo_dia = monthrange(curr.year, curr.month)[1]
+
+        if curr.month == inicio.month and curr.year == inicio.year:
+            ini_c = curr.day
+        else:
+            ini_c = 1
+
+        if curr.month == fim.month and curr.year == fim.year:
+            fim_c = fim.day
+        else:
+            fim_c = ultimo_dia
+
+        if fim_c - ini_c + 1 >= 15:
+            meses += 1
+
+        if curr.month == 12:
+            curr = datetime.date(curr.year + 1, 1, 1)
+        else:
+            curr = datetime.date(curr.year, curr.month + 1, 1)
+
+    return meses
+
+
+def avos_ferias_referencia(inicio_aquisitivo, fim_projetado):
+    avos = 0
+    curr = inicio_aquisitivo
+
+    while True:
+        year = curr.year + ((curr.month + 1) // 13)
+        month = (curr.month % 12) + 1
+
+        try:
+            next_date = datetime.date(year, month, inicio_aquisitivo.day)
+        except ValueError:
+            next_date = datetime.date(year, month, monthrange(year, month)[1])
+
+        periodo_fim = next_date - datetime.timedelta(days=1)
+
+        if periodo_fim <= fim_projetado:
+            avos += 1
+            curr = next_date
+        else:
+            if (fim_projetado - curr).days + 1 >= 15:
+                avos += 1
+            break
+
+    return min(avos, 12)
+
+
+# ------------------------------------------------------------------------------
+#  CORPUS
+# ------------------------------------------------------------------------------
+
+def _data_aleatoria(sorteio):
+    ano = sorteio.randint(1995, 2035)
+    mes = sorteio.randint(1, 12)
+    ultimo = monthrange(ano, mes)[1]
+    # Metade das datas cai nos últimos dias do mês (28 a 31), onde o limite do dia importa
+    dia = sorteio.randint(max(ultimo - 3, 1), ultimo) if sorteio.random() < 0.5 else sorteio.randint(1, ultimo)
+    return datetime.date(ano, mes, dia)
+
+
+def _corpus(dias_maximos):
+    sorteio = random.Random(SEMENTE)
+    pares = []
+    for _ in range(QUANTIDADE):
+        inicio = _data_aleatoria(sorteio)
+        if sorteio.random() < 0.5:
+            # Fim nos últimos dias de um mês próximo (inclusive antes do início)
+            ano, mes = divmod(inicio.year * 12 + inicio.month - 1 + sorteio.randint(-1, dias_maximos // 30), 12)
+            ultimo = monthrange(ano, mes + 1)[1]
+            fim = datetime.date(ano, mes + 1, sorteio.randint(ultimo - 3, ultimo))
+        else:
+            fim = inicio + datetime.timedelta(days=sorteio.randint(-40, dias_maximos))
+        pares.append((inicio, fim))
+    # Casos de borda fixos: fevereiros, anos bissextos e viradas de ano
+    for inicio, fim in [
+        ("2024-01-31", "2024-02-29"), ("2023-01-31", "2023-02-28"), ("2024-02-29", "2025-02-28"),
+        ("2024-03-31", "2024-04-29"), ("2024-03-31", "2024-04-30"), ("2024-12-17", "2025-01-14"),
+        ("2024-12-31", "2025-12-30"), ("2025-01-01", "2025-01-14"), ("2025-01-01", "2025-01-15"),
+        ("2025-02-14", "2025-02-28"), ("2025-05-20", "2025-05-19"),
+    ]:
+        pares.append((datetime.date.fromisoformat(inicio), datetime.date.fromisoformat(fim)))
+    return pares
+
+
+def _arrays(pares):
+    return (np.array([i for i, _ in pares], dtype="datetime64[D]"),
+            np.array([f for _, f in pares], dtype="datetime64[D]"))
+
+
+# ------------------------------------------------------------------------------
+#  TESTES
+# ------------------------------------------------------------------------------
+
+@pytest.fixture(scope="module")
+def pares_13o():
+    return _corpus(dias_maximos=6 * 365)
+
+
+@pytest.fixture(scope="module")
+def pares_ferias():
+    return _corpus(dias_maximos=2 * 365)
+
+
+def test_meses_trabalhados_escalar(pares_13o):
+    for inicio, fim in pares_13o:
+        assert calcular_meses_trabalhados(inicio, fim) == meses_trabalhados_referencia(inicio, fim), (inicio, fim)
+
+
+def test_meses_trabalhados_array(pares_13o):
+    esperado = [meses_trabalhados_referencia(i, f) for i, f in pares_13o]
+    assert calcular_meses_trabalhados_array(*_arrays(pares_13o)).tolist() == esperado
+
+
+def test_avos_ferias_escalar(pares_ferias):
+    for inicio, fim in pares_ferias:
+        assert calcular_avos_ferias(inicio, fim) == avos_ferias_referencia(inicio, fim), (inicio, fim)
+
+
+def test_avos_ferias_array(pares_ferias):
+    esperado = [avos_ferias_referencia(i, f) for i, f in pares_ferias]
+    assert calcular_avos_ferias_array(*_arrays(pares_ferias)).tolist() == esperado
@@ -0,0 +1,71 @@
+# tests/test_centavos.py
+# arredondar e ratear (com os atalhos longe dos empates) contra as regras escritas por extenso
+
+import math
+import random
+
+import numpy as np
+import pytest
+
+from centavos import CASAS_EMPATE, CASAS_RUIDO, arredondar, ratear, ratear_array
+
+
+def arredondar_referencia(valor):
+    centavos = math.floor(round(abs(valor) * 100, CASAS_RUIDO) + 0.5)
+    return -centavos if valor < 0 else centavos
+
+
+def ratear_referencia(total, pesos):
+    soma_pesos = sum(pesos)
+    if not total or soma_pesos <= 0:
+        return [0] * len(pesos)
+    cotas = [total * p / soma_pesos for p in pesos]
+    partes = [math.floor(c) for c in cotas]
+    ordem = sorted(range(len(pesos)), key=lambda j: round(partes[j] - cotas[j], CASAS_EMPATE))
+    for j in ordem[:total - sum(partes)]:
+        partes[j] += 1
+    return partes
+
+
+def test_arredondar():
+    sorteio = random.Random(2025)
+    geradores = [
+        lambda: sorteio.uniform(-1e6, 1e6),
+        lambda: round(sorteio.uniform(-1e5, 1e5), 2),
+        lambda: sorteio.randint(-10**8, 10**8) / 1000 + 0.005,  # meios centavos
+        lambda: sorteio.randint(-10**6, 10**6) * 0.005,
+        lambda: sorteio.uniform(-1e12, 1e12),
+    ]
+    valores = [gerar() for gerar in geradores for _ in range(50000)]
+    valores += [0.0, -0.0, 0.125, -0.125, 1.005, 2.675, 1e15 + 0.5]
+    for valor in valores:
+        assert arredondar(valor) == arredondar_referencia(valor), valor
+    # np.round perde precisão em relação ao round() do Python acima de ~1e9 reais: a versão
+    # vetorizada é conferida na faixa de valores que os cálculos produzem
+    realistas = [v for v in valores if abs(v) < 1e9]
+    np.testing.assert_array_equal(arredondar(np.array(realistas)), [arredondar_referencia(v) for v in realistas])
+
+
+
+@pytest.mark.parametrize("invalido", [float("nan"), float("inf"), float("-inf")])
+def test_arredondar_array_rejeita_nao_finitos(invalido):
+    with pytest.raises(ValueError):
+        arredondar(np.array([1.5, invalido]))
+
+
+def test_ratear():
+    sorteio = random.Random(2025)
+    for _ in range(100000):
+        pesos = [sorteio.choice([0, 0.1, 0.25, 0.5, 1 / 3, sorteio.random()]) for _ in range(sorteio.randint(1, 8))]
+        total = sorteio.randint(-10**7, 10**7)
+        partes = ratear(total, pesos)
+        assert partes == ratear_referencia(total, pesos), (total, pesos)
+        assert sum(partes) == (total if sum(pesos) > 0 else 0)
+
+
+def test_ratear_array_igual_ao_escalar():
+    sorteio = random.Random(7)
+    pesos = np.array([[sorteio.choice([0, 0.25, 1 / 3, sorteio.random()]) for _ in range(6)] for _ in range(5000)])
+    totais = np.array([sorteio.randint(0, 10**7) for _ in range(5000)])
+    esperado = [ratear(int(t), list(p)) for t, p in zip(totais, pesos)]
+    assert ratear_array(totais, pesos).tolist() == esperado
@@ -0,0 +1,38 @@
+# tests/test_comparador_regimes.py
+# O lado Lucro Presumido do comparador usa as mesmas alíquotas de calcula_imposto
+
+import numpy as np
+import pytest
+
+import simulador_lp
+from comparador_regimes import PONTOS_MAXIMO, comparar_regimes, lucro_presumido_mensal_array
+from simulador_lp import calcula_imposto
+
+FATURAMENTOS = [0.01, 1000.0, 15000.0, 62500.0, 62500.01, 180000.0, 400000.0]
+
+
+def _total_calcula_imposto(faturamento, natureza, iss):
+    resultado = calcula_imposto(faturamento, faturamento, natureza, iss)
+    return next(v for k, v in resultado.items() if k.startswith("Total Tributos"))
+
+
+@pytest.mark.parametrize("natureza, iss", [(1, 2.0), (1, 5.0), (2, 5.0)])
+def test_igual_a_calcula_imposto(natureza, iss):
+    vetor = lucro_presumido_mensal_array(FATURAMENTOS, natureza == 2, iss)
+    esperado = [_total_calcula_imposto(f, natureza, iss) for f in FATURAMENTOS]
+    np.testing.assert_allclose(vetor, esperado, rtol=0, atol=1e-6)
+
+
+def test_alteracao_de_aliquota_vale_para_os_dois(monkeypatch):
+    antes = lucro_presumido_mensal_array(FATURAMENTOS, False, 3.0)
+    monkeypatch.setattr(simulador_lp, "ALIQUOTA_CSLL", 0.12)  # só em simulador_lp
+    vetor = lucro_presumido_mensal_array(FATURAMENTOS, False, 3.0)
+    esperado = [_total_calcula_imposto(f, 1, 3.0) for f in FATURAMENTOS]
+    assert not np.allclose(vetor, antes)
+    np.testing.assert_allclose(vetor, esperado, rtol=0, atol=1e-6)
+
+
+@pytest.mark.parametrize("pontos", [1, PONTOS_MAXIMO + 1, 10**9])
+def test_pontos_fora_do_intervalo(pontos):
+    with pytest.raises(ValueError, match="pontos"):
+        comparar_regimes({"anexo": 3, "pontos": pontos})
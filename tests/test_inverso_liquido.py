@@ -0,0 +1,65 @@
+# tests/test_inverso_liquido.py
+# Ida e volta: o bruto calculado pelo inverso, passado pelo cálculo normal,
+# deve devolver o líquido desejado (a menos do arredondamento em centavos)
+
+import itertools
+
+import pytest
+
+from calcular_darf_pro_labore import PERCENTUAL_FATOR_R, PISO_PRO_LABORE, calcular_darf_pro_labore
+from calculo_rescisao import processar_rescisao
+from inverso_liquido import pro_labore_por_liquido, salario_por_liquido_rescisao
+
+# O salário sai em centavos inteiros e cada verba é arredondada: o líquido pode diferir em alguns
+# centavos, ou em até um passo de um centavo de salário quando as verbas somam vários salários
+TOLERANCIA = 0.03
+
+LIQUIDOS = [1000.0 + 2950.0 * i + 0.37 * i for i in range(20)]  # 1.000 a ~57.000
+
+PERFIS_RESCISAO = [
+    {
+        "motivo": motivo, "data_admissao": admissao, "data_demissao": demissao, "dependentes": dependentes,
+        "adicionais": 320.0, "media_he": 410.0, "saldo_fgts": 18500.0, "aviso_indenizado": True,
+        "aviso_cumprido": True, "pensao": descontos, "adiantamento": descontos / 2,
+    }
+    for motivo, (admissao, demissao), dependentes, descontos in itertools.product(
+        (1, 2, 3, 4),
+        (("2024-03-10", "2025-03-20"), ("2013-02-01", "2025-04-10"), ("1995-01-02", "2025-06-18")),
+        (0, 2),
+        (0.0, 300.0),
+    )
+]
+
+
+@pytest.mark.parametrize("perfil", PERFIS_RESCISAO, ids=lambda p: f"m{p['motivo']}_{p['data_admissao']}_{p['dependentes']}_{p['pensao']:.0f}")
+def test_rescisao_ida_e_volta(perfil):
+    resultados = salario_por_liquido_rescisao(perfil, LIQUIDOS)
+    viaveis = [r for r in resultados if "erro" not in r]
+    assert len(viaveis) >= len(LIQUIDOS) - 2  # só os menores líquidos podem ser inatingíveis
+
+    for r in viaveis:
+        volta = processar_rescisao({**perfil, "salario_base": r["salario_base"]})
+        assert volta["totais"]["total_liquido"] == r["total_liquido"]
+        vizinho = processar_rescisao({**perfil, "salario_base": r["salario_base"] + 0.01})
+        passo = abs(vizinho["totais"]["total_liquido"] - r["total_liquido"])
+        assert abs(r["total_liquido"] - r["liquido_desejado"]) <= max(TOLERANCIA, passo) + 1e-9, r
+
+
+def test_rescisao_sem_inverso():
+    # Pedido de demissão com aviso não cumprido: o desconto do aviso cresce mais que as verbas
+    perfil = {"motivo": 2, "data_admissao": "2024-03-10", "data_demissao": "2025-03-20", "aviso_cumprido": False}
+    with pytest.raises(ValueError, match="não há inverso"):
+        salario_por_liquido_rescisao(perfil, LIQUIDOS)
+
+
+def test_pro_labore_ida_e_volta():
+    liquidos = [PISO_PRO_LABORE + 0.01 * i for i in range(0, 200, 7)] + [2500.0 + 137.19 * i for i in range(400)]
+    resultado = pro_labore_por_liquido(liquidos)
+
+    for alvo, pro_labore, liquido in zip(resultado["liquido_desejado"], resultado["pro_labore"], resultado["liquido"]):
+        assert abs(liquido - alvo) <= TOLERANCIA + 1e-9, alvo
+        if pro_labore < PISO_PRO_LABORE:
+            continue
+        volta = calcular_darf_pro_labore({"faturamento": pro_labore / PERCENTUAL_FATOR_R})
+        assert volta["pro_labore"] == pro_labore
+        assert round(volta["pro_labore"] - volta["inss"] - volta["ir"], 2) == liquido
@@ -0,0 +1,26 @@
+# tests/test_simulador_lp.py
+# Lote de notas: valores inválidos são recusados antes do rateio
+
+import pytest
+
+from simulador_lp import calcula_imposto_lote
+
+
+@pytest.mark.parametrize("valor", [-50, 0, "nan", "inf"])
+def test_nota_com_valor_invalido(valor):
+    notas = [{"valor_nfse": 1000, "aliquota_iss_percentual": 2}, {"valor_nfse": valor, "numero": "NF-7"}]
+    with pytest.raises(ValueError, match="NF-7"):
+        calcula_imposto_lote(notas)
+
+
+def test_faturamento_nao_finito():
+    with pytest.raises(ValueError, match="faturamento"):
+        calcula_imposto_lote([{"valor_nfse": 1000}], float("inf"))
+
+
+def test_rateio_soma_os_totais():
+    notas = [{"valor_nfse": v, "aliquota_iss_percentual": 3} for v in (1000.01, 2500.5, 333.33)]
+    resultado = calcula_imposto_lote(notas, 150000)
+    for tributo, total in resultado["totais"].items():
+        assert sum(round(n[tributo] * 100) for n in resultado["notas"]) == round(total * 100), tributo
+        assert all(n[tributo] >= 0 for n in resultado["notas"]), tributo
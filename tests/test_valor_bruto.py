@@ -0,0 +1,37 @@
+# tests/test_valor_bruto.py
+# A grade vetorizada deve dar, célula a célula, o mesmo que calcular_valor_bruto
+
+import random
+
+from valor_bruto import calcular_valor_bruto, calcular_valor_bruto_grade
+
+CUSTOS = [
+    {"descricao": "Comissão", "tipo": "%", "valor": 3.7},
+    {"descricao": "Taxa do cartão", "tipo": "%", "valor": 2.49},
+    {"descricao": "Frete", "tipo": "R$", "valor": 17.335},
+    {"descricao": "Embalagem", "tipo": "R$", "valor": 2.125},
+    {"descricao": "Royalties", "tipo": "%", "valor": 1.15},
+]
+
+
+def test_grade_igual_ao_calculo_individual():
+    sorteio = random.Random(2025)
+    liquidos = [round(sorteio.uniform(1, 50000), 2) for _ in range(150)] + [0.01, 100, 1000.005]
+    impostos = [round(sorteio.uniform(0, 30), 2) for _ in range(40)] + [0, 6, 15.5, 95]
+
+    grade = calcular_valor_bruto_grade(liquidos, impostos, CUSTOS)
+
+    for i, liquido in enumerate(liquidos):
+        for j, imposto in enumerate(impostos):
+            celula = (liquido, imposto)
+            if imposto + 3.7 + 2.49 + 1.15 >= 100:
+                assert grade["liquido_final"][i][j] is None, celula
+                continue
+            individual = calcular_valor_bruto(liquido, imposto, CUSTOS)
+            detalhes = individual["detalhes"]
+            custos_perc = sum(round(d["valor"] * 100) for d in detalhes[1:] if d["tipo"] == "%") / 100
+            assert grade["valor_bruto"][i][j] == individual["valor_bruto"], celula
+            assert grade["imposto_principal"][i][j] == detalhes[0]["valor"], celula
+            assert grade["custos_percentuais_valor"][i][j] == custos_perc, celula
+            assert grade["liquido_final"][i][j] == individual["liquido_final"], celula
+    assert grade["custos_fixos"] == sum(round(d["valor"] * 100) for d in detalhes[1:] if d["tipo"] == "R$") / 100
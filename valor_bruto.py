@@ -1,6 +1,12 @@
 # valor_bruto.py
 
-def calcular_valor_bruto(valor_liquido, imposto_principal, lista_custos):
+import numpy as np
+
+from centavos import arredondar, para_reais
+
+
+def agregar_custos(lista_custos):
+    """Soma os custos fixos (R$) e os percentuais (%) da lista."""
     soma_fixos_R = 0.0
     soma_perc = 0.0
 
@@ -11,6 +17,12 @@ def calcular_valor_bruto(valor_liquido, imposto_principal, lista_custos):
         else:
             soma_perc += valor
 
+    return soma_fixos_R, soma_perc
+
+
+def calcular_valor_bruto(valor_liquido, imposto_principal, lista_custos):
+    soma_fixos_R, soma_perc = agregar_custos(lista_custos)
+
     total_perc = float(imposto_principal) + soma_perc
 
     if total_perc >= 100:
@@ -19,11 +31,16 @@ def calcular_valor_bruto(valor_liquido, imposto_principal, lista_custos):
     bruto = (valor_liquido + soma_fixos_R) / (1 - total_perc / 100)
 
     detalhes = []
+    # Em centavos: liquido_final é exatamente o bruto exibido menos os valores exibidos
+    bruto_centavos = arredondar(bruto)
+    descontos_centavos = 0
 
     # imposto principal
+    imposto_centavos = arredondar(bruto * (imposto_principal / 100))
+    descontos_centavos += imposto_centavos
     detalhes.append({
         "descricao": f"Imposto Principal ({imposto_principal}%)",
-        "valor": round(bruto * (imposto_principal / 100), 2),
+        "valor": para_reais(imposto_centavos),
         "tipo": "%"
     })
 
@@ -34,17 +51,17 @@ def calcular_valor_bruto(valor_liquido, imposto_principal, lista_custos):
         else:
             v = c["valor"]
 
+        v_centavos = arredondar(v)
+        descontos_centavos += v_centavos
         detalhes.append({
             "descricao": c["descricao"],
-            "valor": round(v, 2),
+            "valor": para_reais(v_centavos),
             "tipo": c["tipo"]
         })
 
-    liquido_final = bruto - sum([d["valor"] for d in detalhes])
-
     return {
-        "valor_bruto": round(bruto, 2),
-        "liquido_final": round(liquido_final, 2),
+        "valor_bruto": para_reais(bruto_centavos),
+        "liquido_final": para_reais(bruto_centavos - descontos_centavos),
         "detalhes": detalhes
     }
 
@@ -64,3 +81,73 @@ def calcular_valor_bruto_from_input(data):
         })
 
     return calcular_valor_bruto(valor_liquido, imposto_principal, custos)
+
+
+def _parse_numero(valor):
+    return float(str(valor).replace(",", "."))
+
+
+def _matriz_para_lista(centavos, valido):
+    """Converte a matriz de centavos para reais e troca as células impossíveis (percentual >= 100%) por None."""
+    linhas = para_reais(centavos).tolist()
+    mascara = valido.tolist()
+    return [[v if ok else None for v, ok in zip(linha, oks)] for linha, oks in zip(linhas, mascara)]
+
+
+def calcular_valor_bruto_grade(valores_liquidos, impostos_principais, lista_custos):
+    """
+    Calcula a tabela de preços: cada valor líquido (linhas) contra cada imposto
+    principal (colunas), com a mesma lista de custos. Os custos são agregados
+    uma única vez e a matriz inteira é calculada de forma vetorizada.
+    Retorna um formato colunar: eixos + matrizes (linhas x colunas).
+    """
+    soma_fixos_R, soma_perc = agregar_custos(lista_custos)
+
+    liquidos = np.asarray(valores_liquidos, dtype=float)[:, None]
+    impostos = np.asarray(impostos_principais, dtype=float)[None, :]
+
+    total_perc = impostos + soma_perc
+    valido = np.broadcast_to(total_perc < 100, (liquidos.shape[0], impostos.shape[1]))
+
+    # Células com percentual >= 100% geram inf/nan: zeradas aqui e descartadas em _matriz_para_lista
+    with np.errstate(divide="ignore", invalid="ignore"):
+        bruto = np.where(valido, (liquidos + soma_fixos_R) / (1 - total_perc / 100), 0.0)
+
+    # Em centavos, como em calcular_valor_bruto: cada custo é arredondado separadamente
+    # e o líquido é o bruto menos as parcelas exibidas
+    bruto_centavos = arredondar(bruto)
+    imposto_centavos = arredondar(bruto * (impostos / 100))
+    custos_perc_centavos = np.zeros(bruto.shape, dtype=np.int64)
+    custos_fixos_centavos = 0
+    for c in lista_custos:
+        if c["tipo"] == "%":
+            custos_perc_centavos += arredondar(bruto * (c["valor"] / 100))
+        else:
+            custos_fixos_centavos += arredondar(c["valor"])
+    liquido_centavos = bruto_centavos - imposto_centavos - custos_perc_centavos - custos_fixos_centavos
+
+    return {
+        "valores_liquidos": liquidos[:, 0].tolist(),
+        "impostos_principais": impostos[0].tolist(),
+        "custos_fixos": para_reais(custos_fixos_centavos),
+        "custos_percentuais": soma_perc,
+        "valor_bruto": _matriz_para_lista(bruto_centavos, valido),
+        "imposto_principal": _matriz_para_lista(imposto_centavos, valido),
+        "custos_percentuais_valor": _matriz_para_lista(custos_perc_centavos, valido),
+        "liquido_final": _matriz_para_lista(liquido_centavos, valido),
+    }
+
+
+def calcular_valor_bruto_grade_from_input(data):
+    valores_liquidos = [_parse_numero(v) for v in data.get("valores_liquidos", [])]
+    impostos_principais = [_parse_numero(v) for v in data.get("impostos_principais", [])]
+
+    if not valores_liquidos or not impostos_principais:
+        raise ValueError("Informe ao menos um valor em 'valores_liquidos' e em 'impostos_principais'.")
+
+    custos = [
+        {"descricao": c["descricao"], "tipo": c["tipo"], "valor": _parse_numero(c["valor"])}
+        for c in data.get("custos", [])
+    ]
+
+    return calcular_valor_bruto_grade(valores_liquidos, impostos_principais, custos)